@@ -5,25 +5,54 @@ import sqlite3
 import json
 import zipfile
 import glob
+import hashlib
+from database.change_journal import ChangeJournal
+from database.migrations import migrate
+from database.query_profiler import get_query_profiler
+from utils.tracing import traced
+
+# اسم ملف فهرس النسخ الاحتياطية المحفوظ بجانب الأرشيفات
+CATALOG_FILENAME = "backup_catalog.json"
+CATALOG_VERSION = 1
+
+# سياسة الاحتفاظ الافتراضية (الجد - الأب - الابن)
+DEFAULT_KEEP_DAILY = 7
+DEFAULT_KEEP_WEEKLY = 4
+DEFAULT_KEEP_MONTHLY = 12
+
+# أسماء الملفات داخل أرشيف النسخة الاحتياطية الكاملة
+DB_MEMBER = "guzel_clinic.db"
+METADATA_MEMBER = "backup_metadata.json"
+SETTINGS_MEMBER = "settings.json"
+TRANSLATIONS_PREFIX = "translations/"
+
+# حجم الدفعة عند قراءة الملفات ونسخها
+CHUNK_SIZE = 1024 * 1024
 
 class BackupManager:
     """يدير عمليات النسخ الاحتياطي والاستعادة للقاعدة البيانات والإعدادات والترجمات"""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, settings=None):
         """
         تهيئة مدير النسخ الاحتياطي
         
         Args:
             db_manager: مدير قاعدة البيانات
+            settings: الإعدادات (اختياري) لقراءة سياسة الاحتفاظ
         """
         self.db_manager = db_manager
+        self.settings = settings
         self.backup_dir = "backups"
+        self.catalog_path = os.path.join(self.backup_dir, CATALOG_FILENAME)
+        self._catalog = None
+        self.change_journal = ChangeJournal(os.path.join(self.backup_dir, "journal"))
         self._ensure_backup_dir()
     
     def _ensure_backup_dir(self):
         """يتأكد من وجود مجلد النسخ الاحتياطي"""
         os.makedirs(self.backup_dir, exist_ok=True)
     
+    @traced(category="backup")
     def create_backup(self):
         """
         إنشاء نسخة احتياطية كاملة تشمل:
@@ -32,7 +61,8 @@ class BackupManager:
         - ملفات الترجمة
         """
         # إنشاء طابع زمني لاسم الملف
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         backup_filename = f"guzel_clinic_backup_{timestamp}.zip"
         backup_path = os.path.join(self.backup_dir, backup_filename)
         
@@ -42,8 +72,8 @@ class BackupManager:
         
         try:
             # نسخ ملف قاعدة البيانات
-            db_backup_path = os.path.join(temp_dir, "guzel_clinic.db")
-            shutil.copy2(self.db_manager.db_path, db_backup_path)
+            db_backup_path = os.path.join(temp_dir, DB_MEMBER)
+            journal_seq = self._copy_database(db_backup_path)
             
             # نسخ ملف الإعدادات إذا كان موجوداً
             settings_path = "data/settings.json"
@@ -64,13 +94,21 @@ class BackupManager:
                         shutil.copy2(src_file, dst_file)
             
             # إنشاء ملف وصف للنسخة الاحتياطية
+            # يتضمن المجموع الاختباري لقاعدة البيانات للتحقق منها عند الاستعادة
             metadata = {
                 "backup_date": datetime.datetime.now().isoformat(),
                 "version": "1.0.0",
-                "description": "Guzel Beauty Clinic Backup"
+                "description": "Guzel Beauty Clinic Backup",
+                "journal_seq": journal_seq,
+                "files": {
+                    DB_MEMBER: {
+                        "size": os.path.getsize(db_backup_path),
+                        "sha256": self._file_checksum(db_backup_path)
+                    }
+                }
             }
             
-            with open(os.path.join(temp_dir, "backup_metadata.json"), 'w', encoding='utf-8') as f:
+            with open(os.path.join(temp_dir, METADATA_MEMBER), 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, ensure_ascii=False, indent=4)
             
             # ضغط جميع الملفات في ملف zip واحد
@@ -84,6 +122,10 @@ class BackupManager:
             # تنظيف المجلد المؤقت
             shutil.rmtree(temp_dir)
             
+            # تسجيل النسخة في الفهرس ثم تطبيق سياسة الاحتفاظ
+            self._register_backup(backup_path, "full", now, journal_seq)
+            self.apply_retention_policy()
+            
             return backup_path
         
         except Exception as e:
@@ -102,14 +144,20 @@ class BackupManager:
         إنشاء نسخة احتياطية بسيطة لقاعدة البيانات فقط
         (وظيفة من backup_tool.py)
         """
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
         backup_filename = f"guzel_backup_{timestamp}.db"
         backup_path = os.path.join(self.backup_dir, backup_filename)
         
-        shutil.copy2(self.db_manager.db_path, backup_path)
+        journal_seq = self._copy_database(backup_path)
+        
+        # تسجيل النسخة في الفهرس ثم تطبيق سياسة الاحتفاظ
+        self._register_backup(backup_path, "simple", now, journal_seq)
+        self.apply_retention_policy()
         
         return backup_path
     
+    @traced(category="backup")
     def restore_backup(self, backup_path):
         """
         استعادة نسخة احتياطية
@@ -117,90 +165,468 @@ class BackupManager:
         Args:
             backup_path: مسار ملف النسخة الاحتياطية (.zip أو .db)
         """
+        if not backup_path.endswith('.zip') and not backup_path.endswith('.db'):
+            raise ValueError("نوع ملف النسخة الاحتياطية غير معروف")
+        
+        # أرشفة سجل التغييرات الحالي قبل استبدال قاعدة البيانات
+        self.archive_change_journal()
+        
+        temp_db_path = self._extract_backup_database(backup_path)
+        try:
+            self._prepare_restored_database(temp_db_path)
+        except Exception:
+            os.remove(temp_db_path)
+            raise
+        
+        self._swap_database(temp_db_path)
+        
         if backup_path.endswith('.zip'):
-            return self._restore_full_backup(backup_path)
+            self._restore_backup_files(backup_path)
+        
+        # نسخة أساسية جديدة تبدأ منها عمليات الاستعادة اللاحقة إلى لحظة زمنية
+        self.create_backup()
+        
+        return True
+    
+    @traced(category="backup")
+    def restore_to(self, target_time):
+        """
+        استعادة قاعدة البيانات إلى لحظة زمنية محددة:
+        أحدث نسخة أساسية قبل تلك اللحظة ثم إعادة تطبيق سجل التغييرات حتى اللحظة المطلوبة
+        
+        Args:
+            target_time: اللحظة المطلوبة (datetime بالتوقيت المحلي)
+        
+        Returns:
+            عدد التغييرات التي أعيد تطبيقها
+        """
+        # أرشفة سجل التغييرات الحالي حتى تكون جميع التغييرات في ملفات الأرشيف
+        self.archive_change_journal()
+        
+        base_backups = [
+            backup for backup in self.get_available_backups()
+            if backup["timestamp"] <= target_time and backup.get("journal_seq") is not None
+        ]
+        if not base_backups:
+            raise Exception("لا توجد نسخة احتياطية أساسية قبل الوقت المطلوب")
+        
+        base_backup = base_backups[0]
+        
+        temp_db_path = self._extract_backup_database(base_backup["path"])
+        try:
+            applied = self._prepare_restored_database(
+                temp_db_path, base_backup["journal_seq"], target_time
+            )
+            self._verify_database(temp_db_path)
+        except Exception:
+            os.remove(temp_db_path)
+            raise
+        
+        self._swap_database(temp_db_path)
+        
+        # نسخة أساسية جديدة تبدأ منها عمليات الاستعادة اللاحقة
+        self.create_backup()
+        
+        return applied
+    
+    def archive_change_journal(self):
+        """
+        أرشفة سجل التغييرات في ملف بجانب النسخ الاحتياطية ثم دمج ملف WAL
+        
+        Returns:
+            مسار ملف الأرشيف أو None إذا لم تكن هناك تغييرات
+        """
+        conn = self.db_manager.get_connection()
+        try:
+            return self.change_journal.archive(conn)
+        finally:
+            conn.close()
+    
+    def preview_backup(self, backup_path):
+        """
+        معاينة نسخة احتياطية دون استخراجها
+        (تقرأ الفهرس المركزي لملف zip وملف الوصف فقط)
+        
+        Args:
+            backup_path: مسار ملف النسخة الاحتياطية (.zip أو .db)
+        """
+        if backup_path.endswith('.zip'):
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                members = [
+                    {"name": info.filename, "size": info.file_size, "compressed_size": info.compress_size}
+                    for info in zipf.infolist()
+                ]
+                metadata = self._read_zip_metadata(zipf)
+            
+            return {"type": "full", "metadata": metadata, "members": members}
         elif backup_path.endswith('.db'):
-            return self._restore_simple_backup(backup_path)
+            size = os.path.getsize(backup_path)
+            members = [{"name": os.path.basename(backup_path), "size": size, "compressed_size": size}]
+            return {"type": "simple", "metadata": {}, "members": members}
         else:
             raise ValueError("نوع ملف النسخة الاحتياطية غير معروف")
     
-    def _restore_full_backup(self, backup_path):
-        """استعادة نسخة احتياطية كاملة (ملف zip)"""
-        temp_dir = os.path.join(self.backup_dir, "temp_restore")
-        os.makedirs(temp_dir, exist_ok=True)
+    def _extract_backup_database(self, backup_path):
+        """
+        نسخ قاعدة البيانات من النسخة الاحتياطية مباشرة إلى ملف مؤقت بجانب الملف الأصلي
+        ثم التحقق من المجموع الاختباري وسلامة الملف
         
-        try:
-            # استخراج محتويات ملف zip
+        Returns:
+            مسار الملف المؤقت
+        """
+        if backup_path.endswith('.zip'):
             with zipfile.ZipFile(backup_path, 'r') as zipf:
-                zipf.extractall(temp_dir)
+                # التحقق من ملف الوصف
+                metadata = self._read_zip_metadata(zipf)
+                
+                if DB_MEMBER not in zipf.namelist():
+                    raise Exception("ملف النسخة الاحتياطية غير صالح: لا يوجد ملف قاعدة بيانات")
+                
+                expected_checksum = metadata.get("files", {}).get(DB_MEMBER, {}).get("sha256")
+                
+                with zipf.open(DB_MEMBER) as src:
+                    temp_db_path = self._stream_to_temp(src, self.db_manager.db_path, expected_checksum)
+        else:
+            # المجموع الاختباري المسجل في الفهرس (إن وجد)
+            filename = os.path.basename(backup_path)
+            expected_checksum = None
+            for entry in self._load_catalog()["backups"]:
+                if entry["filename"] == filename:
+                    expected_checksum = entry.get("checksum")
+                    break
             
-            # التحقق من ملف الوصف
-            metadata_path = os.path.join(temp_dir, "backup_metadata.json")
-            if not os.path.exists(metadata_path):
-                raise Exception("ملف النسخة الاحتياطية غير صالح: لا يوجد ملف وصف")
+            with open(backup_path, 'rb') as src:
+                temp_db_path = self._stream_to_temp(src, self.db_manager.db_path, expected_checksum)
+        
+        try:
+            self._verify_database(temp_db_path)
+        except Exception:
+            os.remove(temp_db_path)
+            raise
+        
+        return temp_db_path
+    
+    def _prepare_restored_database(self, temp_db_path, base_seq=None, target_time=None):
+        """
+        تجهيز قاعدة البيانات المستعادة قبل استبدالها:
+        إعادة تطبيق سجل التغييرات حتى اللحظة المطلوبة (اختياري)
+        ومتابعة تسلسل السجل بعد آخر رقم مؤرشف
+        
+        Returns:
+            عدد التغييرات التي أعيد تطبيقها
+        """
+        conn = sqlite3.connect(temp_db_path)
+        live_conn = self.db_manager.get_connection()
+        applied = 0
+        
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
             
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            # النسخ القديمة قد لا تحتوي على جدول السجل
+            self.change_journal.install(conn)
+            self.change_journal.drop_triggers(conn)
             
-            # إغلاق اتصال قاعدة البيانات قبل الاستعادة
-            conn = self.db_manager.get_connection()
-            conn.close()
+            # ولا على الفهارس وتعديلات المخطط اللاحقة
+            migrate(conn)
             
-            # استعادة قاعدة البيانات
-            db_backup_path = os.path.join(temp_dir, "guzel_clinic.db")
-            if not os.path.exists(db_backup_path):
-                raise Exception("ملف النسخة الاحتياطية غير صالح: لا يوجد ملف قاعدة بيانات")
+            if target_time is not None:
+                entries = self.change_journal.iter_entries(live_conn, base_seq, target_time)
+                applied = self.change_journal.replay(conn, entries)
             
-            shutil.copy2(db_backup_path, self.db_manager.db_path)
+            # التغييرات السابقة محفوظة في ملفات الأرشيف
+            conn.execute("DELETE FROM change_journal")
+            self.change_journal.set_seq(conn, self.change_journal.current_seq(live_conn))
+            self.change_journal.install(conn)
+            conn.commit()
             
-            # استعادة الإعدادات إذا كانت موجودة
-            settings_backup_path = os.path.join(temp_dir, "settings.json")
-            if os.path.exists(settings_backup_path):
-                settings_path = "data/settings.json"
-                os.makedirs(os.path.dirname(settings_path), exist_ok=True)
-                shutil.copy2(settings_backup_path, settings_path)
+            # دمج ملف WAL حتى يصبح الملف المؤقت مكتملاً قبل نقله
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+            live_conn.close()
+        
+        return applied
+    
+    def _restore_backup_files(self, backup_path):
+        """استعادة الإعدادات والترجمات من نسخة احتياطية كاملة (ملف zip)"""
+        with zipfile.ZipFile(backup_path, 'r') as zipf:
+            names = zipf.namelist()
             
-            # استعادة الترجمات إذا كانت موجودة
-            translations_backup_dir = os.path.join(temp_dir, "translations")
-            if os.path.exists(translations_backup_dir):
-                translations_dir = "data/translations"
-                
-                if os.path.exists(translations_dir):
-                    shutil.rmtree(translations_dir)
-                
-                os.makedirs(translations_dir, exist_ok=True)
-                
-                for file in os.listdir(translations_backup_dir):
-                    if file.endswith(".json"):
-                        src_file = os.path.join(translations_backup_dir, file)
-                        dst_file = os.path.join(translations_dir, file)
-                        shutil.copy2(src_file, dst_file)
+            # قراءة الإعدادات والترجمات (ملفات صغيرة)
+            settings_data = zipf.read(SETTINGS_MEMBER) if SETTINGS_MEMBER in names else None
+            translations = {
+                name[len(TRANSLATIONS_PREFIX):]: zipf.read(name)
+                for name in names
+                if name.startswith(TRANSLATIONS_PREFIX) and name.endswith(".json")
+            }
+        
+        # استعادة الإعدادات إذا كانت موجودة
+        if settings_data is not None:
+            self._atomic_write("data/settings.json", settings_data)
+        
+        # استعادة الترجمات إذا كانت موجودة
+        if translations:
+            translations_dir = "data/translations"
+            os.makedirs(translations_dir, exist_ok=True)
             
-            # تنظيف المجلد المؤقت
-            shutil.rmtree(temp_dir)
+            for file in os.listdir(translations_dir):
+                if file.endswith(".json") and file not in translations:
+                    os.remove(os.path.join(translations_dir, file))
             
-            return True
+            for file, data in translations.items():
+                self._atomic_write(os.path.join(translations_dir, file), data)
+    
+    def _read_zip_metadata(self, zipf):
+        """قراءة ملف الوصف من أرشيف النسخة الاحتياطية"""
+        if METADATA_MEMBER not in zipf.namelist():
+            raise Exception("ملف النسخة الاحتياطية غير صالح: لا يوجد ملف وصف")
         
-        except Exception as e:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            raise e
+        return json.loads(zipf.read(METADATA_MEMBER).decode('utf-8'))
     
-    def _restore_simple_backup(self, backup_path):
-        """استعادة نسخة احتياطية بسيطة (ملف .db فقط)"""
-        # إغلاق أي اتصالات مفتوحة
-        if hasattr(self.db_manager, 'connection') and self.db_manager.connection:
-            self.db_manager.connection.close()
+    def _stream_to_temp(self, src, target_path, expected_checksum=None):
+        """
+        نسخ ملف على دفعات إلى ملف مؤقت بجانب الملف الهدف مع حساب المجموع الاختباري
         
-        # استعادة النسخة الاحتياطية
-        shutil.copy2(backup_path, self.db_manager.db_path)
+        Returns:
+            مسار الملف المؤقت
+        """
+        temp_path = target_path + ".restore"
+        digest = hashlib.sha256()
         
-        return True
+        try:
+            with open(temp_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+            
+            if expected_checksum and digest.hexdigest() != expected_checksum:
+                raise Exception("ملف النسخة الاحتياطية تالف: المجموع الاختباري غير مطابق")
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        return temp_path
+    
+    def _verify_database(self, db_path):
+        """التحقق من سلامة ملف قاعدة البيانات"""
+        conn = sqlite3.connect(db_path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchall()
+        except sqlite3.DatabaseError as e:
+            raise Exception(f"ملف قاعدة البيانات في النسخة الاحتياطية تالف: {e}")
+        finally:
+            conn.close()
+        
+        if result != [("ok",)]:
+            raise Exception("ملف قاعدة البيانات في النسخة الاحتياطية تالف: فشل فحص السلامة")
+    
+    def _swap_database(self, temp_db_path):
+        """
+        استبدال قاعدة البيانات الحالية بالملف المؤقت بشكل ذري مع إيقاف الاتصالات وإعادة فتحها
+        
+        ينتظر إغلاق جميع الاتصالات المفتوحة بقاعدة البيانات (مثل عمليات التصدير والتقارير
+        الجارية) ويمنع فتح اتصالات جديدة حتى يتم الاستبدال، ثم تفتح الاتصالات المنتظرة
+        الملف الجديد. إذا بقيت اتصالات مفتوحة بعد المهلة تُلغى الاستعادة دون لمس الملف
+        """
+        db_path = self.db_manager.db_path
+        
+        try:
+            with get_query_profiler().quiesce(db_path):
+                # حذف ملفات السجل الخاصة بقاعدة البيانات القديمة حتى لا تُطبق على الملف الجديد
+                for suffix in ("-journal", "-wal", "-shm"):
+                    if os.path.exists(db_path + suffix):
+                        os.remove(db_path + suffix)
+                
+                os.replace(temp_db_path, db_path)
+        except TimeoutError as e:
+            os.remove(temp_db_path)
+            raise Exception(f"قاعدة البيانات قيد الاستخدام، أعد المحاولة بعد انتهاء العمليات الجارية: {e}")
+    
+    @staticmethod
+    def _atomic_write(path, data):
+        """كتابة ملف بشكل ذري (ملف مؤقت ثم إعادة تسمية)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
     
     def get_available_backups(self):
-        """الحصول على قائمة بالنسخ الاحتياطية المتاحة"""
+        """الحصول على قائمة بالنسخ الاحتياطية المتاحة من الفهرس (الأحدث أولاً)"""
         backups = []
         
+        for entry in self._load_catalog()["backups"]:
+            backups.append({
+                "filename": entry["filename"],
+                "path": os.path.join(self.backup_dir, entry["filename"]),
+                "timestamp": datetime.datetime.fromisoformat(entry["timestamp"]),
+                "size": entry["size"],
+                "checksum": entry.get("checksum"),
+                "type": entry["type"],
+                "schema_version": entry.get("schema_version"),
+                "journal_seq": entry.get("journal_seq")
+            })
+        
+        return backups
+    
+    def delete_backup(self, backup_path):
+        """حذف نسخة احتياطية"""
+        filename = os.path.basename(backup_path)
+        catalog = self._load_catalog()
+        entries = [entry for entry in catalog["backups"] if entry["filename"] != filename]
+        
+        if len(entries) != len(catalog["backups"]):
+            catalog["backups"] = entries
+            self._save_catalog()
+        
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+            return True
+        return False
+    
+    def rebuild_catalog(self):
+        """إعادة بناء فهرس النسخ الاحتياطية بمسح مجلد النسخ الاحتياطي"""
+        self._catalog = {
+            "version": CATALOG_VERSION,
+            "backups": self._scan_backup_dir()
+        }
+        self._save_catalog()
+        return self.get_available_backups()
+    
+    def apply_retention_policy(self):
+        """
+        تطبيق سياسة الاحتفاظ (الجد - الأب - الابن) لكل نوع من النسخ:
+        يحتفظ بأحدث نسخة لكل يوم من آخر N يوم، ولكل أسبوع من آخر N أسبوع،
+        ولكل شهر من آخر N شهر، ويحذف ما تبقى
+        
+        Returns:
+            قائمة بأسماء الملفات المحذوفة
+        """
+        keep_daily, keep_weekly, keep_monthly = self._get_retention()
+        
+        # سياسة معطلة: الاحتفاظ بجميع النسخ
+        if keep_daily <= 0 and keep_weekly <= 0 and keep_monthly <= 0:
+            return []
+        
+        backups = self.get_available_backups()
+        keep = set()
+        
+        periods = [
+            (lambda t: t.date(), keep_daily),
+            (lambda t: t.isocalendar()[:2], keep_weekly),
+            (lambda t: (t.year, t.month), keep_monthly),
+        ]
+        
+        # تطبق السياسة على كل نوع على حدة حتى لا تحل نسخة بسيطة محل نسخة كاملة
+        for backup_type in ("full", "simple"):
+            typed_backups = [backup for backup in backups if backup["type"] == backup_type]
+            
+            for period_of, limit in periods:
+                seen = set()
+                for backup in typed_backups:
+                    if len(seen) >= limit:
+                        break
+                    period = period_of(backup["timestamp"])
+                    if period not in seen:
+                        seen.add(period)
+                        keep.add(backup["filename"])
+        
+        pruned = []
+        for backup in backups:
+            if backup["filename"] in keep:
+                continue
+            try:
+                if os.path.exists(backup["path"]):
+                    os.remove(backup["path"])
+                pruned.append(backup["filename"])
+            except OSError:
+                continue
+        
+        if pruned:
+            catalog = self._load_catalog()
+            catalog["backups"] = [entry for entry in catalog["backups"] if entry["filename"] not in pruned]
+            self._save_catalog()
+        
+        # حذف أجزاء سجل التغييرات الأقدم من أقدم نسخة أساسية متبقية
+        base_seqs = [entry["journal_seq"] for entry in self._load_catalog()["backups"] if entry.get("journal_seq") is not None]
+        if base_seqs:
+            self.change_journal.prune(min(base_seqs))
+        
+        return pruned
+    
+    def _get_retention(self):
+        """قراءة أعداد الاحتفاظ اليومية والأسبوعية والشهرية من الإعدادات"""
+        if not self.settings:
+            return DEFAULT_KEEP_DAILY, DEFAULT_KEEP_WEEKLY, DEFAULT_KEEP_MONTHLY
+        
+        return (
+            int(self.settings.get_setting("backup.keep_daily", DEFAULT_KEEP_DAILY)),
+            int(self.settings.get_setting("backup.keep_weekly", DEFAULT_KEEP_WEEKLY)),
+            int(self.settings.get_setting("backup.keep_monthly", DEFAULT_KEEP_MONTHLY))
+        )
+    
+    def _load_catalog(self):
+        """تحميل فهرس النسخ الاحتياطية (يُبنى من مجلد النسخ عند عدم وجوده)"""
+        if self._catalog is not None:
+            return self._catalog
+        
+        if os.path.exists(self.catalog_path):
+            try:
+                with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                    catalog = json.load(f)
+                if catalog.get("version") == CATALOG_VERSION:
+                    self._catalog = catalog
+                    return self._catalog
+            except (OSError, ValueError):
+                pass
+        
+        # الفهرس غير موجود أو تالف: مسح المجلد مرة واحدة وحفظ النتيجة
+        self._catalog = {
+            "version": CATALOG_VERSION,
+            "backups": self._scan_backup_dir()
+        }
+        self._save_catalog()
+        return self._catalog
+    
+    def _save_catalog(self):
+        """حفظ الفهرس بشكل ذري (ملف مؤقت ثم إعادة تسمية)"""
+        self._catalog["backups"].sort(key=lambda entry: entry["timestamp"], reverse=True)
+        
+        temp_path = self.catalog_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._catalog, f, ensure_ascii=False, indent=4)
+        os.replace(temp_path, self.catalog_path)
+    
+    def _register_backup(self, backup_path, backup_type, timestamp, journal_seq=None):
+        """إضافة نسخة احتياطية جديدة إلى الفهرس"""
+        catalog = self._load_catalog()
+        filename = os.path.basename(backup_path)
+        
+        catalog["backups"] = [entry for entry in catalog["backups"] if entry["filename"] != filename]
+        catalog["backups"].append(
+            self._make_catalog_entry(backup_path, backup_type, timestamp, self._get_schema_version(), journal_seq)
+        )
+        self._save_catalog()
+    
+    def _make_catalog_entry(self, backup_path, backup_type, timestamp, schema_version, journal_seq=None):
+        """إنشاء سجل فهرس لملف نسخة احتياطية"""
+        return {
+            "filename": os.path.basename(backup_path),
+            "timestamp": timestamp.isoformat(),
+            "size": os.path.getsize(backup_path),
+            "checksum": self._file_checksum(backup_path),
+            "type": backup_type,
+            "schema_version": schema_version,
+            "journal_seq": journal_seq
+        }
+    
+    def _scan_backup_dir(self):
+        """مسح مجلد النسخ الاحتياطي واستخراج بيانات الملفات (للنسخ القديمة غير المفهرسة)"""
+        entries = []
+        
         # البحث عن جميع ملفات النسخ الاحتياطية
         zip_backups = glob.glob(os.path.join(self.backup_dir, "guzel_clinic_backup_*.zip"))
         db_backups = glob.glob(os.path.join(self.backup_dir, "guzel_backup_*.db"))
@@ -218,30 +644,47 @@ class BackupManager:
                     timestamp_str = filename.replace("guzel_backup_", "").replace(".db", "")
                     timestamp = datetime.datetime.strptime(timestamp_str, "%Y-%m-%d_%H-%M-%S")
                 
-                # الحصول على حجم الملف
-                size = os.path.getsize(backup_path)
-                
-                backups.append({
-                    "filename": filename,
-                    "path": backup_path,
-                    "timestamp": timestamp,
-                    "size": size,
-                    "type": "full" if filename.endswith(".zip") else "simple"
-                })
-            except:
+                backup_type = "full" if filename.endswith(".zip") else "simple"
+                entries.append(self._make_catalog_entry(backup_path, backup_type, timestamp, None))
+            except (OSError, ValueError):
                 continue
         
-        # ترتيب النسخ الاحتياطية حسب التاريخ (الأحدث أولاً)
-        backups.sort(key=lambda x: x["timestamp"], reverse=True)
+        return entries
+    
+    def _copy_database(self, dest_path):
+        """
+        نسخ قاعدة البيانات باستخدام واجهة النسخ الاحتياطي في SQLite
+        (نسخة متسقة تشمل التغييرات الموجودة في ملف WAL)
         
-        return backups
+        Returns:
+            آخر رقم تسلسل في سجل التغييرات ضمن النسخة
+        """
+        src = self.db_manager.get_connection()
+        dst = sqlite3.connect(dest_path)
+        try:
+            src.backup(dst)
+            dst.execute("PRAGMA journal_mode=DELETE")
+            return self.change_journal.current_seq(dst)
+        finally:
+            dst.close()
+            src.close()
     
-    def delete_backup(self, backup_path):
-        """حذف نسخة احتياطية"""
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
-            return True
-        return False
+    def _get_schema_version(self):
+        """قراءة إصدار مخطط قاعدة البيانات الحالية"""
+        conn = self.db_manager.get_connection()
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _file_checksum(path):
+        """حساب المجموع الاختباري SHA-256 لملف على دفعات"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
     
     def auto_backup(self, interval_days=1, backup_type="full"):
         """
@@ -251,6 +694,9 @@ class BackupManager:
             interval_days: عدد الأيام بين النسخ الاحتياطية
             backup_type: نوع النسخة الاحتياطية ("full" أو "simple")
         """
+        # أرشفة سجل التغييرات بشكل دوري
+        self.archive_change_journal()
+        
         # التحقق من الحاجة لنسخة احتياطية
         last_backup = None
         backups = self.get_available_backups()
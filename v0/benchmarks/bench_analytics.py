@@ -0,0 +1,185 @@
+# benchmarks/bench_analytics.py
+"""
+Check and time the NumPy analytics against the per-row Python loops they replace, on a generated database.
+
+Every metric is computed both ways over the whole history: the monthly revenue series, the
+revenue per service (the payment ratio proration of get_revenue_by_service), and each
+customer's lifetime value and visit frequency. If any result differs the exit status is 1.
+tests/test_analytics.py runs the same comparison, untimed, on a small fixed database.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_analytics.py --size medium
+    python benchmarks/bench_analytics.py --database data/synthetic/guzel_large.db
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generate_data import SIZES, generate_database
+from database.db_manager import DatabaseManager
+from database.analytics import InvoiceAnalytics, load_invoice_arrays, numpy_available
+
+# Relative difference allowed between the two ways of summing the same amounts
+TOLERANCE = 1e-9
+
+def python_metrics(db_manager):
+    """The metrics from decoded invoices, one row at a time."""
+    conn = db_manager.get_connection()
+    try:
+        rows = conn.execute('''
+        SELECT customer_id, date, services, total_amount, amount_paid, amount_remaining
+        FROM invoices
+        ''').fetchall()
+    finally:
+        conn.close()
+    
+    months = {}
+    service_revenue = {}
+    customers = {}
+    for customer_id, date, services_json, total_amount, amount_paid, amount_remaining in rows:
+        month = months.setdefault(date[:7] + "-01", [0, 0.0, 0.0, 0.0])
+        month[0] += 1
+        month[1] += total_amount
+        month[2] += amount_paid
+        month[3] += amount_remaining or 0
+        
+        # As get_revenue_by_service did it
+        payment_ratio = 1.0
+        if total_amount > 0:
+            payment_ratio = amount_paid / total_amount
+        
+        for service in json.loads(services_json):
+            allocated_revenue = service['price'] * service.get('quantity', 1) * payment_ratio
+            service_revenue[service['name']] = service_revenue.get(service['name'], 0.0) + allocated_revenue
+        
+        day = datetime.date.fromisoformat(date[:10])
+        customer = customers.setdefault(customer_id, {"visits": 0, "lifetime_value": 0.0, "first": day, "last": day})
+        customer["visits"] += 1
+        customer["lifetime_value"] += amount_paid
+        customer["first"] = min(customer["first"], day)
+        customer["last"] = max(customer["last"], day)
+    
+    for customer in customers.values():
+        customer["days_between_visits"] = (
+            (customer["last"] - customer["first"]).days / (customer["visits"] - 1) if customer["visits"] > 1 else None
+        )
+    
+    return {"months": months, "services": service_revenue, "customers": customers}
+
+def numpy_metrics(analytics):
+    """The same metrics from InvoiceAnalytics, in the shape python_metrics returns."""
+    series = analytics.revenue_series("month")
+    months = {
+        str(period): [int(count), float(total), float(paid), float(remaining)]
+        for period, count, total, paid, remaining in zip(series["periods"], series["invoice_count"],
+                                                         series["total_amount"], series["amount_paid"],
+                                                         series["amount_remaining"])
+    }
+    
+    services = analytics.revenue_by_service()
+    service_revenue = {name: float(paid) for name, paid in zip(services["services"], services["amount_paid"])}
+    
+    metrics = analytics.customer_metrics()
+    customers = {}
+    for i, customer_id in enumerate(metrics["customer_ids"].tolist()):
+        interval = float(metrics["days_between_visits"][i])
+        customers[customer_id] = {
+            "visits": int(metrics["visits"][i]),
+            "lifetime_value": float(metrics["lifetime_value"][i]),
+            "first": metrics["first_visit"][i].item(),
+            "last": metrics["last_visit"][i].item(),
+            "days_between_visits": None if math.isnan(interval) else interval
+        }
+    
+    return {"months": months, "services": service_revenue, "customers": customers}
+
+def same(a, b):
+    if isinstance(a, float) or isinstance(b, float):
+        return b is not None and a is not None and math.isclose(a, b, rel_tol=TOLERANCE, abs_tol=TOLERANCE)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[key], b[key]) for key in a)
+    return a == b
+
+def differences(expected, actual):
+    """Names of the metrics whose results differ, with up to 5 differing keys each."""
+    found = {}
+    for metric in expected:
+        keys = sorted(set(expected[metric]) | set(actual[metric]), key=str)
+        differing = [str(key) for key in keys if not same(expected[metric].get(key), actual[metric].get(key))]
+        if differing:
+            found[metric] = differing[:5]
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="small",
+                        help="size of the database generated for the run")
+    parser.add_argument("--database", help="use this database instead of generating one")
+    args = parser.parse_args()
+    
+    if not numpy_available():
+        print("NumPy is not installed; install it with: pip install numpy")
+        sys.exit(1)
+    
+    temp_dir = None
+    db_path = args.database
+    if not db_path:
+        temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(temp_dir, "analytics.db")
+        customers, appointments, invoices = SIZES[args.size]
+        generate_database(db_path, customers, appointments, invoices)
+    
+    try:
+        db_manager = DatabaseManager(db_path)
+        
+        start = time.perf_counter()
+        expected = python_metrics(db_manager)
+        python_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        arrays = load_invoice_arrays(db_manager)
+        load_seconds = time.perf_counter() - start
+        
+        analytics = InvoiceAnalytics(arrays)
+        timings = {}
+        for name, compute in (("revenue_series", lambda: analytics.revenue_series("month")),
+                              ("revenue_by_service", analytics.revenue_by_service),
+                              ("customer_metrics", analytics.customer_metrics)):
+            start = time.perf_counter()
+            compute()
+            timings[f"{name}_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        
+        found = differences(expected, numpy_metrics(analytics))
+        summary = analytics.summary()
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    numpy_seconds = load_seconds + sum(timings.values()) / 1000
+    print(json.dumps({
+        "invoices": summary["invoices"],
+        "line_items": summary["line_items"],
+        "customers": summary["customers"],
+        "python_loops_ms": round(python_seconds * 1000, 3),
+        "numpy_load_ms": round(load_seconds * 1000, 3),
+        **timings,
+        "speedup": round(python_seconds / numpy_seconds, 2) if numpy_seconds else None,
+        "matches": not found,
+        "differences": found
+    }, ensure_ascii=False, indent=4))
+    
+    if found:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_batch_pdf.py
+"""
+Benchmark batch invoice PDF export throughput against the number of worker processes.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_batch_pdf.py --invoices 500 --workers 1 2 4 8
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import zipfile
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database.db_manager import DatabaseManager
+from config.settings import Settings
+from utils.batch_pdf_exporter import BatchPDFExporter
+
+def create_invoices(db_manager, rng, count):
+    """Create count invoices dated today with one to three services each."""
+    services = db_manager.get_all_services()
+    customer_ids = [
+        db_manager.add_customer({
+            "name": f"زبونة {i}",
+            "phone": f"09{rng.randint(10 ** 7, 10 ** 8 - 1)}"
+        })
+        for i in range(max(1, count // 5))
+    ]
+    
+    invoice_ids = []
+    today = datetime.datetime.now().isoformat()
+    for i in range(count):
+        chosen = rng.sample(services, rng.randint(1, 3))
+        total = sum(service["price"] for service in chosen)
+        invoice_ids.append(db_manager.add_invoice({
+            "customer_id": rng.choice(customer_ids),
+            "appointment_id": None,
+            "date": today,
+            "services": chosen,
+            "payment_method": "cash",
+            "amount_paid": total,
+            "amount_remaining": 0,
+            "invoice_creator": "admin",
+            "service_provider": "Provider",
+            "total_amount": total
+        }))
+    
+    return invoice_ids
+
+def fail(workdir, message):
+    """Report a failed run on stderr, remove the work directory and exit with status 1."""
+    print(message, file=sys.stderr)
+    os.chdir(os.path.dirname(workdir))
+    shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--invoices", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    cpu_count = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, cpu_count})
+    
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="guzel_pdf_")
+    os.chdir(workdir)
+    
+    db_manager = DatabaseManager()
+    settings = Settings()
+    invoice_ids = create_invoices(db_manager, rng, args.invoices)
+    
+    results = []
+    for workers in worker_counts:
+        exporter = BatchPDFExporter(db_manager, settings, max_workers=workers)
+        output_path = os.path.join(workdir, f"invoices_{workers}.zip")
+        
+        start = time.perf_counter()
+        try:
+            exported = exporter.export(output_path, invoice_ids=invoice_ids)
+        except Exception as e:
+            # A pool that can't start (e.g. unpicklable worker arguments) fails the whole run
+            fail(workdir, f"Export with {workers} workers failed: {type(e).__name__}: {e}")
+        seconds = time.perf_counter() - start
+        
+        with zipfile.ZipFile(output_path) as zipf:
+            pdf_count = len(zipf.namelist())
+        if exported != len(invoice_ids) or pdf_count != len(invoice_ids):
+            fail(workdir, f"Export with {workers} workers wrote {pdf_count} of {len(invoice_ids)} invoices")
+        
+        results.append({
+            "workers": workers,
+            "invoices": exported,
+            "seconds": round(seconds, 3),
+            "invoices_per_second": round(exported / seconds, 1) if seconds else None,
+            "zip_bytes": os.path.getsize(output_path)
+        })
+    
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = round(baseline / result["seconds"], 2) if result["seconds"] else None
+    
+    print(json.dumps({
+        "cpu_count": cpu_count,
+        "results": results
+    }, indent=4))
+    
+    os.chdir(os.path.dirname(workdir))
+    shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_parallel_reports.py
+"""
+Benchmark month-partitioned report computation against the number of worker processes.
+
+Each grouping is computed over the whole history of a generated database, serially and
+with every worker count, with the report cache bypassed. The worker pools are started
+before the timing. If a parallel result differs from the serial one the exit status is 1.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_parallel_reports.py --size medium --workers 2 4 8
+    python benchmarks/bench_parallel_reports.py --database data/synthetic/guzel_large.db --groupings service
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from generate_data import SIZES, generate_database
+from database.db_manager import DatabaseManager
+from database.reports import (ReportEngine, ReportCache, GROUPINGS, REPORT_COLUMNS, get_report_pool,
+                              shutdown_report_pools)
+
+def same_rows(expected, actual):
+    """Same groups with the same counts; amounts equal up to the order they were summed in."""
+    if [row["key"] for row in expected] != [row["key"] for row in actual]:
+        return False
+    return all(
+        math.isclose(a[column] or 0, b[column] or 0, rel_tol=1e-9) for a, b in zip(expected, actual)
+        for column in REPORT_COLUMNS[1:]
+    )
+
+def time_report(db_manager, workers, grouping, repeat):
+    """Best time of repeat uncached runs, and the rows of the last one."""
+    best = None
+    for i in range(repeat):
+        engine = ReportEngine(db_manager, cache=ReportCache(), workers=workers)
+        start = time.perf_counter()
+        rows = engine.revenue_by(grouping)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium",
+                        help="size of the database generated for the run")
+    parser.add_argument("--database", help="use this database instead of generating one")
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--groupings", nargs="+", choices=GROUPINGS, default=["service", "service_provider", "month"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted(set(args.workers or {2, 4, cpu_count}) - {1})
+    
+    temp_dir = None
+    db_path = args.database
+    if not db_path:
+        temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(temp_dir, "reports.db")
+        customers, appointments, invoices = SIZES[args.size]
+        generate_database(db_path, customers, appointments, invoices)
+    
+    mismatches = []
+    try:
+        db_manager = DatabaseManager(db_path)
+        
+        pool_start = {}
+        for workers in worker_counts:
+            # Run one trivial task per worker, so spawning isn't timed with the first report
+            start = time.perf_counter()
+            pool = get_report_pool(workers)
+            list(pool.map(abs, range(workers)))
+            pool_start[workers] = round(time.perf_counter() - start, 3)
+        
+        results = []
+        for grouping in args.groupings:
+            serial_seconds, expected = time_report(db_manager, 1, grouping, args.repeat)
+            result = {"grouping": grouping, "groups": len(expected), "serial_seconds": round(serial_seconds, 3)}
+            
+            for workers in worker_counts:
+                seconds, rows = time_report(db_manager, workers, grouping, args.repeat)
+                result[f"workers_{workers}_seconds"] = round(seconds, 3)
+                result[f"workers_{workers}_speedup"] = round(serial_seconds / seconds, 2) if seconds else None
+                if not same_rows(expected, rows):
+                    mismatches.append(f"{grouping} with {workers} workers")
+            
+            results.append(result)
+    finally:
+        shutdown_report_pools()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    print(json.dumps({
+        "cpu_count": cpu_count,
+        "pool_start_seconds": pool_start,
+        "results": results,
+        "mismatches": mismatches
+    }, indent=4))
+    
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_point_in_time.py
+"""
+Benchmark change journal archiving and point-in-time replay over a month of clinic activity.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_point_in_time.py --days 30 --invoices-per-day 80
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database.db_manager import DatabaseManager
+from backup_manager import BackupManager
+
+def simulate_day(db_manager, rng, invoices_per_day, services):
+    """Simulate one working day: new customers, appointments, invoices and a few edits."""
+    customer_ids = []
+    for i in range(max(1, invoices_per_day // 3)):
+        customer_ids.append(db_manager.add_customer({
+            "name": f"زبونة {rng.randint(1, 10 ** 6)}",
+            "phone": f"09{rng.randint(10 ** 7, 10 ** 8 - 1)}"
+        }))
+    
+    today = datetime.datetime.now().isoformat()
+    for i in range(invoices_per_day):
+        customer_id = rng.choice(customer_ids)
+        chosen = rng.sample(services, rng.randint(1, 3))
+        total = sum(service["price"] for service in chosen)
+        paid = total if rng.random() < 0.7 else total / 2
+        
+        appointment_id = db_manager.add_appointment({
+            "customer_id": customer_id,
+            "date_time": today,
+            "services": chosen,
+            "service_provider": "Provider",
+            "status": "confirmed"
+        })
+        db_manager.add_invoice({
+            "customer_id": customer_id,
+            "appointment_id": appointment_id,
+            "date": today,
+            "services": chosen,
+            "payment_method": "cash" if paid == total else "installment",
+            "amount_paid": paid,
+            "amount_remaining": total - paid,
+            "invoice_creator": "admin",
+            "service_provider": "Provider",
+            "total_amount": total
+        })
+    
+    # A few corrections during the day
+    for customer_id in rng.sample(customer_ids, max(1, len(customer_ids) // 5)):
+        customer = db_manager.get_customer(customer_id)
+        customer["notes"] = f"متابعة {rng.randint(1, 100)}"
+        db_manager.update_customer(customer_id, customer)
+
+def table_counts(db_path):
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("customers", "appointments", "invoices")
+        }
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--invoices-per-day", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="guzel_pitr_")
+    os.chdir(workdir)
+    
+    db_manager = DatabaseManager()
+    backup_manager = BackupManager(db_manager)
+    services = db_manager.get_all_services()
+    
+    backup_manager.create_backup()
+    base_time = datetime.datetime.now()
+    
+    archive_seconds = 0.0
+    start = time.perf_counter()
+    for day in range(args.days):
+        simulate_day(db_manager, rng, args.invoices_per_day, services)
+        
+        # The app archives on a timer; once per simulated day here
+        archive_start = time.perf_counter()
+        backup_manager.archive_change_journal()
+        archive_seconds += time.perf_counter() - archive_start
+    simulate_seconds = time.perf_counter() - start
+    
+    expected = table_counts(db_manager.db_path)
+    target_time = datetime.datetime.now()
+    
+    # Keep only the month-old base backup so the whole month is replayed
+    for backup in backup_manager.get_available_backups():
+        if backup["timestamp"] > base_time:
+            backup_manager.delete_backup(backup["path"])
+    
+    start = time.perf_counter()
+    applied = backup_manager.restore_to(target_time)
+    replay_seconds = time.perf_counter() - start
+    
+    restored = table_counts(db_manager.db_path)
+    
+    print(json.dumps({
+        "days": args.days,
+        "invoices_per_day": args.invoices_per_day,
+        "simulate_seconds": round(simulate_seconds, 3),
+        "archive_seconds_total": round(archive_seconds, 3),
+        "replayed_changes": applied,
+        "replay_seconds": round(replay_seconds, 3),
+        "changes_per_second": round(applied / replay_seconds) if replay_seconds else None,
+        "restored_matches_live": restored == expected,
+        "workdir": workdir
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+# benchmarks/bench_suite.py
+"""
+Benchmark models, controllers, reports, backups, PDF rendering and table population on generated databases.
+
+Each size runs against a fresh copy of a database made by generate_data.py (cached in
+benchmarks/data). Results are written as JSON; with --baseline, every benchmark that got
+slower than the baseline by more than --threshold is reported and the exit status is 1.
+Widgets are created with QT_QPA_PLATFORM=offscreen, so no screen is needed.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_suite.py --sizes small medium --output benchmarks/results/baseline.json
+    python benchmarks/bench_suite.py --sizes small medium --baseline benchmarks/results/baseline.json
+    python benchmarks/bench_suite.py --sizes small --only "db.search_*" "tables.*"
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import fnmatch
+import argparse
+import datetime
+import platform
+import statistics
+import tempfile
+
+# Before anything imports Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+V0_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, V0_DIR)
+
+from generate_data import SIZES, generate_database
+from database.db_manager import DatabaseManager
+from database.reports import ReportEngine, GROUPINGS, get_report_cache
+from models.database import DatabaseManager as ModelsDatabaseManager
+from backup_manager import BackupManager
+from config.settings import Settings
+from controllers.clients_controller import ClientsController
+from controllers.appointments_controller import AppointmentsController
+from controllers.invoices_controller import InvoicesController
+from controllers.notifications_controller import NotificationsController
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+TRANSLATIONS_DIR = os.path.join(V0_DIR, "data", "translations")
+
+# A slowdown beyond this fraction of the baseline is a regression
+REGRESSION_THRESHOLD = 0.2
+
+# Differences below this many seconds are noise, whatever the ratio
+MIN_DIFFERENCE = 0.002
+
+# Tab name -> (tab module, tab class, load method)
+TABLE_TABS = {
+    "customers": ("views.tabs.customers_tab", "CustomersTab", "load_customers"),
+    "appointments": ("views.tabs.appointments_tab", "AppointmentsTab", "load_appointments"),
+    "invoices": ("views.tabs.invoices_tab", "InvoicesTab", "load_invoices"),
+    "services": ("views.tabs.services_tab", "ServicesTab", "load_services")
+}
+
+# load_* queries and fills the table, populate_table only fills it from the loaded rows
+TABLE_OPERATIONS = ("load", "populate", "retranslate")
+
+# A common first name, so searches return a realistic share of the rows
+SEARCH_TERM = "فاطمة"
+
+class CountingNotifier:
+    """Stands in for NotificationManager so reminders are counted instead of opening WhatsApp."""
+    
+    def __init__(self):
+        self.sent = 0
+    
+    def send_notification(self, customer_name, customer_phone, message):
+        self.sent += 1
+        return True
+
+def prepare_database(size, seed, end_date, data_dir=DATA_DIR):
+    """Path of a generated database for size, reused while its manifest still matches."""
+    customers, appointments, invoices = SIZES[size]
+    path = os.path.join(data_dir, f"guzel_{size}_seed{seed}.db")
+    expected = {
+        "seed": seed,
+        "end_date": end_date.isoformat(),
+        "counts": {"customers": customers, "appointments": appointments, "invoices": invoices}
+    }
+    
+    try:
+        with open(path + ".json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if os.path.exists(path) and all(manifest.get(key) == value for key, value in expected.items()):
+            return path
+    except (OSError, ValueError):
+        pass
+    
+    for suffix in ("", "-wal", "-shm", ".json"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    
+    print(f"Generating {size} database...", file=sys.stderr)
+    generate_database(path, customers, appointments, invoices, seed=seed, end_date=end_date)
+    return path
+
+def measure(func, repeat):
+    """Run func repeat times; returns the timing summary and the last result."""
+    times = []
+    result = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    
+    return {
+        "seconds": round(statistics.median(times), 6),
+        "min_seconds": round(min(times), 6),
+        "runs": repeat
+    }, result
+
+def result_size(result):
+    """Number of rows (or entries) a benchmarked call returned, if it is a collection."""
+    if isinstance(result, (list, dict, tuple)):
+        return len(result)
+    return None
+
+def uncached(func):
+    """func with the report cache emptied first, so repeated runs time the queries, not the cache."""
+    def run():
+        get_report_cache().clear()
+        return func()
+    return run
+
+def read_benchmarks(db_manager, controllers, end_date):
+    """Read-only benchmarks: name -> callable."""
+    clients, appointments, invoices, notifications = controllers
+    week_start = end_date - datetime.timedelta(days=end_date.weekday())
+    year_ago = end_date - datetime.timedelta(days=365)
+    # Serial, so the report benchmarks time the queries and not the machine's core count
+    reports = ReportEngine(db_manager, workers=1)
+    
+    benchmarks = {
+        "db.get_all_customers": db_manager.get_all_customers,
+        "db.get_all_services": db_manager.get_all_services,
+        "db.get_all_appointments": db_manager.get_all_appointments,
+        "db.get_all_invoices": db_manager.get_all_invoices,
+        "db.search_customers": lambda: db_manager.search_customers(SEARCH_TERM),
+        "db.search_appointments": lambda: db_manager.search_appointments(SEARCH_TERM),
+        "db.search_invoices": lambda: db_manager.search_invoices(SEARCH_TERM),
+        "db.get_daily_revenue": lambda: db_manager.get_daily_revenue(end_date),
+        "db.get_weekly_revenue": lambda: db_manager.get_weekly_revenue(week_start),
+        "db.get_monthly_revenue": lambda: db_manager.get_monthly_revenue(end_date.year, end_date.month),
+        "db.get_revenue_by_service": uncached(lambda: db_manager.get_revenue_by_service(year_ago, end_date)),
+        "controllers.get_all_clients": clients.get_all_clients,
+        "controllers.search_clients": lambda: clients.search_clients(SEARCH_TERM),
+        "controllers.get_all_appointments": appointments.get_all_appointments,
+        "controllers.search_appointments": lambda: appointments.search_appointments(SEARCH_TERM),
+        "controllers.get_all_invoices": invoices.get_all_invoices,
+        "controllers.search_invoices": lambda: invoices.search_invoices(SEARCH_TERM),
+        "controllers.get_daily_revenue": lambda: invoices.get_daily_revenue(end_date),
+        "controllers.get_weekly_revenue": lambda: invoices.get_weekly_revenue(week_start),
+        "controllers.get_monthly_revenue": lambda: invoices.get_monthly_revenue(end_date.year, end_date.month),
+        "controllers.check_upcoming_appointments": notifications.check_upcoming_appointments,
+        "reports.cached": lambda: reports.revenue_by("service", year_ago, end_date)
+    }
+    for grouping in GROUPINGS:
+        benchmarks[f"reports.{grouping}"] = uncached(
+            lambda grouping=grouping: reports.revenue_by(grouping, year_ago, end_date)
+        )
+    
+    return benchmarks
+
+def bench_add_invoice(db_manager, count, seed):
+    """Throughput of add_invoice, half of the invoices paid in installments."""
+    rng = random.Random(seed)
+    services = db_manager.get_all_services()
+    conn = db_manager.get_connection()
+    customer_count = conn.execute("SELECT MAX(id) FROM customers").fetchone()[0] or 1
+    conn.close()
+    today = datetime.date.today().isoformat()
+    
+    start = time.perf_counter()
+    for i in range(count):
+        chosen = rng.sample(services, rng.randint(1, 3))
+        total = sum(service["price"] for service in chosen)
+        paid = total if i % 2 else total / 2
+        db_manager.add_invoice({
+            "customer_id": rng.randint(1, customer_count),
+            "appointment_id": None,
+            "date": today,
+            "services": chosen,
+            "payment_method": "cash" if paid == total else "installment",
+            "amount_paid": paid,
+            "amount_remaining": total - paid,
+            "invoice_creator": "admin",
+            "service_provider": "Provider",
+            "total_amount": total
+        })
+    seconds = time.perf_counter() - start
+    
+    return {
+        "seconds": round(seconds, 6),
+        "count": count,
+        "per_second": round(count / seconds, 1) if seconds else None
+    }
+
+def bench_backups(db_manager, settings):
+    """One full backup of the database, then restoring it."""
+    backup_manager = BackupManager(db_manager, settings)
+    
+    start = time.perf_counter()
+    backup_path = backup_manager.create_backup()
+    create_seconds = time.perf_counter() - start
+    backup_bytes = os.path.getsize(backup_path)
+    
+    start = time.perf_counter()
+    backup_manager.restore_backup(backup_path)
+    restore_seconds = time.perf_counter() - start
+    
+    return {
+        "backup.create": {"seconds": round(create_seconds, 6), "bytes": backup_bytes},
+        "backup.restore": {"seconds": round(restore_seconds, 6)}
+    }
+
+def gui_application():
+    """The offscreen QApplication, or None if PyQt6 is not installed."""
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    return QApplication.instance() or QApplication(sys.argv)
+
+def bench_pdf(db_manager, settings, count, output_dir):
+    """Rendering count invoices to PDF files, one after the other."""
+    from utils.pdf_generator import PDFGenerator
+    
+    generator = PDFGenerator(settings)
+    invoices = [db_manager.get_invoice(invoice_id) for invoice_id in range(1, count + 1)]
+    invoices = [invoice for invoice in invoices if invoice]
+    
+    start = time.perf_counter()
+    for invoice in invoices:
+        generator.generate_invoice_pdf(invoice, os.path.join(output_dir, f"invoice_{invoice['id']}.pdf"))
+    seconds = time.perf_counter() - start
+    
+    return {
+        "seconds": round(seconds, 6),
+        "count": len(invoices),
+        "per_second": round(len(invoices) / seconds, 1) if seconds else None
+    }
+
+def table_benchmark_names():
+    return [f"tables.{tab}.{operation}" for tab in TABLE_TABS for operation in TABLE_OPERATIONS]
+
+def table_benchmarks(db_manager, settings, selected):
+    """Table population benchmarks on the main window tabs: name -> callable."""
+    import importlib
+    from utils.language_manager import LanguageManager
+    
+    language_manager = LanguageManager(settings)
+    benchmarks = {}
+    for tab_name, (module_name, class_name, load_method) in TABLE_TABS.items():
+        names = [f"tables.{tab_name}.{operation}" for operation in TABLE_OPERATIONS]
+        if not any(selected(name) for name in names):
+            continue
+        
+        # Creating the tab already loads its rows once
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        tab = tab_class(db_manager, language_manager, True)
+        operations = dict(zip(names, (getattr(tab, load_method), tab.populate_table, tab.retranslate)))
+        benchmarks.update((name, func) for name, func in operations.items() if selected(name))
+    
+    return benchmarks
+
+def run_size(size, db_path, end_date, args):
+    """Run every selected benchmark on a copy of db_path; returns name -> result."""
+    selected = lambda name: not args.only or any(fnmatch.fnmatch(name, pattern) for pattern in args.only)
+    
+    workdir = tempfile.mkdtemp(prefix=f"guzel_suite_{size}_")
+    os.makedirs(os.path.join(workdir, "data"))
+    shutil.copy(db_path, os.path.join(workdir, "data", "guzel_clinic.db"))
+    shutil.copytree(TRANSLATIONS_DIR, os.path.join(workdir, "data", "translations"))
+    
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    results = {}
+    try:
+        db_manager = DatabaseManager()
+        settings = Settings()
+        
+        models_db = ModelsDatabaseManager(db_manager.db_path)
+        controllers = (
+            ClientsController(models_db),
+            AppointmentsController(models_db),
+            InvoicesController(models_db),
+            NotificationsController(models_db, CountingNotifier())
+        )
+        
+        for name, func in read_benchmarks(db_manager, controllers, end_date).items():
+            if selected(name):
+                results[name], result = measure(func, args.repeat)
+                results[name]["items"] = result_size(result)
+                print(f"{size} {name}: {results[name]['seconds'] * 1000:.1f} ms", file=sys.stderr)
+        
+        gui_names = [name for name in table_benchmark_names() + ["pdf.generate_invoice_pdf"] if selected(name)]
+        app = gui_application() if gui_names else None
+        if gui_names and app is None:
+            for name in gui_names:
+                results[name] = {"skipped": "PyQt6 is not installed"}
+        elif gui_names:
+            for name, func in table_benchmarks(db_manager, settings, selected).items():
+                results[name], result = measure(func, args.repeat)
+                print(f"{size} {name}: {results[name]['seconds'] * 1000:.1f} ms", file=sys.stderr)
+            
+            if selected("pdf.generate_invoice_pdf"):
+                pdf_dir = os.path.join(workdir, "pdf")
+                os.makedirs(pdf_dir)
+                results["pdf.generate_invoice_pdf"] = bench_pdf(db_manager, settings, args.pdf_invoices, pdf_dir)
+        
+        # Benchmarks that write go last, so the reads above see the generated data only
+        if selected("db.add_invoice"):
+            results["db.add_invoice"] = bench_add_invoice(db_manager, args.add_invoices, args.seed)
+        
+        if selected("backup.create") or selected("backup.restore"):
+            results.update(bench_backups(db_manager, settings))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    return results
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Compare results with a baseline run; returns (comparison rows, regressions)."""
+    rows = []
+    for size, size_results in results["sizes"].items():
+        baseline_benchmarks = baseline.get("sizes", {}).get(size, {}).get("benchmarks", {})
+        for name, result in size_results["benchmarks"].items():
+            before = baseline_benchmarks.get(name, {}).get("seconds")
+            after = result.get("seconds")
+            if before is None or after is None:
+                continue
+            
+            ratio = after / before if before else None
+            regressed = (
+                ratio is not None
+                and ratio > 1 + threshold
+                and after - before > MIN_DIFFERENCE
+            )
+            rows.append({
+                "size": size,
+                "benchmark": name,
+                "baseline_seconds": before,
+                "seconds": after,
+                "ratio": round(ratio, 3) if ratio is not None else None,
+                "regression": regressed
+            })
+    
+    return rows, [row for row in rows if row["regression"]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", metavar="PATTERN", help="run only benchmarks matching these globs")
+    parser.add_argument("--add-invoices", type=int, default=200)
+    parser.add_argument("--pdf-invoices", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--end-date", type=datetime.date.fromisoformat, help="YYYY-MM-DD, default today")
+    parser.add_argument("--output", help="default benchmarks/results/suite_<timestamp>.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="flag benchmarks slower than baseline * (1 + threshold)")
+    args = parser.parse_args()
+    
+    end_date = args.end_date or datetime.date.today()
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "end_date": end_date.isoformat(),
+        "repeat": args.repeat,
+        "sizes": {}
+    }
+    
+    for size in args.sizes:
+        db_path = prepare_database(size, args.seed, end_date)
+        customers, appointments, invoices = SIZES[size]
+        results["sizes"][size] = {
+            "counts": {"customers": customers, "appointments": appointments, "invoices": invoices},
+            "benchmarks": run_size(size, db_path, end_date, args)
+        }
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"suite_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+    
+    summary = {"results": output}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.threshold)
+        summary.update({
+            "baseline": args.baseline,
+            "threshold": args.threshold,
+            "compared": len(rows),
+            "regressions": regressions
+        })
+    else:
+        summary["sizes"] = {
+            size: {name: result.get("seconds", result.get("skipped")) for name, result in size_results["benchmarks"].items()}
+            for size, size_results in results["sizes"].items()
+        }
+    
+    print(json.dumps(summary, ensure_ascii=False, indent=4))
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_themes.py
+"""
+Benchmark theme toggling: compiling the QSS stylesheets, toggling between themes and re-applying the current theme.
+
+Usage (from the v0 directory):
+    python benchmarks/bench_themes.py --toggles 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QTableWidget,
+                             QTableWidgetItem, QPushButton, QLineEdit)
+
+from utils.theme_manager import ThemeManager
+
+class MemorySettings:
+    """Settings stand-in so the benchmark never writes settings.json."""
+    
+    def __init__(self):
+        self.settings = {"theme": "light"}
+    
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+    
+    def set_setting(self, key, value):
+        self.settings[key] = value
+
+def build_window(rows):
+    """A window with roughly the widget count of the main window's tabs."""
+    window = QMainWindow()
+    central = QWidget()
+    layout = QVBoxLayout(central)
+    
+    for _ in range(4):
+        table = QTableWidget(rows, 9)
+        for row in range(rows):
+            for column in range(9):
+                table.setItem(row, column, QTableWidgetItem(f"{row}:{column}"))
+        layout.addWidget(table)
+        layout.addWidget(QLineEdit())
+        for _ in range(4):
+            layout.addWidget(QPushButton("button"))
+    
+    window.setCentralWidget(central)
+    window.show()
+    return window
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+    
+    app = QApplication(sys.argv)
+    window = build_window(args.rows)
+    app.processEvents()
+    
+    theme_manager = ThemeManager(MemorySettings())
+    
+    start = time.perf_counter()
+    for theme_name in theme_manager.themes:
+        theme_manager.get_stylesheet(theme_name)
+    compile_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for theme_name in theme_manager.themes:
+        theme_manager.get_stylesheet(theme_name)
+    cached_seconds = time.perf_counter() - start
+    
+    theme_manager.apply_theme()
+    app.processEvents()
+    
+    # Each toggle re-polishes the whole window
+    start = time.perf_counter()
+    for i in range(args.toggles):
+        theme_manager.set_theme("dark" if i % 2 == 0 else "light")
+        app.processEvents()
+    toggle_seconds = (time.perf_counter() - start) / args.toggles
+    
+    # Re-applying the current theme (as refresh_ui does) finds nothing to change
+    start = time.perf_counter()
+    for _ in range(args.toggles):
+        theme_manager.apply_theme()
+        app.processEvents()
+    reapply_seconds = (time.perf_counter() - start) / args.toggles
+    
+    window.close()
+    
+    print(json.dumps({
+        "toggles": args.toggles,
+        "rows_per_table": args.rows,
+        "compile_both_themes_ms": round(compile_seconds * 1000, 3),
+        "cached_both_themes_ms": round(cached_seconds * 1000, 3),
+        "toggle_ms": round(toggle_seconds * 1000, 3),
+        "reapply_unchanged_ms": round(reapply_seconds * 1000, 3)
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
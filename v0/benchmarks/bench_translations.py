@@ -0,0 +1,110 @@
+# benchmarks/bench_translations.py
+"""
+Micro-benchmark translation lookups (nested dict walk per call vs. the compiled flat tables)
+and startup loading (parsing both JSON files vs. the cached compiled table of one language).
+
+Usage (from the v0 directory):
+    python benchmarks/bench_translations.py --lookups 200000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config.settings import Settings
+from utils.translation_loader import compile_translations, TranslationLoader
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "translations")
+
+# Keys a typical table refresh looks up, including per-row suffixes
+KEYS = [
+    "invoices.id", "invoices.customer_name", "invoices.cash", "invoices.installment",
+    "services.price_currency", "common.save", "common.error", "missing.key"
+]
+
+def nested_lookup(translations, settings, key):
+    """The lookup as LanguageManager.get_translation did it before compiling."""
+    language = settings.get_setting("language", "ar")
+    value = translations.get(language, {})
+    
+    for k in key.split('.'):
+        if k in value:
+            value = value[k]
+        else:
+            return key
+    
+    if isinstance(value, dict) and 'text' in value:
+        return value['text']
+    
+    return value
+
+def flat_lookup(current_texts, key):
+    """The lookup as LanguageManager.get_translation does it now."""
+    value = current_texts.get(key)
+    if value is None:
+        return key
+    return value
+
+def time_lookups(lookup, lookups):
+    keys = KEYS * (lookups // len(KEYS))
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+    
+    translations = {}
+    for language in ("ar", "en"):
+        with open(os.path.join(TRANSLATIONS_DIR, f"{language}.json"), 'r', encoding='utf-8') as f:
+            translations[language] = json.load(f)
+    
+    settings = Settings.__new__(Settings)
+    settings.settings = {"language": "ar"}
+    
+    start = time.perf_counter()
+    texts, icons = compile_translations(translations)
+    compile_seconds = time.perf_counter() - start
+    
+    # Startup: a cold load compiles and writes the cache, a warm load only reads it
+    cache_dir = tempfile.mkdtemp(prefix="guzel_translations_")
+    start = time.perf_counter()
+    TranslationLoader(TRANSLATIONS_DIR, cache_dir=cache_dir).load("ar")
+    cold_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    TranslationLoader(TRANSLATIONS_DIR, cache_dir=cache_dir).load("ar")
+    warm_seconds = time.perf_counter() - start
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    
+    start = time.perf_counter()
+    for language in ("ar", "en"):
+        with open(os.path.join(TRANSLATIONS_DIR, f"{language}.json"), 'r', encoding='utf-8') as f:
+            json.load(f)
+    json_seconds = time.perf_counter() - start
+    
+    current_texts = texts["ar"]
+    nested = time_lookups(lambda key: nested_lookup(translations, settings, key), args.lookups)
+    flat = time_lookups(lambda key: flat_lookup(current_texts, key), args.lookups)
+    
+    print(json.dumps({
+        "lookups": args.lookups,
+        "compile_ms": round(compile_seconds * 1000, 3),
+        "startup_json_both_languages_ms": round(json_seconds * 1000, 3),
+        "startup_cold_load_ms": round(cold_seconds * 1000, 3),
+        "startup_cached_load_ms": round(warm_seconds * 1000, 3),
+        "nested_ns_per_lookup": round(nested * 1e9, 1),
+        "flat_ns_per_lookup": round(flat * 1e9, 1),
+        "speedup": round(nested / flat, 2)
+    }, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ def build_executable():
         # Check if PyInstaller is installed
         subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
         
+        # Pack the icons so the app loads them from one file
+        subprocess.run([sys.executable, "build_icons.py"], check=True)
+        
         # Create spec file
         spec_content = """
 # -*- mode: python ; coding: utf-8 -*-
@@ -22,7 +25,8 @@ a = Analysis(
     binaries=[],
     datas=[
         ('data', 'data'),
-        ('icons', 'icons'),
+        ('assets', 'assets'),
+        ('styles', 'styles'),
         ('backups', 'backups')
     ],
     hiddenimports=[],
@@ -53,7 +57,7 @@ exe = EXE(
     target_arch=None,
     codesign_identity=None,
     entitlements_file=None,
-    icon='icons/settings.png',
+    icon='assets/icons/app_icon.png',
 )
 coll = COLLECT(
     exe,
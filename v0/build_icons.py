@@ -0,0 +1,52 @@
+# build_icons.py
+import os
+import sys
+import glob
+import shutil
+import zipfile
+import tempfile
+
+from utils.icon_loader import ICON_PATH, BUNDLE_PATH
+
+# The GUI application IconGenerator paints with, kept alive while the bundle is built
+_app = None
+
+def build_icon_bundle(icons_dir=ICON_PATH, bundle_path=BUNDLE_PATH):
+    """Pack every icon, plus the pre-rendered IconGenerator output, into one bundle file.
+    
+    The app reads the bundle once at startup instead of opening each icon file,
+    and never has to paint the generated icons itself. Shipped icons win over
+    generated placeholders with the same name.
+    """
+    global _app
+    # IconGenerator needs a GUI application to paint, but no screen
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+    from utils.icon_generator import IconGenerator
+    
+    _app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    
+    icons = {}
+    for path in sorted(glob.glob(os.path.join(icons_dir, "*.png"))):
+        icons[os.path.basename(path)] = path
+    
+    generated_dir = tempfile.mkdtemp(prefix="guzel_icons_")
+    try:
+        # The generator is the source of the icons it draws, but only of the ones not shipped
+        for name, path in IconGenerator(generated_dir).generate_all_icons().items():
+            icons.setdefault(name, path)
+        
+        temp_path = bundle_path + ".tmp"
+        # PNGs are already compressed
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED) as bundle:
+            for name, path in icons.items():
+                bundle.write(path, name)
+        os.replace(temp_path, bundle_path)
+    finally:
+        shutil.rmtree(generated_dir, ignore_errors=True)
+    
+    print(f"Bundled {len(icons)} icons into {bundle_path}")
+    return bundle_path
+
+if __name__ == "__main__":
+    build_icon_bundle()
@@ -0,0 +1,290 @@
+# check_query_plans.py
+"""
+Check the query plan of every SQL statement in the data layer against the migrated schema.
+
+Statements are collected from the source of database/db_manager.py, database/reports.py,
+models/*.py, controllers/auth_controller.py, utils/csv_importer.py and utils/data_exporter.py,
+then run through EXPLAIN QUERY PLAN. A statement fails when its plan scans one of the large tables, unless that exact plan is in the reviewed
+allow-list with a reason. The exit status is 1 if any statement fails.
+
+Usage (from the v0 directory):
+    python check_query_plans.py
+    python check_query_plans.py --database data/synthetic/guzel_large.db
+    python check_query_plans.py --update-allowlist
+"""
+import os
+import re
+import ast
+import sys
+import glob
+import json
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+from database.db_manager import DatabaseManager
+from database.migrations import SCHEMA_VERSION, get_schema_version
+from database.query_profiler import normalize_sql
+
+SOURCES = ["database/db_manager.py", "models/*.py", "controllers/auth_controller.py", "utils/csv_importer.py",
+           "utils/data_exporter.py", "database/reports.py",
+           "database/analytics.py"]
+
+ALLOWLIST_PATH = "database/query_plan_allowlist.json"
+
+# Tables that grow with the clinic's history; scanning them needs a reviewed reason
+LARGE_TABLES = ("customers", "appointments", "invoices", "change_journal")
+
+# Reason written for plans added by --update-allowlist; they fail until someone reviews them
+UNREVIEWED = "TODO: review"
+
+PLANNED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+# Statuses that make the check fail
+FAILURES = ("scan", "changed", "unreviewed", "error")
+
+# Stands in for the formatted parts of f-string SQL
+FORMATTED_VALUE = "?"
+
+_TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ON|SET|ORDER|GROUP|LEFT|INNER|"
+    r"VALUES|LIMIT|USING)\b)(\w+))?",
+    re.IGNORECASE
+)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+class _StatementCollector(ast.NodeVisitor):
+    """Finds the SQL passed to execute()/executemany() in one source file."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.statements = []
+        self._functions = []
+    
+    def visit_FunctionDef(self, node):
+        self._functions.append(node)
+        self.generic_visit(node)
+        self._functions.pop()
+    
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute) and node.func.attr in ("execute", "executemany") and node.args:
+            sql, dynamic = self._resolve(node.args[0])
+            function = self._functions[-1].name if self._functions else "<module>"
+            self.statements.append({
+                "sql": sql,
+                "dynamic": dynamic,
+                "location": f"{self.path}:{node.lineno} ({function})"
+            })
+        self.generic_visit(node)
+    
+    def _resolve(self, node):
+        """(SQL text or None, whether parts of it are only known at run time)."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value, False
+        
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(value.value)
+                else:
+                    parts.append(FORMATTED_VALUE)
+            return "".join(parts), True
+        
+        # A variable assigned a literal earlier in the same function
+        if isinstance(node, ast.Name) and self._functions:
+            for child in ast.walk(self._functions[-1]):
+                if isinstance(child, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == node.id for target in child.targets
+                ):
+                    return self._resolve(child.value)
+        
+        return None, True
+
+def collect_statements(patterns=SOURCES):
+    """Every distinct statement in the sources: normalized SQL -> statement dict with its locations."""
+    statements = {}
+    unresolved = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), path)
+            
+            collector = _StatementCollector(path.replace(os.sep, "/"))
+            collector.visit(tree)
+            
+            for statement in collector.statements:
+                if statement["sql"] is None:
+                    unresolved.append(statement["location"])
+                    continue
+                
+                key = normalize_sql(statement["sql"])
+                if not key.upper().startswith(PLANNED_STATEMENTS):
+                    continue
+                
+                entry = statements.setdefault(key, {"sql": key, "dynamic": statement["dynamic"], "locations": []})
+                entry["locations"].append(statement["location"])
+    
+    return statements, unresolved
+
+def table_aliases(sql):
+    """alias (or table name) -> table for the tables a statement refers to."""
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+def explain(conn, sql):
+    """The plan's detail lines, with NULL bound to every parameter."""
+    parameters = _STRING_LITERAL.sub("", sql).count("?")
+    cursor = conn.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * parameters)
+    return [row[-1] for row in cursor.fetchall()]
+
+def scanned_tables(sql, plan):
+    """The large tables a plan reads in full."""
+    aliases = table_aliases(sql)
+    tables = []
+    for detail in plan:
+        match = _SCAN.match(detail)
+        if match:
+            table = aliases.get(match.group(1), match.group(1))
+            if table in LARGE_TABLES and table not in tables:
+                tables.append(table)
+    return tables
+
+def load_allowlist(path=ALLOWLIST_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_allowlist(allowlist, path=ALLOWLIST_PATH):
+    with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+        json.dump(dict(sorted(allowlist.items())), f, ensure_ascii=False, indent=4)
+        f.write("\n")
+
+def check_plans(conn, statements, allowlist):
+    """Compare every statement's plan with the allow-list.
+    
+    Returns (results, stale): one result dict per statement with a "status" of ok,
+    allowed, scan, changed, unreviewed, error or dynamic, and the allow-list entries
+    that no longer match a scanning statement.
+    """
+    results = []
+    used = set()
+    
+    for key, statement in sorted(statements.items()):
+        result = dict(statement, plan=None, scans=[])
+        try:
+            result["plan"] = explain(conn, key)
+        except sqlite3.Error as e:
+            # f-string SQL can't always be prepared with placeholders in it
+            result["status"] = "dynamic" if statement["dynamic"] else "error"
+            result["error"] = str(e)
+            results.append(result)
+            continue
+        
+        result["scans"] = scanned_tables(key, result["plan"])
+        entry = allowlist.get(key)
+        if not result["scans"]:
+            result["status"] = "ok"
+        elif entry is None:
+            result["status"] = "scan"
+        elif entry.get("plan") != result["plan"]:
+            result["status"] = "changed"
+            result["allowed_plan"] = entry.get("plan")
+        elif not entry.get("reason") or entry["reason"] == UNREVIEWED:
+            result["status"] = "unreviewed"
+        else:
+            result["status"] = "allowed"
+            result["reason"] = entry["reason"]
+        
+        if result["scans"] and entry is not None:
+            used.add(key)
+        results.append(result)
+    
+    stale = sorted(set(allowlist) - used)
+    return results, stale
+
+def update_allowlist(allowlist, results):
+    """The allow-list for the current plans; new or changed plans are marked for review."""
+    updated = {}
+    for result in results:
+        if not result["scans"]:
+            continue
+        
+        entry = allowlist.get(result["sql"])
+        if entry is not None and entry.get("plan") == result["plan"]:
+            updated[result["sql"]] = entry
+        else:
+            updated[result["sql"]] = {"plan": result["plan"], "reason": UNREVIEWED}
+    return updated
+
+def migrated_database(directory):
+    """A new database with the current schema, migrations included."""
+    return DatabaseManager(os.path.join(directory, "query_plans.db")).db_path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", help="check against this database (e.g. one with ANALYZE statistics) "
+                                           "instead of a new empty one")
+    parser.add_argument("--allowlist", default=ALLOWLIST_PATH)
+    parser.add_argument("--update-allowlist", action="store_true",
+                        help="rewrite the allow-list from the current plans, marking new ones for review")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the failures")
+    args = parser.parse_args()
+    
+    statements, unresolved = collect_statements()
+    allowlist = load_allowlist(args.allowlist)
+    
+    workdir = tempfile.mkdtemp(prefix="guzel_plans_")
+    try:
+        db_path = args.database or migrated_database(workdir)
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            version = get_schema_version(conn)
+            if version < SCHEMA_VERSION:
+                print(f"Warning: {db_path} is at schema version {version}, the code expects {SCHEMA_VERSION}")
+            
+            results, stale = check_plans(conn, statements, allowlist)
+            if args.update_allowlist:
+                allowlist = update_allowlist(allowlist, results)
+                save_allowlist(allowlist, args.allowlist)
+                print(f"Wrote {len(allowlist)} plans to {args.allowlist}")
+                results, stale = check_plans(conn, statements, allowlist)
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    for result in results:
+        if result["status"] in FAILURES or args.verbose:
+            print(f"[{result['status']}] {result['sql']}")
+            for location in result["locations"]:
+                print(f"    at {location}")
+            if result.get("error"):
+                print(f"    error: {result['error']}")
+            for detail in result["plan"] or []:
+                print(f"    plan: {detail}")
+            for detail in result.get("allowed_plan") or []:
+                print(f"    allowed: {detail}")
+    
+    for key in stale:
+        print(f"[stale] allow-list entry no longer needed: {key}")
+    for location in unresolved:
+        print(f"[skipped] SQL built at run time at {location}")
+    
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    print(json.dumps({"statements": len(results), **dict(sorted(counts.items())), "stale": len(stale)}, indent=4))
+    
+    sys.exit(1 if any(result["status"] in FAILURES for result in results) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,64 @@
 # config/settings.py
 import json
 import os
+import atexit
+import threading
+import weakref
+
+# Changes are written this many seconds after the last set_setting call
+FLUSH_DELAY = 0.5
+
+# Cached result for keys that are not set (None is a valid setting value)
+_MISSING = object()
+
+# Instances with unwritten changes, flushed when the interpreter exits
+_pending = weakref.WeakSet()
 
 class Settings:
-    """Manages application settings and preferences."""
+    """Manages application settings and preferences.
+    
+    Changes are kept in memory and written back once, FLUSH_DELAY seconds
+    after the last one (and on exit), by writing a temporary file and
+    renaming it over settings.json.
+    """
     
-    def __init__(self):
-        self.settings_file = "data/settings.json"
+    def __init__(self, settings_file="data/settings.json", flush_delay=FLUSH_DELAY):
+        self.settings_file = settings_file
+        self.flush_delay = flush_delay
+        self.version = None
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._changes = 0
+        self._key_parts = {}
+        self._lookups = {}
         self._ensure_data_dir()
         self._load_settings()
     
+    def __getstate__(self):
+        # The lock and the write-behind timer belong to this process
+        state = self.__dict__.copy()
+        del state["_lock"], state["_timer"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._timer = None
+        if self._dirty:
+            _pending.add(self)
+    
     def _ensure_data_dir(self):
         """Ensure the data directory exists."""
         os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
     
     def _load_settings(self):
         """Load settings from the settings file or create default settings."""
+        self._lookups = {}
         if os.path.exists(self.settings_file):
             with open(self.settings_file, 'r', encoding='utf-8') as f:
                 self.settings = json.load(f)
+            self.version = self._file_version()
         else:
             # Default settings
             self.settings = {
@@ -34,45 +74,123 @@ class Settings:
                 "backup": {
                     "auto_backup": True,
                     "backup_interval_days": 1,
-                    "backup_location": "backups/"
+                    "backup_location": "backups/",
+                    "keep_daily": 7,
+                    "keep_weekly": 4,
+                    "keep_monthly": 12,
+                    "journal_archive_minutes": 15
                 },
                 "notifications": {
                     "appointment_reminder": True,
                     "reminder_hours_before": 24
+                },
+                "reports": {
+                    "parallel": True
                 }
             }
             self._save_settings()
     
     def _save_settings(self):
-        """Save settings to the settings file."""
-        with open(self.settings_file, 'w', encoding='utf-8') as f:
-            json.dump(self.settings, f, ensure_ascii=False, indent=4)
+        """Save settings to the settings file atomically (a crash never leaves half a file)."""
+        with self._lock:
+            temp_file = self.settings_file + ".tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, ensure_ascii=False, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.settings_file)
+            self.version = self._file_version()
+            self._dirty = False
+            _pending.discard(self)
+    
+    def flush(self):
+        """Write pending changes now."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save_settings()
+    
+    def _schedule_flush(self):
+        """Restart the write-behind timer; called with the lock held."""
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _file_version(self):
+        """Version stamp of the settings file; changes whenever any instance saves it."""
+        try:
+            stat = os.stat(self.settings_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def reload_if_changed(self):
+        """Reload the settings if the file was saved since it was last read.
+        
+        Returns True if the settings were reloaded. Unwritten changes of this
+        instance are newer than the file, so they are kept.
+        """
+        with self._lock:
+            if self._dirty or self._file_version() == self.version:
+                return False
+            self._load_settings()
+            return True
+    
+    def _split(self, key):
+        parts = self._key_parts.get(key)
+        if parts is None:
+            parts = self._key_parts[key] = tuple(key.split('.'))
+        return parts
     
     def get_setting(self, key, default=None):
         """Get a setting value by key."""
-        keys = key.split('.')
-        value = self.settings
-        
-        for k in keys:
-            if k in value:
-                value = value[k]
-            else:
-                return default
+        try:
+            value = self._lookups[key]
+        except KeyError:
+            value = self.settings
+            for k in self._split(key):
+                if isinstance(value, dict) and k in value:
+                    value = value[k]
+                else:
+                    value = _MISSING
+                    break
+            self._lookups[key] = value
         
-        return value
+        return default if value is _MISSING else value
     
     def set_setting(self, key, value):
-        """Set a setting value by key."""
-        keys = key.split('.')
-        settings_dict = self.settings
+        """Set a setting value by key; the file is written shortly after."""
+        keys = self._split(key)
         
-        # Navigate to the nested dictionary
-        for k in keys[:-1]:
-            if k not in settings_dict:
-                settings_dict[k] = {}
-            settings_dict = settings_dict[k]
-        
-        # Set the value
-        settings_dict[keys[-1]] = value
-        self._save_settings()
+        with self._lock:
+            settings_dict = self.settings
+            
+            # Navigate to the nested dictionary
+            for k in keys[:-1]:
+                if k not in settings_dict:
+                    settings_dict[k] = {}
+                settings_dict = settings_dict[k]
+            
+            # Set the value
+            settings_dict[keys[-1]] = value
+            
+            # Any cached lookup may sit above or below the changed key
+            self._lookups = {}
+            
+            # A new version right away, so caches keyed on it see the change before the write
+            self._changes += 1
+            self.version = ("pending", self._changes)
+            self._dirty = True
+            _pending.add(self)
+            self._schedule_flush()
+
+@atexit.register
+def _flush_pending():
+    """Write every instance's unwritten changes before the interpreter exits."""
+    for settings in list(_pending):
+        settings.flush()
 
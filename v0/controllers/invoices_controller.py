@@ -19,6 +19,22 @@ class InvoicesController:
         """Search for invoices."""
         return self.model.search_invoices(search_term)
     
+    def get_invoice_version(self, invoice_id):
+        """Get the change stamp of an invoice."""
+        return self.model.get_invoice_version(invoice_id)
+    
+    def get_invoices_by_date_range(self, start_date, end_date):
+        """Get invoices between two dates (inclusive)."""
+        return self.model.get_invoices_by_date_range(start_date, end_date)
+    
+    def iter_invoices_by_date_range(self, start_date, end_date):
+        """Iterate over invoices between two dates (inclusive) without loading them all."""
+        return self.model.iter_invoices_by_date_range(start_date, end_date)
+    
+    def get_invoices_by_ids(self, invoice_ids):
+        """Get invoices by a list of IDs."""
+        return self.model.get_invoices_by_ids(invoice_ids)
+    
     def add_invoice(self, invoice_data):
         """Add a new invoice."""
         # Validate required fields
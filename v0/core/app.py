@@ -5,7 +5,11 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTranslator, QLocale
 from config.settings import Settings
 from models.database import DatabaseManager
+from database.query_profiler import get_query_profiler, SLOW_QUERY_MS
+from database.reports import shutdown_report_pools
+from utils.tracing import configure_tracing
 from utils.translator import TranslationManager
+from utils.theme_manager import ThemeManager
 from backup_manager import BackupManager
 from utils.whatsapp_sender import NotificationManager
 from core.router import Router
@@ -18,15 +22,19 @@ class Application:
         self.app = QApplication(sys.argv)
         self.app.setApplicationName("Guzel Beauty Clinic")
         self.app.setOrganizationName("Guzel")
+        # Stop the report worker processes with the event loop
+        self.app.aboutToQuit.connect(shutdown_report_pools)
         
         # Ensure data directories exist
         self._ensure_directories()
         
         # Initialize managers
         self.settings = Settings()
+        get_query_profiler().slow_query_ms = self.settings.get_setting("diagnostics.slow_query_ms", SLOW_QUERY_MS)
+        configure_tracing(self.settings)
         self.db_manager = DatabaseManager()
         self.translation_manager = TranslationManager(self.settings)
-        self.backup_manager = BackupManager(self.db_manager)
+        self.backup_manager = BackupManager(self.db_manager, self.settings)
         self.notification_manager = NotificationManager(self.settings)
         
         # Apply initial settings
@@ -59,12 +67,7 @@ class Application:
         self.translation_manager.apply_language()
         
         # Apply theme
-        theme_name = self.settings.get_setting("theme", "light")
-        theme_file = f"styles/{theme_name}.qss"
-        
-        if os.path.exists(theme_file):
-            with open(theme_file, "r", encoding="utf-8") as f:
-                self.app.setStyleSheet(f.read())
+        ThemeManager(self.settings).apply_theme()
     
     def run(self):
         """Run the application."""
@@ -0,0 +1,291 @@
+# database/analytics.py
+import json
+
+from database.reports import date_range_bounds
+from utils.tracing import traced
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; only the analytics need it
+    np = None
+
+# Rows fetched from the cursor at a time while filling the arrays
+FETCH_SIZE = 10000
+
+# Revenue series periods, each keyed by its first day (weeks start on Monday)
+ANALYTICS_PERIODS = ("day", "week", "month", "year")
+
+def numpy_available():
+    return np is not None
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The analytics need NumPy; install it with: pip install numpy")
+
+class InvoiceArrays:
+    """Invoice and line-item columns as NumPy arrays, one element per invoice or line item.
+    
+    Dates are whole days since 1970-01-01. A line item's invoice is given as its row in
+    the invoice arrays, and its service as an index into service_names.
+    """
+    
+    def __init__(self, ids, customer_ids, days, total_amount, amount_paid, amount_remaining,
+                 line_rows, line_services, line_amounts, service_names):
+        self.ids = ids
+        self.customer_ids = customer_ids
+        self.days = days
+        self.total_amount = total_amount
+        self.amount_paid = amount_paid
+        self.amount_remaining = amount_remaining
+        self.line_rows = line_rows
+        self.line_services = line_services
+        self.line_amounts = line_amounts
+        self.service_names = service_names
+    
+    def __len__(self):
+        return len(self.ids)
+
+def _fill(cursor, arrays, fetch_size, convert=None):
+    """Copy a cursor's columns into preallocated arrays, fetch_size rows at a time.
+    
+    convert, if given, maps each batch's columns before they're stored. Returns the
+    number of rows copied; it can be less than the arrays' length.
+    """
+    done = 0
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        
+        columns = list(zip(*rows))
+        if convert:
+            columns = convert(columns)
+        end = done + len(rows)
+        for array, column in zip(arrays, columns):
+            array[done:end] = column
+        done = end
+    
+    return done
+
+def _line_items(services_json):
+    """(service name, line total) for each service of a stored services list.
+    
+    Line total = price x quantity, as on the printed invoice and in ReportEngine.
+    """
+    items = []
+    for service in json.loads(services_json or "[]"):
+        if not isinstance(service, dict):
+            service = {}
+        quantity = service.get("quantity")
+        items.append((service.get("name"), (service.get("price") or 0) * (1 if quantity is None else quantity)))
+    return items
+
+def _select_invoices(conn, start_date, end_date):
+    """The number of invoices in the range and a cursor over their columns."""
+    if start_date or end_date:
+        bounds = date_range_bounds(start_date, end_date)
+        count = conn.execute("SELECT COUNT(*) FROM invoices WHERE date >= ? AND date < ?", bounds).fetchone()[0]
+        # julianday('1970-01-01') = 2440587.5, so this is the day number NumPy's datetime64[D] uses
+        return count, conn.execute('''
+        SELECT id, customer_id, CAST(julianday(substr(date, 1, 10)) - 2440587.5 AS INTEGER),
+               total_amount, amount_paid, COALESCE(amount_remaining, 0), services
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        ''', bounds)
+    
+    # The whole history: a table scan is faster than going through the date index
+    count = conn.execute("SELECT COUNT(*) FROM invoices").fetchone()[0]
+    return count, conn.execute('''
+    SELECT id, customer_id, CAST(julianday(substr(date, 1, 10)) - 2440587.5 AS INTEGER),
+           total_amount, amount_paid, COALESCE(amount_remaining, 0), services
+    FROM invoices
+    ''')
+
+@traced(category="load")
+def load_invoice_arrays(db_manager, start_date=None, end_date=None, fetch_size=FETCH_SIZE):
+    """Load the invoices dated in the inclusive range, and their line items, as InvoiceArrays.
+    
+    The invoices are counted first and read into arrays allocated at that size. Invoices
+    mostly repeat the same few service combinations, so each distinct services list is
+    decoded once and the line-item arrays are expanded from the decoded lists by indexing.
+    """
+    _require_numpy()
+    
+    conn = db_manager.get_connection()
+    try:
+        # One read transaction, so the count matches the rows
+        conn.execute("BEGIN")
+        count, cursor = _select_invoices(conn, start_date, end_date)
+        
+        ids = np.empty(count, dtype=np.int64)
+        customer_ids = np.empty(count, dtype=np.int64)
+        days = np.empty(count, dtype=np.int64)
+        total_amount = np.empty(count, dtype=np.float64)
+        amount_paid = np.empty(count, dtype=np.float64)
+        amount_remaining = np.empty(count, dtype=np.float64)
+        combinations = np.empty(count, dtype=np.int64)
+        
+        # Each distinct services list is numbered in the order it's first seen
+        combination_codes = {}
+        def code_services(columns):
+            columns[6] = [combination_codes.setdefault(services, len(combination_codes)) for services in columns[6]]
+            return columns
+        
+        _fill(cursor, (ids, customer_ids, days, total_amount, amount_paid, amount_remaining, combinations),
+              fetch_size, code_services)
+    finally:
+        conn.close()
+    
+    # The line items of every distinct list, end to end, with each list's start and length
+    service_codes = {}
+    decoded = [_line_items(services_json) for services_json in combination_codes]
+    lengths = np.fromiter((len(items) for items in decoded), dtype=np.int64, count=len(decoded))
+    starts = np.cumsum(lengths) - lengths
+    services = np.fromiter((service_codes.setdefault(name, len(service_codes)) for items in decoded for name, _ in items),
+                           dtype=np.int64)
+    amounts = np.fromiter((amount for items in decoded for _, amount in items), dtype=np.float64)
+    
+    # Line i of an invoice is item starts[combination] + i of the decoded lists
+    line_counts = lengths[combinations]
+    line_rows = np.repeat(np.arange(count), line_counts)
+    first_lines = np.cumsum(line_counts) - line_counts
+    items = np.repeat(starts[combinations] - first_lines, line_counts) + np.arange(len(line_rows))
+    
+    service_names = np.empty(len(service_codes), dtype=object)
+    service_names[:] = list(service_codes)
+    
+    return InvoiceArrays(ids, customer_ids, days, total_amount, amount_paid, amount_remaining,
+                         line_rows, services[items], amounts[items], service_names)
+
+class InvoiceAnalytics:
+    """Revenue and customer metrics computed over InvoiceArrays without per-row Python loops.
+    
+    Meant for reviews over the whole history, where decoding every invoice in Python is too
+    slow; the numbers follow the same rules as ReportEngine and get_revenue_by_service.
+    """
+    
+    def __init__(self, arrays):
+        _require_numpy()
+        self.arrays = arrays
+    
+    @classmethod
+    def from_database(cls, db_manager, start_date=None, end_date=None):
+        return cls(load_invoice_arrays(db_manager, start_date, end_date))
+    
+    def payment_ratios(self):
+        """Share of each invoice that was paid: amount paid / total, or 1.0 for a total of 0 or less."""
+        a = self.arrays
+        ratios = np.ones(len(a))
+        np.divide(a.amount_paid, a.total_amount, out=ratios, where=a.total_amount > 0)
+        return ratios
+    
+    def period_starts(self, period):
+        """The first day of each invoice's period, as datetime64[D]."""
+        if period not in ANALYTICS_PERIODS:
+            raise ValueError(f"Unknown analytics period: {period}")
+        
+        days = self.arrays.days
+        if period == "week":
+            # Day 0 was a Thursday, so Monday is 3 days before it
+            days = days - (days + 3) % 7
+        dates = days.astype("datetime64[D]")
+        if period == "month":
+            dates = dates.astype("datetime64[M]").astype("datetime64[D]")
+        elif period == "year":
+            dates = dates.astype("datetime64[Y]").astype("datetime64[D]")
+        return dates
+    
+    def revenue_series(self, period="month"):
+        """Invoice count and amounts per period, in date order, as a dict of arrays.
+        
+        Keys: periods (datetime64[D]), invoice_count, total_amount, amount_paid, amount_remaining.
+        """
+        a = self.arrays
+        periods, groups = np.unique(self.period_starts(period), return_inverse=True)
+        count = len(periods)
+        return {
+            "periods": periods,
+            "invoice_count": np.bincount(groups, minlength=count),
+            "total_amount": np.bincount(groups, weights=a.total_amount, minlength=count),
+            "amount_paid": np.bincount(groups, weights=a.amount_paid, minlength=count),
+            "amount_remaining": np.bincount(groups, weights=a.amount_remaining, minlength=count)
+        }
+    
+    def revenue_by_service(self):
+        """Line count and amounts per service, highest amount paid first, as a dict of arrays.
+        
+        Each line gets the share of its invoice's paid and remaining amounts that its line
+        total is of the invoice total. Keys: services, line_count, total_amount,
+        amount_paid, amount_remaining.
+        """
+        a = self.arrays
+        remaining_ratios = np.zeros(len(a))
+        np.divide(a.amount_remaining, a.total_amount, out=remaining_ratios, where=a.total_amount > 0)
+        
+        count = len(a.service_names)
+        paid = np.bincount(a.line_services, weights=a.line_amounts * self.payment_ratios()[a.line_rows],
+                           minlength=count)
+        order = np.argsort(-paid, kind="stable")
+        return {
+            "services": a.service_names[order],
+            "line_count": np.bincount(a.line_services, minlength=count)[order],
+            "total_amount": np.bincount(a.line_services, weights=a.line_amounts, minlength=count)[order],
+            "amount_paid": paid[order],
+            "amount_remaining": np.bincount(a.line_services, weights=a.line_amounts * remaining_ratios[a.line_rows],
+                                            minlength=count)[order]
+        }
+    
+    def customer_metrics(self):
+        """Lifetime value and visit frequency per customer, in customer id order, as a dict of arrays.
+        
+        Every invoice counts as a visit. Keys: customer_ids, visits, lifetime_value (amount
+        paid), total_amount, amount_remaining, first_visit and last_visit (datetime64[D]),
+        and days_between_visits (mean; NaN for a single visit).
+        """
+        a = self.arrays
+        customer_ids, groups = np.unique(a.customer_ids, return_inverse=True)
+        count = len(customer_ids)
+        visits = np.bincount(groups, minlength=count)
+        
+        # Sorted by customer, then date: each customer's visits are one run, oldest first
+        order = np.lexsort((a.days, groups))
+        sorted_days = a.days[order]
+        ends = np.cumsum(visits)
+        first = sorted_days[ends - visits]
+        last = sorted_days[ends - 1]
+        
+        intervals = np.full(count, np.nan)
+        np.divide(last - first, visits - 1, out=intervals, where=visits > 1)
+        
+        return {
+            "customer_ids": customer_ids,
+            "visits": visits,
+            "lifetime_value": np.bincount(groups, weights=a.amount_paid, minlength=count),
+            "total_amount": np.bincount(groups, weights=a.total_amount, minlength=count),
+            "amount_remaining": np.bincount(groups, weights=a.amount_remaining, minlength=count),
+            "first_visit": first.astype("datetime64[D]"),
+            "last_visit": last.astype("datetime64[D]"),
+            "days_between_visits": intervals
+        }
+    
+    def summary(self):
+        """Headline figures for a review, as plain Python numbers."""
+        a = self.arrays
+        customers = self.customer_metrics()
+        repeat = customers["visits"] > 1
+        has_customers = len(customers["customer_ids"]) > 0
+        return {
+            "invoices": len(a),
+            "line_items": len(a.line_rows),
+            "customers": len(customers["customer_ids"]),
+            "repeat_customers": int(np.count_nonzero(repeat)),
+            "total_amount": float(a.total_amount.sum()),
+            "amount_paid": float(a.amount_paid.sum()),
+            "amount_remaining": float(a.amount_remaining.sum()),
+            "mean_lifetime_value": float(customers["lifetime_value"].mean()) if has_customers else 0.0,
+            "median_lifetime_value": float(np.median(customers["lifetime_value"])) if has_customers else 0.0,
+            "mean_visits": float(customers["visits"].mean()) if has_customers else 0.0,
+            "median_days_between_visits": (float(np.median(customers["days_between_visits"][repeat]))
+                                           if repeat.any() else None)
+        }
@@ -0,0 +1,218 @@
+# database/change_journal.py
+import os
+import json
+import glob
+
+# Tables whose changes are journaled for point-in-time recovery
+JOURNAL_TABLES = ("users", "customers", "services", "appointments", "invoices")
+
+# Timestamp format written by the triggers (local time, millisecond precision)
+JOURNAL_TIMESTAMP_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+class ChangeJournal:
+    """Logical change journal recorded by triggers and archived next to the base backups."""
+    
+    def __init__(self, archive_dir="backups/journal"):
+        self.archive_dir = archive_dir
+        self._replay_statements = {}
+    
+    def install(self, conn):
+        """Create the journal table and the per-table triggers if they don't exist."""
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_journal (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            row_data TEXT
+        )
+        ''')
+        
+        for table in JOURNAL_TABLES:
+            columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+            new_row = "json_object(" + ", ".join(f"'{column}', NEW.{column}" for column in columns) + ")"
+            
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_{table}_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_journal (ts, table_name, operation, row_id, row_data)
+                VALUES ({JOURNAL_TIMESTAMP_SQL}, '{table}', 'INSERT', NEW.id, {new_row});
+            END
+            ''')
+            
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_{table}_update AFTER UPDATE ON {table}
+            BEGIN
+                INSERT INTO change_journal (ts, table_name, operation, row_id, row_data)
+                VALUES ({JOURNAL_TIMESTAMP_SQL}, '{table}', 'UPDATE', NEW.id, {new_row});
+            END
+            ''')
+            
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_{table}_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_journal (ts, table_name, operation, row_id, row_data)
+                VALUES ({JOURNAL_TIMESTAMP_SQL}, '{table}', 'DELETE', OLD.id, NULL);
+            END
+            ''')
+    
+    def drop_triggers(self, conn):
+        """Drop the journal triggers (used while replaying into a restored database)."""
+        for table in JOURNAL_TABLES:
+            for operation in ("insert", "update", "delete"):
+                conn.execute(f"DROP TRIGGER IF EXISTS journal_{table}_{operation}")
+    
+    def current_seq(self, conn):
+        """Get the last journal sequence number handed out, including archived entries."""
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'change_journal'"
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def set_seq(self, conn, seq):
+        """Move the journal sequence forward so new entries never reuse archived numbers."""
+        if self.current_seq(conn) >= seq:
+            return
+        
+        cursor = conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'change_journal'", (seq,))
+        if cursor.rowcount == 0:
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('change_journal', ?)", (seq,))
+    
+    def archive(self, conn):
+        """Move journaled changes into a JSON Lines segment file and checkpoint the WAL.
+        
+        Returns the segment path, or None if there was nothing to archive.
+        """
+        rows = conn.execute(
+            "SELECT seq, ts, table_name, operation, row_id, row_data FROM change_journal ORDER BY seq"
+        ).fetchall()
+        
+        if not rows:
+            return None
+        
+        os.makedirs(self.archive_dir, exist_ok=True)
+        first_seq, last_seq = rows[0][0], rows[-1][0]
+        segment_path = os.path.join(self.archive_dir, f"journal_{first_seq:012d}_{last_seq:012d}.jsonl")
+        
+        temp_path = segment_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for seq, ts, table_name, operation, row_id, row_data in rows:
+                f.write(json.dumps({
+                    "seq": seq,
+                    "ts": ts,
+                    "table": table_name,
+                    "operation": operation,
+                    "row_id": row_id,
+                    "row_data": row_data
+                }, ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, segment_path)
+        
+        # Only delete what was written to the segment
+        conn.execute("DELETE FROM change_journal WHERE seq <= ?", (last_seq,))
+        conn.commit()
+        
+        # Fold the WAL back into the database now that the journal rows are gone
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        
+        return segment_path
+    
+    def iter_entries(self, conn, after_seq, until_time):
+        """Yield journal entries with seq > after_seq and a timestamp up to until_time.
+        
+        Archived segments are read first, then the rows still in the live journal table.
+        """
+        until_ts = until_time.isoformat(timespec="milliseconds")
+        last_seq = after_seq
+        
+        for segment_path in self._segments_after(after_seq):
+            with open(segment_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["seq"] <= last_seq:
+                        continue
+                    if entry["ts"] > until_ts:
+                        return
+                    last_seq = entry["seq"]
+                    yield entry
+        
+        cursor = conn.execute('''
+        SELECT seq, ts, table_name, operation, row_id, row_data
+        FROM change_journal
+        WHERE seq > ? AND ts <= ?
+        ORDER BY seq
+        ''', (last_seq, until_ts))
+        
+        for seq, ts, table_name, operation, row_id, row_data in cursor:
+            yield {
+                "seq": seq,
+                "ts": ts,
+                "table": table_name,
+                "operation": operation,
+                "row_id": row_id,
+                "row_data": row_data
+            }
+    
+    def replay(self, conn, entries):
+        """Apply journal entries to a database; returns the number of applied entries."""
+        cursor = conn.cursor()
+        count = 0
+        
+        for entry in entries:
+            table = entry["table"]
+            if table not in JOURNAL_TABLES:
+                continue
+            
+            if entry["operation"] == "DELETE":
+                cursor.execute(f"DELETE FROM {table} WHERE id = ?", (entry["row_id"],))
+            else:
+                row = json.loads(entry["row_data"])
+                cursor.execute(self._upsert_statement(table, tuple(row)), tuple(row.values()))
+            count += 1
+        
+        return count
+    
+    def prune(self, before_seq):
+        """Delete archived segments that only hold entries up to before_seq; returns the removed paths."""
+        removed = []
+        for segment_path in glob.glob(os.path.join(self.archive_dir, "journal_*.jsonl")):
+            last_seq = self._segment_range(segment_path)[1]
+            if last_seq is not None and last_seq <= before_seq:
+                os.remove(segment_path)
+                removed.append(segment_path)
+        
+        return removed
+    
+    def _upsert_statement(self, table, columns):
+        """Build (and cache) the INSERT OR REPLACE statement for a column list."""
+        key = (table, columns)
+        if key not in self._replay_statements:
+            placeholders = ", ".join("?" for _ in columns)
+            self._replay_statements[key] = (
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+            )
+        return self._replay_statements[key]
+    
+    def _segments_after(self, after_seq):
+        """Archived segment files that may contain entries after the given sequence number."""
+        segments = []
+        for segment_path in glob.glob(os.path.join(self.archive_dir, "journal_*.jsonl")):
+            first_seq, last_seq = self._segment_range(segment_path)
+            if last_seq is not None and last_seq > after_seq:
+                segments.append((first_seq, segment_path))
+        
+        return [segment_path for _, segment_path in sorted(segments)]
+    
+    def _segment_range(self, segment_path):
+        """First and last sequence numbers encoded in a segment file name."""
+        name = os.path.basename(segment_path)[len("journal_"):-len(".jsonl")]
+        try:
+            first_seq, last_seq = (int(part) for part in name.split("_"))
+        except ValueError:
+            return None, None
+        return first_seq, last_seq
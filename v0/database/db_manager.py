@@ -3,20 +3,32 @@ import sqlite3
 import os
 import datetime
 import json
+from database.change_journal import ChangeJournal
+from database.migrations import migrate
+from database.query_profiler import get_query_profiler
+from database.reports import ReportEngine
+
+DB_PATH = "data/guzel_clinic.db"
+
+# Set to open another database file, e.g. one made by generate_data.py
+DB_PATH_ENV = "GUZEL_DB"
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_path = "data/guzel_clinic.db"
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get(DB_PATH_ENV) or DB_PATH
         self.ensure_data_dir()
         self.initialize_database()
     
     def ensure_data_dir(self):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
     
     def initialize_database(self):
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Use write-ahead logging so changes can be checkpointed and archived
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Create users table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -116,6 +128,12 @@ class DatabaseManager:
         # Insert default services
         self.insert_default_services(cursor)
         
+        # Indexes and later schema changes
+        migrate(conn)
+        
+        # Record row changes for point-in-time recovery
+        ChangeJournal().install(conn)
+        
         conn.commit()
         conn.close()
     
@@ -158,7 +176,7 @@ class DatabaseManager:
             )
     
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        return get_query_profiler().connect(self.db_path)
     
     def hash_password(self, password):
         import hashlib
@@ -488,16 +506,17 @@ class DatabaseManager:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        # Format date as YYYY-MM-DD
+        # Compare the raw ISO strings so the date_time index can be used
         date_str = date.strftime('%Y-%m-%d')
+        next_date_str = (date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT a.*, c.name as customer_name, c.phone as customer_phone
         FROM appointments a
         JOIN customers c ON a.customer_id = c.id
-        WHERE date(a.date_time) = ?
+        WHERE a.date_time >= ? AND a.date_time < ?
         ORDER BY a.date_time
-        ''', (date_str,))
+        ''', (date_str, next_date_str))
         
         appointments = [dict(row) for row in cursor.fetchall()]
         
@@ -716,6 +735,25 @@ class DatabaseManager:
         
         return invoice
     
+    def get_invoice_version(self, invoice_id):
+        """Cheap change stamp for an invoice and its customer (used as a cache key)."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # The row stamps change on every write, unlike updated_at (whole seconds)
+        cursor.execute('''
+        SELECT (SELECT stamp FROM row_stamps WHERE table_name = 'invoices' AND row_id = i.id),
+               (SELECT stamp FROM row_stamps WHERE table_name = 'customers' AND row_id = i.customer_id)
+        FROM invoices i
+        WHERE i.id = ?
+        ''', (invoice_id,))
+        
+        row = cursor.fetchone()
+        
+        conn.close()
+        
+        return tuple(row) if row else None
+    
     def search_invoices(self, search_term):
         conn = self.get_connection()
         conn.row_factory = sqlite3.Row
@@ -744,14 +782,15 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Format date as YYYY-MM-DD
+        # Compare the raw ISO strings so the date index can be used
         date_str = date.strftime('%Y-%m-%d')
+        next_date_str = (date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE date(date) = ?
-        ''', (date_str,))
+        WHERE date >= ? AND date < ?
+        ''', (date_str, next_date_str))
         
         result = cursor.fetchone()
         total = result[0] if result[0] else 0
@@ -766,14 +805,14 @@ class DatabaseManager:
         # Calculate end date (start_date + 6 days)
         end_date = start_date + datetime.timedelta(days=6)
         
-        # Format dates as YYYY-MM-DD
+        # Compare the raw ISO strings so the date index can be used
         start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+        end_date_str = (end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE date(date) BETWEEN ? AND ?
+        WHERE date >= ? AND date < ?
         ''', (start_date_str, end_date_str))
         
         result = cursor.fetchone()
@@ -786,11 +825,15 @@ class DatabaseManager:
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Compare the raw ISO strings so the date index can be used
+        month_start = datetime.date(int(year), int(month), 1)
+        next_month_start = (month_start + datetime.timedelta(days=32)).replace(day=1)
+        
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE strftime('%Y', date) = ? AND strftime('%m', date) = ?
-        ''', (str(year), str(month).zfill(2)))
+        WHERE date >= ? AND date < ?
+        ''', (month_start.isoformat(), next_month_start.isoformat()))
         
         result = cursor.fetchone()
         total = result[0] if result[0] else 0
@@ -799,44 +842,6 @@ class DatabaseManager:
         return total
     
     def get_revenue_by_service(self, start_date, end_date):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Format dates as YYYY-MM-DD
-        start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
-        
-        # This query is more complex as we need to extract service data from JSON
-        cursor.execute('''
-        SELECT i.id, i.services, i.amount_paid, i.amount_remaining, i.total_amount
-        FROM invoices i
-        WHERE date(i.date) BETWEEN ? AND ?
-        ''', (start_date_str, end_date_str))
-        
-        invoices = cursor.fetchall()
-        
-        # Process the results to calculate revenue by service
-        service_revenue = {}
-        for invoice in invoices:
-            invoice_id, services_json, amount_paid, amount_remaining, total_amount = invoice
-            services = json.loads(services_json)
-            
-            # Calculate the payment ratio if there's a partial payment
-            payment_ratio = 1.0
-            if total_amount > 0:
-                payment_ratio = amount_paid / total_amount
-            
-            for service in services:
-                service_name = service['name']
-                service_price = service['price']
-                
-                # Allocate the revenue proportionally if partial payment
-                allocated_revenue = service_price * payment_ratio
-                
-                if service_name in service_revenue:
-                    service_revenue[service_name] += allocated_revenue
-                else:
-                    service_revenue[service_name] = allocated_revenue
-        
-        conn.close()
-        return service_revenue
+        """Amount paid per service name; an invoice's payments are shared among its services by price."""
+        rows = ReportEngine(self).revenue_by("service", start_date, end_date)
+        return {row["key"]: row["amount_paid"] for row in rows}
@@ -0,0 +1,113 @@
+# database/migrations.py
+
+# Schema changes on top of the tables DatabaseManager creates, applied in order.
+# PRAGMA user_version holds how many have been applied; append new steps, never edit shipped ones.
+MIGRATIONS = [
+    # 1: indexes for the customer and appointment lookups and the date range filters
+    [
+        "CREATE INDEX IF NOT EXISTS idx_appointments_customer_id ON appointments (customer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_appointments_date_time ON appointments (date_time)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_customer_id ON invoices (customer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_appointment_id ON invoices (appointment_id)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices (date)"
+    ],
+    # 2: duplicate phone lookups of the CSV customer import
+    [
+        "CREATE INDEX IF NOT EXISTS idx_customers_phone ON customers (phone)"
+    ],
+    # 3: a change stamp per table, replaced by a trigger on every write, for the report cache.
+    # Random rather than a counter so restoring an older backup can't bring back a stamp
+    # that cached results were keyed on.
+    [
+        "CREATE TABLE IF NOT EXISTS change_stamps (table_name TEXT PRIMARY KEY, stamp INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO change_stamps (table_name, stamp) VALUES ('invoices', random())",
+        '''
+        CREATE TRIGGER IF NOT EXISTS stamp_invoices_insert AFTER INSERT ON invoices
+        BEGIN
+            UPDATE change_stamps SET stamp = random() WHERE table_name = 'invoices';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stamp_invoices_update AFTER UPDATE ON invoices
+        BEGIN
+            UPDATE change_stamps SET stamp = random() WHERE table_name = 'invoices';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS stamp_invoices_delete AFTER DELETE ON invoices
+        BEGIN
+            UPDATE change_stamps SET stamp = random() WHERE table_name = 'invoices';
+        END
+        '''
+    ],
+    # 4: a change stamp per invoice and customer row for the document cache keys; updated_at
+    # only has 1 second resolution, so two edits within a second would share a key.
+    # Random for the same reason as the table stamps.
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS row_stamps (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            stamp INTEGER NOT NULL,
+            PRIMARY KEY (table_name, row_id)
+        ) WITHOUT ROWID
+        ''',
+        "INSERT OR IGNORE INTO row_stamps (table_name, row_id, stamp) SELECT 'invoices', id, random() FROM invoices",
+        "INSERT OR IGNORE INTO row_stamps (table_name, row_id, stamp) SELECT 'customers', id, random() FROM customers",
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_invoices_insert AFTER INSERT ON invoices
+        BEGIN
+            INSERT OR REPLACE INTO row_stamps (table_name, row_id, stamp) VALUES ('invoices', NEW.id, random());
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_invoices_update AFTER UPDATE ON invoices
+        BEGIN
+            INSERT OR REPLACE INTO row_stamps (table_name, row_id, stamp) VALUES ('invoices', NEW.id, random());
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_invoices_delete AFTER DELETE ON invoices
+        BEGIN
+            DELETE FROM row_stamps WHERE table_name = 'invoices' AND row_id = OLD.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_customers_insert AFTER INSERT ON customers
+        BEGIN
+            INSERT OR REPLACE INTO row_stamps (table_name, row_id, stamp) VALUES ('customers', NEW.id, random());
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_customers_update AFTER UPDATE ON customers
+        BEGIN
+            INSERT OR REPLACE INTO row_stamps (table_name, row_id, stamp) VALUES ('customers', NEW.id, random());
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS row_stamp_customers_delete AFTER DELETE ON customers
+        BEGIN
+            DELETE FROM row_stamps WHERE table_name = 'customers' AND row_id = OLD.id;
+        END
+        '''
+    ]
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """Apply the migrations the database doesn't have yet; returns the versions applied."""
+    version = get_schema_version(conn)
+    
+    applied = []
+    for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        for statement in statements:
+            conn.execute(statement)
+        # PRAGMA doesn't take bound parameters
+        conn.execute(f"PRAGMA user_version = {number}")
+        applied.append(number)
+    
+    return applied
@@ -0,0 +1,345 @@
+# database/query_profiler.py
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# Statements slower than this (execute plus fetching the rows) go to the slow-query log
+SLOW_QUERY_MS = 100
+
+SLOW_QUERY_LOG = "logs/slow_queries.log"
+
+# Latencies kept per statement for the percentile
+MAX_SAMPLES = 1000
+
+# How long quiesce() waits for a database's open connections to be closed
+QUIESCE_TIMEOUT = 10
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_sql(sql):
+    """Collapse whitespace so the same statement is always counted under one key."""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+class StatementStats:
+    """Counters for one SQL statement."""
+    
+    __slots__ = ("count", "total", "rows", "samples")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+    
+    def add(self, seconds, rows):
+        self.count += 1
+        self.total += seconds
+        self.rows += rows
+        self.samples.append(seconds)
+    
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class QueryProfiler:
+    """Per-statement timing for every connection opened through connect().
+    
+    A statement's time covers execute() and the fetches that follow it on the
+    same cursor, up to the next execute() or the connection being closed.
+    
+    Every connection opened through connect() is also registered by database file
+    until it is closed, so quiesce() can wait for a file to be unused.
+    """
+    
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG,
+                 max_bytes=1024 * 1024, backup_count=3):
+        self.enabled = True
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._logger = None
+        # Open connections by absolute database path, and the paths being swapped out
+        self._open = {}
+        self._quiesced = set()
+        self._connections_changed = threading.Condition()
+    
+    def connect(self, db_path, **kwargs):
+        """sqlite3.connect() returning a connection whose cursors are timed.
+        
+        Waits while the database file is quiesced, so the connection opens the new file.
+        """
+        path = os.path.abspath(db_path)
+        with self._connections_changed:
+            while path in self._quiesced:
+                self._connections_changed.wait()
+            conn = sqlite3.connect(db_path, factory=ProfiledConnection, **kwargs)
+            conn.profiler = self
+            conn.db_path = path
+            self._open.setdefault(path, weakref.WeakSet()).add(conn)
+        return conn
+    
+    def closed(self, conn):
+        """Called by ProfiledConnection.close()."""
+        with self._connections_changed:
+            connections = self._open.get(getattr(conn, "db_path", None))
+            if connections is not None:
+                connections.discard(conn)
+            self._connections_changed.notify_all()
+    
+    def open_connections(self, db_path):
+        """How many connections to the database file are open."""
+        with self._connections_changed:
+            return len(self._open.get(os.path.abspath(db_path), ()))
+    
+    @contextmanager
+    def quiesce(self, db_path, timeout=QUIESCE_TIMEOUT):
+        """Hold back new connections to a database file and wait for the open ones to close.
+        
+        For replacing the file: connect() calls made meanwhile wait, then open the file
+        that is in place when the with block ends. Raises TimeoutError, leaving the file
+        alone, if connections are still open after timeout seconds.
+        """
+        path = os.path.abspath(db_path)
+        deadline = time.monotonic() + timeout
+        with self._connections_changed:
+            self._quiesced.add(path)
+            try:
+                # Polled too: a connection dropped without close() leaves the set when collected
+                while self._open.get(path):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"{len(self._open[path])} connections to {path} are still open")
+                    self._connections_changed.wait(min(remaining, 0.1))
+            except BaseException:
+                self._quiesced.discard(path)
+                self._connections_changed.notify_all()
+                raise
+        
+        try:
+            yield
+        finally:
+            with self._connections_changed:
+                self._quiesced.discard(path)
+                self._connections_changed.notify_all()
+    
+    def record(self, conn, sql, params, seconds, rows):
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats()
+            stats.add(seconds, rows)
+        
+        if seconds * 1000 >= self.slow_query_ms:
+            self._log_slow_query(conn, key, sql, params, seconds, rows)
+    
+    def snapshot(self):
+        """Per-statement stats, slowest total first."""
+        with self._lock:
+            items = list(self._stats.items())
+        
+        rows = [
+            {
+                "sql": sql,
+                "count": stats.count,
+                "total_ms": stats.total * 1000,
+                "p95_ms": stats.percentile(0.95) * 1000,
+                "rows": stats.rows
+            }
+            for sql, stats in items
+        ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+    
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+    
+    def read_slow_log(self, max_chars=64 * 1024):
+        """The end of the current slow-query log file."""
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - max_chars))
+                return f.read()
+        except OSError:
+            return ""
+    
+    def _get_logger(self):
+        if self._logger is None:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(
+                self.log_path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            
+            self._logger = logging.getLogger(f"guzel.slow_queries.{id(self)}")
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._logger.addHandler(handler)
+        return self._logger
+    
+    def _log_slow_query(self, conn, key, sql, params, seconds, rows):
+        plan = self._explain(conn, sql, params)
+        lines = [f"{seconds * 1000:.1f} ms, {rows} rows: {key}"]
+        lines.extend(f"    {detail}" for detail in plan)
+        try:
+            self._get_logger().info("\n".join(lines))
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+    
+    def _explain(self, conn, sql, params):
+        """EXPLAIN QUERY PLAN detail lines, or [] if the statement can't be explained."""
+        if conn is None:
+            return []
+        try:
+            # A plain cursor, so the plan query itself is not recorded
+            cursor = sqlite3.Cursor(conn)
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params if params is not None else ())
+            return [row[-1] for row in cursor.fetchall()]
+        except (sqlite3.Error, ValueError):
+            return []
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that times each statement together with the fetches of its rows."""
+    
+    def __init__(self, conn):
+        super().__init__(conn)
+        self._sql = None
+        self._params = None
+        self._elapsed = 0.0
+        self._rows = 0
+    
+    def execute(self, sql, parameters=()):
+        self.finish()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, time.perf_counter() - start)
+    
+    def executemany(self, sql, seq_of_parameters):
+        self.finish()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # The plan of an executemany statement needs one parameter set; skip it
+            self._begin(sql, None, time.perf_counter() - start)
+    
+    def __next__(self):
+        # Iterating over the cursor fetches rows too
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0)
+            raise
+        self._fetched(time.perf_counter() - start, 1)
+        return row
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, 0 if row is None else 1)
+        return row
+    
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+    
+    def close(self):
+        self.finish()
+        super().close()
+    
+    def __del__(self):
+        # A cursor dropped before its rows were all fetched still gets its statement recorded
+        self.finish()
+    
+    def finish(self):
+        """Record the pending statement, if any."""
+        if self._sql is None:
+            return
+        sql, params, elapsed, rows = self._sql, self._params, self._elapsed, self._rows
+        self._sql = None
+        self.connection.untrack(self)
+        
+        profiler = getattr(self.connection, "profiler", None)
+        if profiler and profiler.enabled:
+            profiler.record(self.connection, sql, params, elapsed, rows)
+    
+    def _begin(self, sql, params, elapsed):
+        self._sql = sql
+        self._params = params
+        self._elapsed = elapsed
+        self._rows = 0
+        self.connection.track(self)
+    
+    def _fetched(self, elapsed, rows):
+        if self._sql is not None:
+            self._elapsed += elapsed
+            self._rows += rows
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors are ProfiledCursors; pending statements are recorded on close."""
+    
+    profiler = None
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Cursors with a statement not yet recorded; weak, so the connection and its cursors
+        # don't keep each other alive (a dropped cursor records itself in __del__)
+        self._cursors = weakref.WeakSet()
+    
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+    
+    # The built-in shortcuts would bypass cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def track(self, cursor):
+        self._cursors.add(cursor)
+    
+    def untrack(self, cursor):
+        self._cursors.discard(cursor)
+    
+    def close(self):
+        for cursor in list(self._cursors):
+            cursor.finish()
+        super().close()
+        if self.profiler:
+            self.profiler.closed(self)
+
+_shared_profiler = None
+
+def get_query_profiler():
+    """The profiler shared by every database manager in this process."""
+    global _shared_profiler
+    if _shared_profiler is None:
+        _shared_profiler = QueryProfiler()
+    return _shared_profiler
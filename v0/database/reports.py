@@ -0,0 +1,288 @@
+# database/reports.py
+import os
+import sqlite3
+import datetime
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Ways invoices can be grouped; the periods are keyed by their first day (weeks start on Monday)
+GROUPINGS = ("service", "service_provider", "invoice_creator", "payment_method", "day", "week", "month")
+
+PERIOD_GROUPINGS = ("day", "week", "month")
+
+# Columns of every report row; for services the amounts are each service's share of its invoices
+REPORT_COLUMNS = ("key", "invoice_count", "total_amount", "amount_paid", "amount_remaining")
+
+# Grouped reports over at least this many months are computed per month in worker processes
+PARALLEL_MIN_MONTHS = 12
+
+class ReportCache:
+    """LRU cache of report results, checked against the invoices' change stamp.
+    
+    Entries are keyed by (database, report, date range) and hold the stamp they were
+    computed at; the change_stamps triggers replace the stamp on every invoice write,
+    so a hit can never return results older than the data.
+    """
+    
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, stamp, build):
+        """Get the cached result for key at stamp, calling build() on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        result = build()
+        self._entries[key] = (stamp, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        
+        return result
+    
+    def clear(self):
+        self._entries.clear()
+
+_shared_cache = None
+
+def get_report_cache():
+    """The report cache shared by the reports tab, the PDF reports and the revenue methods."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ReportCache()
+    return _shared_cache
+
+def date_range_bounds(start_date=None, end_date=None):
+    """[start, end) ISO strings for an inclusive date range, compared against the raw stored dates."""
+    start = start_date.strftime('%Y-%m-%d') if start_date else ""
+    # Every stored date sorts before this; it must not look numeric, or the date
+    # column's NUMERIC affinity would compare it as a number
+    end = (end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d') if end_date else "9999-12-31"
+    return start, end
+
+_shared_pools = {}
+
+def get_report_pool(workers):
+    """The process pool of partitioned reports with this many workers, started on first use.
+    
+    Workers are spawned, not forked (Qt is not fork-safe), and kept for the next reports,
+    since starting them costs more than computing most partitions.
+    """
+    pool = _shared_pools.get(workers)
+    if pool is None:
+        context = multiprocessing.get_context("spawn")
+        pool = _shared_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    return pool
+
+def shutdown_report_pools():
+    for pool in _shared_pools.values():
+        pool.shutdown(wait=False)
+    _shared_pools.clear()
+
+def month_partitions(conn, bounds):
+    """Split [start, end) bounds at the first day of each month with invoices in between.
+    
+    Returns a list of [start, end) bounds that together cover the given ones, or None
+    when the invoices in the range span fewer than PARALLEL_MIN_MONTHS months.
+    """
+    first, last = conn.execute("SELECT MIN(date), MAX(date) FROM invoices WHERE date >= ? AND date < ?",
+                               bounds).fetchone()
+    try:
+        year, month = int(first[:4]), int(first[5:7])
+        months = (int(last[:4]) - year) * 12 + int(last[5:7]) - month + 1
+    except (TypeError, ValueError):
+        # No invoices, or dates that aren't ISO strings
+        return None
+    
+    if months < PARALLEL_MIN_MONTHS:
+        return None
+    
+    boundaries = [bounds[0]]
+    for i in range(1, months):
+        years, month_index = divmod(month - 1 + i, 12)
+        boundaries.append(f"{year + years:04d}-{month_index + 1:02d}-01")
+    boundaries.append(bounds[1])
+    return list(zip(boundaries, boundaries[1:]))
+
+def _partition_rows(db_path, grouping, bounds):
+    """Compute one partition of a grouped report in a pool worker, on its own read-only connection."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return _grouped_rows(conn, grouping, bounds)
+    finally:
+        conn.close()
+
+def merge_rows(grouping, partials):
+    """Merge the rows of a report's partitions by key: counts and amounts are sums, so they add up."""
+    merged = {}
+    for rows in partials:
+        for row in rows:
+            total = merged.get(row["key"])
+            if total is None:
+                merged[row["key"]] = dict(row)
+                continue
+            for column in REPORT_COLUMNS[1:]:
+                if row[column] is not None:
+                    total[column] = (total[column] or 0) + row[column]
+    
+    rows = list(merged.values())
+    if grouping in PERIOD_GROUPINGS:
+        rows.sort(key=lambda row: row["key"])
+    else:
+        rows.sort(key=lambda row: row["amount_paid"] or 0, reverse=True)
+    return rows
+
+def _grouped_rows(conn, grouping, bounds):
+    """The rows of one grouped report over [start, end) bounds; see ReportEngine.revenue_by."""
+    if grouping == "service":
+        # Each service gets the share of its invoice's payments that its line total is of the
+        # invoice total (line total = price x quantity, as on the printed invoice)
+        cursor = conn.execute('''
+        SELECT json_extract(s.value, '$.name') AS service,
+               COUNT(*),
+               SUM(json_extract(s.value, '$.price') * COALESCE(json_extract(s.value, '$.quantity'), 1)),
+               SUM(json_extract(s.value, '$.price') * COALESCE(json_extract(s.value, '$.quantity'), 1) *
+                   CASE WHEN i.total_amount > 0 THEN i.amount_paid / i.total_amount ELSE 1.0 END),
+               SUM(json_extract(s.value, '$.price') * COALESCE(json_extract(s.value, '$.quantity'), 1) *
+                   CASE WHEN i.total_amount > 0 THEN i.amount_remaining / i.total_amount ELSE 0.0 END)
+        FROM invoices i, json_each(i.services) s
+        WHERE i.date >= ? AND i.date < ?
+        GROUP BY service
+        ORDER BY 4 DESC
+        ''', bounds)
+    elif grouping == "service_provider":
+        cursor = conn.execute('''
+        SELECT service_provider, COUNT(*), SUM(total_amount), SUM(amount_paid), SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY service_provider
+        ORDER BY 4 DESC
+        ''', bounds)
+    elif grouping == "invoice_creator":
+        cursor = conn.execute('''
+        SELECT invoice_creator, COUNT(*), SUM(total_amount), SUM(amount_paid), SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY invoice_creator
+        ORDER BY 4 DESC
+        ''', bounds)
+    elif grouping == "payment_method":
+        cursor = conn.execute('''
+        SELECT payment_method, COUNT(*), SUM(total_amount), SUM(amount_paid), SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY payment_method
+        ORDER BY 4 DESC
+        ''', bounds)
+    elif grouping == "day":
+        cursor = conn.execute('''
+        SELECT substr(date, 1, 10) AS day, COUNT(*), SUM(total_amount), SUM(amount_paid),
+               SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY day
+        ORDER BY day
+        ''', bounds)
+    elif grouping == "week":
+        cursor = conn.execute('''
+        SELECT date(substr(date, 1, 10), 'weekday 0', '-6 days') AS week, COUNT(*), SUM(total_amount),
+               SUM(amount_paid), SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY week
+        ORDER BY week
+        ''', bounds)
+    else:
+        cursor = conn.execute('''
+        SELECT substr(date, 1, 7) || '-01' AS month, COUNT(*), SUM(total_amount), SUM(amount_paid),
+               SUM(amount_remaining)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        GROUP BY month
+        ORDER BY month
+        ''', bounds)
+    
+    return [dict(zip(REPORT_COLUMNS, row)) for row in cursor.fetchall()]
+
+class ReportEngine:
+    """Grouped invoice aggregates computed by SQLite with GROUP BY over the indexed date range.
+    
+    Grouped reports spanning PARALLEL_MIN_MONTHS or more are split by month and the months
+    computed in parallel by up to workers processes, then merged. The default, workers=1,
+    computes every report serially in this process; so does any failure of the worker pool.
+    """
+    
+    def __init__(self, db_manager, cache=None, workers=1):
+        self.db_manager = db_manager
+        self.cache = cache or get_report_cache()
+        self.workers = max(workers or 1, 1)
+    
+    def revenue_by(self, grouping, start_date=None, end_date=None):
+        """One dict per group (see REPORT_COLUMNS) for the invoices dated in the inclusive range.
+        
+        Periods are in date order, the other groupings by amount paid, highest first.
+        """
+        if grouping not in GROUPINGS:
+            raise ValueError(f"Unknown report grouping: {grouping}")
+        
+        bounds = date_range_bounds(start_date, end_date)
+        return self._cached(("revenue_by", grouping) + bounds, lambda conn: self._grouped(conn, grouping, bounds))
+    
+    def totals(self, start_date=None, end_date=None):
+        """The invoice count and amounts of the whole range, as a dict like a report row without key."""
+        bounds = date_range_bounds(start_date, end_date)
+        return self._cached(("totals",) + bounds, lambda conn: self._totals(conn, bounds))
+    
+    def _cached(self, report_key, build):
+        conn = self.db_manager.get_connection()
+        try:
+            key = (self.db_manager.db_path,) + report_key
+            result = self.cache.get(key, self._stamp(conn), lambda: build(conn))
+        finally:
+            conn.close()
+        
+        # Callers may change what they get; the cached rows stay as computed
+        if isinstance(result, list):
+            return [dict(row) for row in result]
+        return dict(result)
+    
+    def _stamp(self, conn):
+        row = conn.execute("SELECT stamp FROM change_stamps WHERE table_name = 'invoices'").fetchone()
+        return row[0] if row else None
+    
+    def _grouped(self, conn, grouping, bounds):
+        partitions = month_partitions(conn, bounds) if self.workers > 1 else None
+        if partitions:
+            try:
+                return self._grouped_parallel(grouping, partitions)
+            except Exception as e:
+                # A pool that failed once (no processes allowed, a worker killed) is not reused
+                pool = _shared_pools.pop(self.workers, None)
+                if pool is not None:
+                    pool.shutdown(wait=False)
+                print(f"Parallel report failed, computing it serially: {e}")
+        
+        return _grouped_rows(conn, grouping, bounds)
+    
+    def _grouped_parallel(self, grouping, partitions):
+        db_path = os.path.abspath(self.db_manager.db_path)
+        pool = get_report_pool(self.workers)
+        futures = [pool.submit(_partition_rows, db_path, grouping, partition) for partition in partitions]
+        return merge_rows(grouping, [future.result() for future in futures])
+    
+    def _totals(self, conn, bounds):
+        row = conn.execute('''
+        SELECT COUNT(*), COALESCE(SUM(total_amount), 0), COALESCE(SUM(amount_paid), 0),
+               COALESCE(SUM(amount_remaining), 0)
+        FROM invoices
+        WHERE date >= ? AND date < ?
+        ''', bounds).fetchone()
+        return dict(zip(REPORT_COLUMNS[1:], row))
@@ -0,0 +1,364 @@
+# generate_data.py
+"""
+Fill a new clinic database with synthetic customers, appointments and invoices for scale testing.
+
+The same seed and end date always produce the same rows. Open the result in the app with
+GUZEL_DB=<path> python main.py, or pass the path to DatabaseManager(db_path).
+
+Usage (from the v0 directory):
+    python generate_data.py --size large --output data/synthetic/guzel_large.db
+    python generate_data.py --customers 5000 --appointments 40000 --invoices 30000 --years 2
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import datetime
+
+from database.db_manager import DatabaseManager
+from database.change_journal import ChangeJournal
+
+# (customers, appointments, invoices)
+SIZES = {
+    "small": (1000, 10000, 10000),
+    "medium": (10000, 100000, 100000),
+    "large": (100000, 1000000, 1000000)
+}
+
+# Rows per executemany call
+BATCH_SIZE = 10000
+
+FIRST_NAMES = [
+    "فاطمة", "مريم", "زينب", "عائشة", "خديجة", "سارة", "نور", "رنا", "ريم", "لينا",
+    "هبة", "دعاء", "آية", "رغد", "سلمى", "ليلى", "هدى", "منى", "سمر", "رهف",
+    "يارا", "ديما", "لمى", "جود", "تالا", "شهد", "روان", "ميس", "نسرين", "غادة",
+    "هالة", "سوزان", "رشا", "عبير", "إيمان", "أمل", "بشرى", "وفاء", "حنان", "سهى",
+    "لبنى", "ندى", "نادين", "راما", "بتول", "مرح", "سدرة", "جنى", "ميار", "هيا"
+]
+
+FAMILY_NAMES = [
+    "الأحمد", "الخطيب", "الحلبي", "الشامي", "المصري", "العلي", "الحسن", "الحسين", "النجار", "الحداد",
+    "الصباغ", "القاسم", "الزعبي", "الخوري", "السيد", "الدمشقي", "الحمصي", "العمر", "الرفاعي", "الجابر",
+    "الطويل", "البيطار", "الكردي", "الأيوبي", "الشريف", "العطار", "السمان", "الحكيم", "الفارس", "الموصلي"
+]
+
+SERVICE_PROVIDERS = ["رنا الأحمد", "سمر الخطيب", "هبة الحلبي", "لينا الشامي", "ديما العلي"]
+
+INVOICE_CREATORS = ["admin", "user1"]
+
+HAIR_TYPES = ["ناعم", "متوسط", "خشن", ""]
+HAIR_COLORS = ["أسود", "بني", "أشقر", "أحمر", ""]
+SKIN_TYPES = ["فاتحة", "حنطية", "سمراء", "داكنة", ""]
+ALLERGIES = ["", "", "", "", "حساسية من العطور", "حساسية جلدية", "حساسية من الشمس"]
+
+# Service name whose price is charged per shot for the services priced at 0
+LASER_SHOT_SERVICE = "ضربة الليزر"
+
+# Working hours, in 15 minute slots
+OPENING_HOUR = 9
+CLOSING_HOUR = 19
+
+# Share of invoices paid in installments, and the share of their total paid upfront
+INSTALLMENT_RATE = 0.25
+INSTALLMENT_PAID_SHARES = (0.25, 0.5, 0.75)
+
+# Share of appointments booked after the end date, left unconfirmed more often
+UPCOMING_RATE = 0.02
+UPCOMING_DAYS = 14
+
+STAGE_INVOICES_SQL = "INSERT INTO pending_invoices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Distinct service combinations drawn up front and reused by the rows
+SERVICE_COMBINATIONS = 2000
+
+def build_service_combinations(rng, services, count=SERVICE_COMBINATIONS):
+    """(services JSON, total) pairs as the appointment and invoice dialogs store them."""
+    laser_price = next((s["price"] for s in services if s["name"] == LASER_SHOT_SERVICE), 1500)
+    
+    combinations = []
+    for i in range(count):
+        chosen = []
+        for service in rng.sample(services, rng.choice((1, 1, 1, 2, 2, 3))):
+            price = service["price"] or rng.randint(20, 200) * laser_price
+            chosen.append({"id": service["id"], "name": service["name"], "price": price})
+        combinations.append((json.dumps(chosen), sum(service["price"] for service in chosen)))
+    return combinations
+
+def day_strings(end_date, days):
+    """YYYY-MM-DD for each of the days up to and including end_date, oldest first."""
+    first = end_date - datetime.timedelta(days=days - 1)
+    return [(first + datetime.timedelta(days=i)).isoformat() for i in range(days)]
+
+def time_slots():
+    return [
+        f"{hour:02d}:{minute:02d}:00"
+        for hour in range(OPENING_HOUR, CLOSING_HOUR)
+        for minute in (0, 15, 30, 45)
+    ]
+
+def random_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}"
+
+def random_phone(rng):
+    return f"09{rng.randint(10 ** 7, 10 ** 8 - 1)}"
+
+def insert_batches(conn, sql, rows):
+    """executemany rows (any iterable) in BATCH_SIZE chunks, all in one transaction."""
+    count = 0
+    batch = []
+    with conn:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+            count += len(batch)
+    return count
+
+def generate_customers(rng, count, days):
+    for customer_id in range(1, count + 1):
+        created = f"{rng.choice(days)} {rng.randint(OPENING_HOUR, CLOSING_HOUR - 1):02d}:{rng.randint(0, 59):02d}:00"
+        sessions = rng.randint(0, 12)
+        yield (
+            customer_id,
+            random_name(rng),
+            random_phone(rng),
+            None,
+            rng.choice(HAIR_TYPES),
+            rng.choice(HAIR_COLORS),
+            rng.choice(SKIN_TYPES),
+            rng.choice(ALLERGIES),
+            sessions,
+            rng.randint(0, 6),
+            None,
+            "",
+            created,
+            created
+        )
+
+def generate_visits(rng, customers, appointments, invoices, days, upcoming_days, combinations, remaining):
+    """Yield (appointment row or None, invoice row or None) pairs.
+    
+    Visit i books appointment i and, while there are invoices left, bills it as
+    invoice i. Invoices beyond the number of appointments, or for visits that are
+    still upcoming, are not linked to an appointment and fall on a past day.
+    remaining[customer_id] accumulates the installment balances.
+    """
+    slots = time_slots()
+    
+    for visit_id in range(1, max(appointments, invoices) + 1):
+        customer_id = rng.randint(1, customers)
+        services_json, total = rng.choice(combinations)
+        provider = rng.choice(SERVICE_PROVIDERS)
+        
+        upcoming = visit_id <= appointments and rng.random() < UPCOMING_RATE
+        day = rng.choice(upcoming_days if upcoming else days)
+        slot = rng.choice(slots)
+        
+        paid = total
+        payment_method = "cash"
+        if rng.random() < INSTALLMENT_RATE:
+            payment_method = "installment"
+            paid = round(total * rng.choice(INSTALLMENT_PAID_SHARES), -3)
+        amount_remaining = total - paid
+        
+        linked = visit_id <= appointments and not upcoming
+        
+        invoice = None
+        if visit_id <= invoices:
+            invoice_day = day if linked else rng.choice(days)
+            invoice = (
+                visit_id,
+                customer_id,
+                visit_id if linked else None,
+                invoice_day,
+                services_json,
+                payment_method,
+                paid,
+                amount_remaining,
+                rng.choice(INVOICE_CREATORS),
+                provider,
+                total,
+                f"{invoice_day} {slot}"
+            )
+            remaining[customer_id] += amount_remaining
+        
+        appointment = None
+        if visit_id <= appointments:
+            status = "unconfirmed" if upcoming and rng.random() < 0.5 else "confirmed"
+            appointment = (
+                visit_id,
+                customer_id,
+                f"{day}T{slot}",
+                services_json,
+                provider,
+                "",
+                status,
+                amount_remaining if invoice and linked else 0,
+                f"{day} {slot}",
+                f"{day} {slot}"
+            )
+        
+        yield appointment, invoice
+
+def generate_database(output, customers, appointments, invoices, years=3, seed=1, end_date=None):
+    """Create a database at output filled with synthetic rows; returns a summary dict.
+    
+    The schema, default users and default services come from DatabaseManager, so the
+    file opens in the app and benchmarks like any other clinic database.
+    """
+    if os.path.exists(output):
+        raise FileExistsError(f"{output} already exists")
+    
+    end_date = end_date or datetime.date.today()
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    db_manager = DatabaseManager(output)
+    services = db_manager.get_all_services()
+    
+    combinations = build_service_combinations(rng, services)
+    days = day_strings(end_date, years * 365)
+    upcoming_days = [
+        (end_date + datetime.timedelta(days=i)).isoformat() for i in range(1, UPCOMING_DAYS + 1)
+    ]
+    remaining = [0.0] * (customers + 1)
+    
+    conn = sqlite3.connect(output)
+    # Bulk loading a fresh file; nothing to lose if the process dies halfway
+    conn.execute("PRAGMA synchronous=OFF")
+    journal = ChangeJournal()
+    # A synthetic history is not worth journaling row by row
+    journal.drop_triggers(conn)
+    
+    counts = {}
+    counts["customers"] = insert_batches(conn, '''
+    INSERT INTO customers (
+        id, name, phone, email, hair_type, hair_color, skin_type, allergies,
+        current_sessions, remaining_sessions, most_requested_services, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', generate_customers(rng, customers, days))
+    print(f"customers: {counts['customers']}")
+    
+    # Appointments and invoices are generated together, so stage the invoices in a temp table
+    conn.execute('''
+    CREATE TEMP TABLE pending_invoices AS SELECT
+        id, customer_id, appointment_id, date, services, payment_method,
+        amount_paid, amount_remaining, invoice_creator, service_provider, total_amount, created_at
+    FROM invoices WHERE 0
+    ''')
+    
+    invoice_rows = []
+    
+    def appointment_rows():
+        # Runs inside the appointments transaction of insert_batches
+        for appointment, invoice in generate_visits(
+            rng, customers, appointments, invoices, days, upcoming_days, combinations, remaining
+        ):
+            if invoice:
+                invoice_rows.append(invoice)
+                if len(invoice_rows) >= BATCH_SIZE:
+                    conn.executemany(STAGE_INVOICES_SQL, invoice_rows)
+                    invoice_rows.clear()
+            if appointment:
+                yield appointment
+        if invoice_rows:
+            conn.executemany(STAGE_INVOICES_SQL, invoice_rows)
+            invoice_rows.clear()
+    
+    counts["appointments"] = insert_batches(conn, '''
+    INSERT INTO appointments (
+        id, customer_id, date_time, services, service_provider, notes, status, remaining_payments,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', appointment_rows())
+    print(f"appointments: {counts['appointments']}")
+    
+    with conn:
+        conn.execute('''
+        INSERT INTO invoices (
+            id, customer_id, appointment_id, date, services, payment_method,
+            amount_paid, amount_remaining, invoice_creator, service_provider, total_amount,
+            created_at, updated_at
+        ) SELECT *, created_at FROM pending_invoices ORDER BY id
+        ''')
+        conn.execute("DROP TABLE pending_invoices")
+        # The change stamp triggers wrote random stamps; a seeded one keeps the output deterministic
+        conn.execute("UPDATE change_stamps SET stamp = ? WHERE table_name = 'invoices'", (seed,))
+    counts["invoices"] = conn.execute("SELECT COUNT(*) FROM invoices").fetchone()[0]
+    print(f"invoices: {counts['invoices']}")
+    
+    with conn:
+        conn.executemany(
+            "UPDATE customers SET remaining_payments = ? WHERE id = ?",
+            ((balance, customer_id) for customer_id, balance in enumerate(remaining) if balance)
+        )
+        # The row stamp triggers wrote random stamps too
+        conn.execute("UPDATE row_stamps SET stamp = ?", (seed,))
+        journal.install(conn)
+    
+    # Fold the WAL into the main file so the database is a single file to copy around
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    
+    summary = {
+        "database": output,
+        "seed": seed,
+        "end_date": end_date.isoformat(),
+        "years": years,
+        "counts": counts,
+        "seconds": round(time.perf_counter() - started, 1)
+    }
+    # Benchmarks read the sizes from here instead of counting rows
+    with open(output + ".json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=4)
+    
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="small",
+                        help="preset volumes; --customers, --appointments and --invoices override them")
+    parser.add_argument("--customers", type=int)
+    parser.add_argument("--appointments", type=int)
+    parser.add_argument("--invoices", type=int)
+    parser.add_argument("--years", type=int, default=3, help="years of history up to the end date")
+    parser.add_argument("--end-date", type=datetime.date.fromisoformat, help="YYYY-MM-DD, default today")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="default data/synthetic/guzel_<size>.db")
+    parser.add_argument("--force", action="store_true", help="replace an existing output file")
+    args = parser.parse_args()
+    
+    customers, appointments, invoices = SIZES[args.size]
+    output = args.output or os.path.join("data", "synthetic", f"guzel_{args.size}.db")
+    
+    if args.force:
+        for suffix in ("", "-wal", "-shm", ".json"):
+            if os.path.exists(output + suffix):
+                os.remove(output + suffix)
+    
+    try:
+        summary = generate_database(
+            output,
+            args.customers or customers,
+            args.appointments if args.appointments is not None else appointments,
+            args.invoices if args.invoices is not None else invoices,
+            years=args.years,
+            seed=args.seed,
+            end_date=args.end_date
+        )
+    except FileExistsError as e:
+        print(f"{e}; use --force to replace it")
+        sys.exit(1)
+    
+    print(json.dumps(summary, ensure_ascii=False, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 #main.py
 import sys
 import os
+
+# "--profile [dir]" profiles startup (imports included) and user actions with cProfile
+from utils.profiling import get_profiler, profiled
+if __name__ == "__main__" and "--profile" in sys.argv:
+    index = sys.argv.index("--profile")
+    output_dir = None
+    if index + 1 < len(sys.argv) and not sys.argv[index + 1].startswith("-"):
+        output_dir = sys.argv[index + 1]
+    del sys.argv[index:index + (2 if output_dir else 1)]
+    get_profiler().enable(output_dir)
+    get_profiler().begin("startup")
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QLineEdit, 
                             QTableWidget, QTableWidgetItem, QCalendarWidget, 
@@ -20,6 +31,9 @@ from functools import partial
 from ui.login_window import LoginWindow
 from ui.main_window import MainWindow
 from database.db_manager import DatabaseManager
+from database.query_profiler import get_query_profiler, SLOW_QUERY_MS
+from database.reports import shutdown_report_pools
+from utils.tracing import configure_tracing
 from config.settings import Settings  # Corrected import path
 from utils.theme_manager import ThemeManager
 from utils.language_manager import LanguageManager
@@ -29,13 +43,17 @@ class Application:
     def __init__(self):
         self.app = QApplication(sys.argv)
         self.app.setApplicationName("Guzel Beauty Clinic")
+        # Stop the report worker processes with the event loop
+        self.app.aboutToQuit.connect(shutdown_report_pools)
         
         # Initialize managers
         self.settings = Settings()
+        get_query_profiler().slow_query_ms = self.settings.get_setting("diagnostics.slow_query_ms", SLOW_QUERY_MS)
+        configure_tracing(self.settings)
         self.theme_manager = ThemeManager(self.settings)
         self.language_manager = LanguageManager(self.settings)
         self.db_manager = DatabaseManager()
-        self.backup_manager = BackupManager(self.db_manager)
+        self.backup_manager = BackupManager(self.db_manager, self.settings)
         
         # Apply initial theme and language
         self.theme_manager.apply_theme()
@@ -46,8 +64,12 @@ class Application:
         self.login_window.login_successful.connect(self.show_main_window)
         self.login_window.show()
         
+        # Startup ends once the first window is up
+        get_profiler().end("startup")
+        
         sys.exit(self.app.exec())
     
+    @profiled("main_window")
     def show_main_window(self, username, is_admin):
         self.login_window.hide()
         self.main_window = MainWindow(
@@ -67,4 +89,8 @@ class Application:
         self.login_window.show()
 
 if __name__ == "__main__":
+    # Needed by the spawned PDF export workers in frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     app = Application()
@@ -66,16 +66,17 @@ class AppointmentsModel:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        # Format date as YYYY-MM-DD
+        # Compare the raw ISO strings so the date_time index can be used
         date_str = date.strftime('%Y-%m-%d')
+        next_date_str = (date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT a.*, c.name as customer_name, c.phone as customer_phone
         FROM appointments a
         JOIN customers c ON a.customer_id = c.id
-        WHERE date(a.date_time) = ?
+        WHERE a.date_time >= ? AND a.date_time < ?
         ORDER BY a.date_time
-        ''', (date_str,))
+        ''', (date_str, next_date_str))
         
         appointments = [dict(row) for row in cursor.fetchall()]
         
@@ -232,15 +233,15 @@ class AppointmentsModel:
         today = datetime.date.today()
         future_date = today + datetime.timedelta(days=days)
         
-        # Format dates as YYYY-MM-DD
+        # Compare the raw ISO strings so the date_time index can be used
         today_str = today.strftime('%Y-%m-%d')
-        future_str = future_date.strftime('%Y-%m-%d')
+        future_str = (future_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT a.*, c.name as customer_name, c.phone as customer_phone
         FROM appointments a
         JOIN customers c ON a.customer_id = c.id
-        WHERE date(a.date_time) BETWEEN ? AND ?
+        WHERE a.date_time >= ? AND a.date_time < ?
         ORDER BY a.date_time
         ''', (today_str, future_str))
         
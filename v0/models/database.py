@@ -1,27 +1,33 @@
 # models\database.py
-import sqlite3
 import os
 import datetime
 import json
 from config.constants import DB_FILE
+from database.change_journal import ChangeJournal
+from database.migrations import migrate
+from database.query_profiler import get_query_profiler
+from database.db_manager import DB_PATH_ENV
 
 class DatabaseManager:
     """Manages database connections and operations."""
     
-    def __init__(self):
-        self.db_path = DB_FILE
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get(DB_PATH_ENV) or DB_FILE
         self._ensure_data_dir()
         self._initialize_database()
     
     def _ensure_data_dir(self):
         """Ensure the database directory exists."""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
     
     def _initialize_database(self):
         """Initialize the database schema if it doesn't exist."""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # Use write-ahead logging so changes can be checkpointed and archived
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Create users table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -121,6 +127,12 @@ class DatabaseManager:
         # Insert default services
         self._insert_default_services(cursor)
         
+        # Indexes and later schema changes
+        migrate(conn)
+        
+        # Record row changes for point-in-time recovery
+        ChangeJournal().install(conn)
+        
         conn.commit()
         conn.close()
     
@@ -164,8 +176,8 @@ class DatabaseManager:
             )
     
     def get_connection(self):
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path)
+        """Get a database connection; its statements are timed by the shared query profiler."""
+        return get_query_profiler().connect(self.db_path)
     
     def _hash_password(self, password):
         """Hash a password using SHA-256."""
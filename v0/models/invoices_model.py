@@ -84,6 +84,132 @@ class InvoicesModel:
         
         return invoices
     
+    def get_invoice_version(self, invoice_id):
+        """Cheap change stamp for an invoice and its customer (used as a cache key)."""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        # The row stamps change on every write, unlike updated_at (whole seconds)
+        cursor.execute('''
+        SELECT (SELECT stamp FROM row_stamps WHERE table_name = 'invoices' AND row_id = i.id),
+               (SELECT stamp FROM row_stamps WHERE table_name = 'customers' AND row_id = i.customer_id)
+        FROM invoices i
+        WHERE i.id = ?
+        ''', (invoice_id,))
+        
+        row = cursor.fetchone()
+        
+        conn.close()
+        
+        return tuple(row) if row else None
+    
+    def get_invoices_by_date_range(self, start_date, end_date):
+        """Get all invoices dated between start_date and end_date (inclusive)."""
+        conn = self.db_manager.get_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        # Compare the raw ISO strings so an index on the date column can be used
+        start_date_str = start_date.strftime('%Y-%m-%d')
+        end_date_str = (end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        cursor.execute('''
+        SELECT i.*, c.name as customer_name, c.phone as customer_phone
+        FROM invoices i
+        JOIN customers c ON i.customer_id = c.id
+        WHERE i.date >= ? AND i.date < ?
+        ORDER BY i.date
+        ''', (start_date_str, end_date_str))
+        
+        invoices = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        
+        # Parse JSON fields
+        for invoice in invoices:
+            invoice['services'] = json.loads(invoice['services'])
+        
+        return invoices
+    
+    def iter_invoices_by_date_range(self, start_date, end_date, batch_size=500):
+        """Yield invoices dated between start_date and end_date (inclusive), oldest first.
+        
+        Rows are fetched in batches so large ranges are never loaded all at once. Each
+        batch opens its own connection and continues after the last (date, id) seen, so
+        a generator left waiting between batches (e.g. by a preview) holds no connection
+        and doesn't keep a restore from replacing the database.
+        """
+        start_date_str = start_date.strftime('%Y-%m-%d')
+        end_date_str = (end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        last = None
+        
+        while True:
+            conn = self.db_manager.get_connection()
+            conn.row_factory = sqlite3.Row
+            try:
+                if last is None:
+                    rows = conn.execute('''
+                    SELECT i.*, c.name as customer_name, c.phone as customer_phone
+                    FROM invoices i
+                    JOIN customers c ON i.customer_id = c.id
+                    WHERE i.date >= ? AND i.date < ?
+                    ORDER BY i.date, i.id
+                    LIMIT ?
+                    ''', (start_date_str, end_date_str, batch_size)).fetchall()
+                else:
+                    rows = conn.execute('''
+                    SELECT i.*, c.name as customer_name, c.phone as customer_phone
+                    FROM invoices i
+                    JOIN customers c ON i.customer_id = c.id
+                    WHERE i.date >= ? AND i.date < ? AND (i.date > ? OR (i.date = ? AND i.id > ?))
+                    ORDER BY i.date, i.id
+                    LIMIT ?
+                    ''', (last[0], end_date_str, last[0], last[0], last[1], batch_size)).fetchall()
+            finally:
+                conn.close()
+            
+            for row in rows:
+                invoice = dict(row)
+                invoice['services'] = json.loads(invoice['services'])
+                yield invoice
+            
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1]['date'], rows[-1]['id'])
+    
+    def get_invoices_by_ids(self, invoice_ids):
+        """Get the invoices with the given IDs, in the given order."""
+        conn = self.db_manager.get_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        invoices_by_id = {}
+        invoice_ids = list(invoice_ids)
+        
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(invoice_ids), 500):
+            chunk = invoice_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f'''
+            SELECT i.*, c.name as customer_name, c.phone as customer_phone
+            FROM invoices i
+            JOIN customers c ON i.customer_id = c.id
+            WHERE i.id IN ({placeholders})
+            ''', chunk)
+            
+            for row in cursor.fetchall():
+                invoices_by_id[row['id']] = dict(row)
+        
+        conn.close()
+        
+        invoices = [invoices_by_id[invoice_id] for invoice_id in invoice_ids if invoice_id in invoices_by_id]
+        
+        # Parse JSON fields
+        for invoice in invoices:
+            invoice['services'] = json.loads(invoice['services'])
+        
+        return invoices
+    
     def add_invoice(self, invoice_data):
         """Add a new invoice."""
         conn = self.db_manager.get_connection()
@@ -249,14 +375,15 @@ class InvoicesModel:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
-        # Format date as YYYY-MM-DD
+        # Compare the raw ISO strings so the date index can be used
         date_str = date.strftime('%Y-%m-%d')
+        next_date_str = (date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE date(date) = ?
-        ''', (date_str,))
+        WHERE date >= ? AND date < ?
+        ''', (date_str, next_date_str))
         
         result = cursor.fetchone()
         total = result[0] if result[0] else 0
@@ -272,14 +399,14 @@ class InvoicesModel:
         # Calculate end date (start_date + 6 days)
         end_date = start_date + datetime.timedelta(days=6)
         
-        # Format dates as YYYY-MM-DD
+        # Compare the raw ISO strings so the date index can be used
         start_date_str = start_date.strftime('%Y-%m-%d')
-        end_date_str = end_date.strftime('%Y-%m-%d')
+        end_date_str = (end_date + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
         
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE date(date) BETWEEN ? AND ?
+        WHERE date >= ? AND date < ?
         ''', (start_date_str, end_date_str))
         
         result = cursor.fetchone()
@@ -293,11 +420,15 @@ class InvoicesModel:
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
+        # Compare the raw ISO strings so the date index can be used
+        month_start = datetime.date(int(year), int(month), 1)
+        next_month_start = (month_start + datetime.timedelta(days=32)).replace(day=1)
+        
         cursor.execute('''
         SELECT SUM(amount_paid) as total
         FROM invoices
-        WHERE strftime('%Y', date) = ? AND strftime('%m', date) = ?
-        ''', (str(year), str(month).zfill(2)))
+        WHERE date >= ? AND date < ?
+        ''', (month_start.isoformat(), next_month_start.isoformat()))
         
         result = cursor.fetchone()
         total = result[0] if result[0] else 0
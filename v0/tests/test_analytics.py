@@ -0,0 +1,60 @@
+# tests/test_analytics.py
+"""
+The NumPy analytics against the per-row Python loops of benchmarks/bench_analytics.py,
+on a small generated database with a fixed seed and end date. Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("numpy")
+
+from generate_data import generate_database
+from database.db_manager import DatabaseManager
+from database.analytics import InvoiceAnalytics
+from benchmarks.bench_analytics import python_metrics, numpy_metrics, differences
+
+END_DATE = datetime.date(2025, 6, 1)
+
+@pytest.fixture(scope="module")
+def db_manager(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("analytics") / "analytics.db")
+    generate_database(path, 200, 500, 1000, seed=7, end_date=END_DATE)
+    return DatabaseManager(path)
+
+def test_metrics_match_python_loops(db_manager):
+    expected = python_metrics(db_manager)
+    assert expected["months"] and expected["services"] and expected["customers"]
+    assert differences(expected, numpy_metrics(InvoiceAnalytics.from_database(db_manager))) == {}
+
+def test_summary_totals(db_manager):
+    expected = python_metrics(db_manager)
+    summary = InvoiceAnalytics.from_database(db_manager).summary()
+    
+    assert summary["invoices"] == 1000
+    assert summary["customers"] == len(expected["customers"])
+    assert summary["repeat_customers"] == sum(1 for c in expected["customers"].values() if c["visits"] > 1)
+    assert summary["amount_paid"] == pytest.approx(sum(month[2] for month in expected["months"].values()))
+
+def test_date_range(db_manager):
+    start, end = datetime.date(2025, 1, 1), datetime.date(2025, 3, 31)
+    series = InvoiceAnalytics.from_database(db_manager, start, end).revenue_series("month")
+    
+    expected = python_metrics(db_manager)["months"]
+    assert [str(period) for period in series["periods"]] == ["2025-01-01", "2025-02-01", "2025-03-01"]
+    assert series["invoice_count"].tolist() == [expected[str(period)][0] for period in series["periods"]]
+
+def test_empty_database(tmp_path):
+    analytics = InvoiceAnalytics.from_database(DatabaseManager(str(tmp_path / "empty.db")))
+    
+    assert len(analytics.arrays) == 0
+    assert len(analytics.revenue_series("week")["periods"]) == 0
+    summary = analytics.summary()
+    assert summary["invoices"] == 0
+    assert summary["customers"] == 0
+    assert summary["median_days_between_visits"] is None
@@ -0,0 +1,52 @@
+# tests/test_csv_importer.py
+"""
+Duplicate detection and the error report of the CSV customer import.
+Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database.db_manager import DatabaseManager
+from utils.csv_importer import CSVImporter
+
+@pytest.fixture
+def db_manager(tmp_path):
+    return DatabaseManager(str(tmp_path / "import.db"))
+
+def write_csv(path, text):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return str(path)
+
+def customer_phones(db_manager):
+    conn = db_manager.get_connection()
+    try:
+        return [row[0] for row in conn.execute("SELECT phone FROM customers ORDER BY id")]
+    finally:
+        conn.close()
+
+def test_phone_typed_in_app_is_a_duplicate(db_manager, tmp_path):
+    # Customers added in the app keep the phone as it was typed
+    db_manager.add_customer({"name": "Existing", "phone": "+963 944 123 456"})
+    path = write_csv(tmp_path / "customers.csv", "name,phone\nSame,0944123456\nOther,٠٩٤٤١٢٣٤٥٧\n")
+    
+    result = CSVImporter(db_manager).import_customers(path)
+    
+    assert (result["imported"], result["duplicates"]) == (1, 1)
+    assert customer_phones(db_manager) == ["+963 944 123 456", "0944123457"]
+
+def test_error_report_of_an_earlier_run_is_removed(db_manager, tmp_path):
+    path = write_csv(tmp_path / "customers.csv", "name,phone\nNo phone,\n")
+    report_path = CSVImporter(db_manager).import_customers(path)["error_report"]
+    assert os.path.exists(report_path)
+    
+    write_csv(tmp_path / "customers.csv", "name,phone\nFixed,0944000111\n")
+    result = CSVImporter(db_manager).import_customers(path)
+    
+    assert result["error_report"] is None
+    assert not os.path.exists(report_path)
@@ -0,0 +1,93 @@
+# tests/test_invoices_tab.py
+"""
+The invoices tab's batch PDF export driven through its button offscreen, and printing
+an invoice deleted since the table was loaded.
+Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import json
+import zipfile
+import datetime
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
+
+from generate_data import generate_database
+from config.settings import Settings
+from database.db_manager import DatabaseManager
+from views.tabs.invoices_tab import InvoicesTab
+
+class Translations:
+    def get_translation(self, key):
+        return key
+    
+    def get_current_language(self):
+        return "en"
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+def test_batch_export_uses_unsaved_settings(app, tmp_path, monkeypatch):
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda kind, value, traceback: errors.append(value))
+    messages = []
+    zip_path = str(tmp_path / "invoices.zip")
+    monkeypatch.setattr(QFileDialog, "getSaveFileName", lambda *args: (zip_path, ""))
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: messages.append(args[-1]))
+    monkeypatch.setattr(QMessageBox, "critical", lambda *args: messages.append(args[-1]))
+    
+    db_path = str(tmp_path / "invoices.db")
+    generate_database(db_path, 20, 40, 40, years=1, seed=5, end_date=datetime.date.today())
+    # A clinic name still waiting for the write-behind timer
+    settings = Settings(str(tmp_path / "settings.json"), flush_delay=3600)
+    settings.set_setting("clinic_info.name", "Test Clinic Name")
+    
+    tab = InvoicesTab(DatabaseManager(db_path), Translations(), True, settings)
+    tab.invoices_table.selectAll()
+    tab.export_button.click()
+    tab.deleteLater()
+    
+    assert errors == []
+    assert messages == ["invoices.pdfs_exported: 40"]
+    # Flushed before the workers read the settings file
+    with open(settings.settings_file, encoding="utf-8") as f:
+        assert json.load(f)["clinic_info"]["name"] == "Test Clinic Name"
+    with zipfile.ZipFile(zip_path) as archive:
+        assert len(archive.namelist()) == 40
+
+
+def test_print_deleted_invoice(app, tmp_path, monkeypatch):
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda kind, value, traceback: errors.append(value))
+    messages = []
+    monkeypatch.setattr(QMessageBox, "critical", lambda *args: messages.append(args[-1]))
+    
+    db_path = str(tmp_path / "invoices.db")
+    generate_database(db_path, 20, 40, 40, years=1, seed=5, end_date=datetime.date.today())
+    db_manager = DatabaseManager(db_path)
+    tab = InvoicesTab(db_manager, Translations(), True, Settings(str(tmp_path / "settings.json")))
+    invoice_id = int(tab.invoices_table.item(0, 0).text())
+    tab.invoices_table.selectRow(0)
+    # Deleted elsewhere after the table was loaded
+    conn = db_manager.get_connection()
+    conn.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
+    conn.commit()
+    conn.close()
+    
+    assert tab.get_invoice_document(invoice_id) is None
+    assert tab.get_invoice_pdf(invoice_id) is None
+    tab.print_invoice()
+    tab.deleteLater()
+    
+    assert errors == []
+    assert messages == ["common.operation_failed"]
+    assert tab.invoices_table.rowCount() == 39
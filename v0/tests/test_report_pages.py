@@ -0,0 +1,98 @@
+# tests/test_report_pages.py
+"""
+Report pages are printed one sheet per page HTML, so every page must lay out on a
+single A4 sheet at the printer's resolution, with none of its rows or totals cut off.
+Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import re
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtGui import QPageSize
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtPrintSupport import QPrinter
+
+from utils.document_templates import DocumentTemplates
+from utils.page_preview import html_page, page_fits, printer_page_size
+from utils.pdf_generator import PDFGenerator, REPORT_ROWS_PER_PAGE
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def printer(app):
+    printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+    printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+    return printer
+
+def make_invoices(count, long_every=0):
+    """Invoices with distinct customer names; every long_every-th name wraps over several lines."""
+    invoices = []
+    for i in range(1, count + 1):
+        name = f"customer-{i:04d}"
+        if long_every and i % long_every == 0:
+            name += " " + "اسم طويل جدا " * 12
+        invoices.append({
+            "id": i,
+            "date": "2025-01-02T10:00:00",
+            "customer_name": name,
+            "services": [{"name": "قص شعر"}, {"name": "صبغة"}],
+            "amount_paid": 100.0
+        })
+    return invoices
+
+def page_count(html, printer):
+    return html_page(html, printer_page_size(printer), printer).pageCount()
+
+@pytest.mark.parametrize("long_every", [0, 3], ids=["one_line_rows", "wrapping_rows"])
+def test_every_page_fits_one_sheet(printer, long_every):
+    invoices = make_invoices(94, long_every)
+    pages = list(DocumentTemplates(None).iter_report_pages(
+        "title", "period", invoices, REPORT_ROWS_PER_PAGE,
+        fits=page_fits(printer_page_size(printer), printer)
+    ))
+    
+    assert [page_count(html, printer) for html in pages] == [1] * len(pages)
+    if long_every:
+        # Wrapped rows took the place of others
+        assert len(pages) > -(-len(invoices) // REPORT_ROWS_PER_PAGE)
+    # Every row is printed exactly once, in order
+    names = [name for html in pages for name in re.findall(r"customer-\d{4}", html)]
+    assert names == [invoice["customer_name"][:13] for invoice in invoices]
+    assert "9,400" in pages[-1]
+
+def test_full_page_without_measuring_fits(printer):
+    """REPORT_ROWS_PER_PAGE one-line rows, plus the totals of the last page, fit on a sheet."""
+    pages = list(DocumentTemplates(None).iter_report_pages("title", "period", make_invoices(REPORT_ROWS_PER_PAGE),
+                                                           REPORT_ROWS_PER_PAGE))
+    assert len(pages) == 1
+    assert page_count(pages[0], printer) == 1
+
+def test_empty_report(printer):
+    pages = list(DocumentTemplates(None).iter_report_pages(
+        "title", "period", [], REPORT_ROWS_PER_PAGE, fits=page_fits(printer_page_size(printer), printer)
+    ))
+    assert len(pages) == 1
+
+def test_report_pdf_page_count(printer, tmp_path):
+    output_path = str(tmp_path / "report.pdf")
+    PDFGenerator().generate_report_pdf("title", "period", make_invoices(60, 4), output_path)
+    
+    with open(output_path, "rb") as f:
+        pdf = f.read()
+    printed_pages = len(re.findall(rb"/Type\s*/Page\b", pdf))
+    expected_pages = len(list(DocumentTemplates(None).iter_report_pages(
+        "title", "period", make_invoices(60, 4), REPORT_ROWS_PER_PAGE,
+        fits=page_fits(printer_page_size(printer), printer)
+    )))
+    assert printed_pages >= 3
+    assert printed_pages == expected_pages
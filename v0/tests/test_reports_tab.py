@@ -0,0 +1,76 @@
+# tests/test_reports_tab.py
+"""
+The Reports tab driven through its widgets offscreen, as a user would: the signals pass
+their arguments (the combo's index, the button's checked flag) to the decorated slots.
+Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import datetime
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import QDate
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
+
+from generate_data import generate_database
+from config.settings import Settings
+from database.db_manager import DatabaseManager
+from utils.tracing import get_tracer
+from views.tabs.reports_tab import ReportsTab
+
+END_DATE = datetime.date(2025, 6, 1)
+
+class Translations:
+    def get_translation(self, key):
+        return key
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def slot_errors(monkeypatch):
+    """Exceptions raised in slots; PyQt aborts the process on them with the default hook."""
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda kind, value, traceback: errors.append(value))
+    return errors
+
+@pytest.fixture(params=[False, True], ids=["untraced", "traced"])
+def tab(request, app, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_tracer(), "enabled", request.param)
+    db_path = str(tmp_path / "reports.db")
+    generate_database(db_path, 50, 100, 200, seed=3, end_date=END_DATE)
+    tab = ReportsTab(DatabaseManager(db_path), Translations(), Settings(str(tmp_path / "settings.json")))
+    yield tab
+    tab.deleteLater()
+
+def test_grouping_and_dates(tab, slot_errors):
+    tab.start_date_edit.setDate(QDate(2022, 1, 1))
+    tab.end_date_edit.setDate(QDate(END_DATE.year, END_DATE.month, END_DATE.day))
+    tab.grouping_combo.setCurrentIndex(tab.grouping_combo.findData("month"))
+    
+    assert slot_errors == []
+    assert tab.report_table.rowCount() == len(tab.rows) > 0
+    assert tab.rows[0]["key"] < tab.rows[-1]["key"]
+
+def test_export_pdf(tab, slot_errors, tmp_path, monkeypatch):
+    pdf_path = str(tmp_path / "report.pdf")
+    messages = []
+    monkeypatch.setattr(QFileDialog, "getSaveFileName", lambda *args: (pdf_path, ""))
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: messages.append(args[-1]))
+    monkeypatch.setattr(QMessageBox, "critical", lambda *args: messages.append(args[-1]))
+    
+    tab.start_date_edit.setDate(QDate(2022, 1, 1))
+    tab.export_button.click()
+    
+    assert slot_errors == []
+    assert messages == ["pdf_saved_successfully"]
+    with open(pdf_path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
@@ -0,0 +1,76 @@
+# tests/test_table_translation.py
+"""
+A language switch rewrites the table cells of the rows in view at once and the others
+as scrolling brings them into view. Run from the v0 directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import datetime
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtWidgets import QApplication
+
+from generate_data import generate_database
+from database.db_manager import DatabaseManager
+from views.tabs.customers_tab import CustomersTab
+
+class Translations:
+    def __init__(self):
+        self.language = "en"
+    
+    def get_translation(self, key):
+        return f"{self.language}:{key}"
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def tab(app, tmp_path):
+    db_path = str(tmp_path / "customers.db")
+    generate_database(db_path, 300, 100, 1500, seed=5, end_date=datetime.date(2025, 6, 1))
+    translations = Translations()
+    tab = CustomersTab(DatabaseManager(db_path), translations, True)
+    tab.resize(800, 400)
+    tab.show()
+    app.processEvents()
+    yield tab, translations
+    tab.deleteLater()
+
+def translated_rows(tab, language):
+    """Rows whose language-dependent cell is written in language."""
+    return {
+        i for i in range(tab.customers_table.rowCount())
+        if tab.customers_table.item(i, 11).text().endswith(f"{language}:services.price_currency")
+    }
+
+def owing_rows(tab, first, last):
+    return {i for i in range(first, last + 1) if tab.customers[i]["remaining_payments"] > 0}
+
+def test_visible_rows_then_scrolled_rows(tab, app):
+    tab, translations = tab
+    table = tab.customers_table
+    assert len(owing_rows(tab, 0, len(tab.customers) - 1)) > 50
+    
+    translations.language = "ar"
+    tab.retranslate()
+    first, last = tab.row_translator.visible_rows()
+    assert 0 < last - first + 1 < table.rowCount()
+    assert translated_rows(tab, "ar") == owing_rows(tab, first, last)
+    
+    table.verticalScrollBar().setValue(table.verticalScrollBar().maximum())
+    first, last = tab.row_translator.visible_rows()
+    assert last == table.rowCount() - 1
+    assert owing_rows(tab, first, last) <= translated_rows(tab, "ar")
+    
+    # Reloading writes every row in the current language
+    tab.load_customers()
+    assert translated_rows(tab, "ar") == owing_rows(tab, 0, len(tab.customers) - 1)
+    assert translated_rows(tab, "en") == set()
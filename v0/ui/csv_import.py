@@ -0,0 +1,49 @@
+# ui/csv_import.py
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QApplication
+from PyQt6.QtCore import Qt
+
+from utils.csv_importer import CSVImporter, ImportCancelled
+
+def run_csv_import(parent, db_manager, kind, translate):
+    """Ask for a CSV file and import it as "customers" or "services" with a cancellable progress dialog.
+    
+    Returns True when rows were imported, so the caller can reload its table.
+    """
+    tr = translate
+    file_path, _ = QFileDialog.getOpenFileName(parent, tr("common.import_csv"), "", "CSV Files (*.csv)")
+    if not file_path:
+        return False
+    
+    progress = QProgressDialog(tr("common.importing"), tr("common.cancel"), 0, 100, parent)
+    progress.setWindowModality(Qt.WindowModality.WindowModal)
+    progress.setMinimumDuration(0)
+    
+    def update_progress(done, total):
+        progress.setValue(int(done * 100 / total) if total else 100)
+        QApplication.processEvents()
+        return not progress.wasCanceled()
+    
+    importer = CSVImporter(db_manager)
+    try:
+        if kind == "customers":
+            result = importer.import_customers(file_path, progress_callback=update_progress)
+        else:
+            result = importer.import_services(file_path, progress_callback=update_progress)
+    except ImportCancelled:
+        progress.close()
+        QMessageBox.information(parent, tr("common.info"), tr("common.import_cancelled"))
+        return False
+    except Exception as e:
+        progress.close()
+        QMessageBox.critical(parent, tr("common.error"), f"{tr('common.operation_failed')}: {str(e)}")
+        return False
+    
+    progress.close()
+    
+    message = (f"{tr('common.imported_rows')}: {result['imported']}\n"
+               f"{tr('common.skipped_rows')}: {result['duplicates'] + result['invalid']}")
+    if result["error_report"]:
+        message += f"\n{tr('common.import_error_report')}: {result['error_report']}"
+    QMessageBox.information(parent, tr("common.success"), message)
+    
+    return result["imported"] > 0
@@ -0,0 +1,112 @@
+# ui/diagnostics_panel.py
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QTextEdit, QSplitter)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+from database.query_profiler import get_query_profiler, SLOW_QUERY_MS
+from utils.tracing import get_tracer
+
+class DiagnosticsPanel(QWidget):
+    """Query timings and the slow-query log, shown as a settings tab."""
+    
+    def __init__(self, settings, translate, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.tr = translate
+        self.profiler = get_query_profiler()
+        
+        self.setup_ui()
+        self.refresh()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Slow query threshold
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(QLabel(self.tr("settings.slow_query_threshold")))
+        
+        self.threshold_spin = QSpinBox()
+        self.threshold_spin.setRange(1, 60000)
+        self.threshold_spin.setSuffix(" ms")
+        self.threshold_spin.setValue(int(self.settings.get_setting("diagnostics.slow_query_ms", SLOW_QUERY_MS)))
+        self.threshold_spin.valueChanged.connect(self.threshold_changed)
+        threshold_layout.addWidget(self.threshold_spin)
+        threshold_layout.addStretch()
+        
+        refresh_button = QPushButton(self.tr("settings.refresh"))
+        refresh_button.clicked.connect(self.refresh)
+        threshold_layout.addWidget(refresh_button)
+        
+        reset_button = QPushButton(self.tr("settings.reset_stats"))
+        reset_button.clicked.connect(self.reset)
+        threshold_layout.addWidget(reset_button)
+        
+        layout.addLayout(threshold_layout)
+        
+        # Chrome trace recording, read at startup
+        self.trace_check = QCheckBox(self.tr("settings.record_trace"))
+        self.trace_check.setChecked(bool(self.settings.get_setting("diagnostics.trace", False)))
+        if get_tracer().enabled:
+            self.trace_check.setToolTip(get_tracer().path)
+        self.trace_check.toggled.connect(lambda checked: self.settings.set_setting("diagnostics.trace", checked))
+        layout.addWidget(self.trace_check)
+        
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        
+        # Per-statement stats
+        self.stats_table = QTableWidget()
+        self.stats_table.setColumnCount(5)
+        self.stats_table.setHorizontalHeaderLabels([
+            self.tr("settings.statement"),
+            self.tr("settings.query_count"),
+            self.tr("settings.total_ms"),
+            self.tr("settings.p95_ms"),
+            self.tr("settings.rows")
+        ])
+        self.stats_table.horizontalHeader().setStretchLastSection(True)
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.stats_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        splitter.addWidget(self.stats_table)
+        
+        # Slow query log
+        log_widget = QWidget()
+        log_layout = QVBoxLayout(log_widget)
+        log_layout.setContentsMargins(0, 0, 0, 0)
+        log_layout.addWidget(QLabel(self.tr("settings.slow_query_log")))
+        
+        self.log_view = QTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.log_view.setFont(QFont("Courier New"))
+        log_layout.addWidget(self.log_view)
+        splitter.addWidget(log_widget)
+        
+        layout.addWidget(splitter)
+    
+    def refresh(self):
+        stats = self.profiler.snapshot()
+        
+        self.stats_table.setRowCount(len(stats))
+        for i, row in enumerate(stats):
+            sql_item = QTableWidgetItem(row["sql"])
+            sql_item.setToolTip(row["sql"])
+            self.stats_table.setItem(i, 0, sql_item)
+            self.stats_table.setItem(i, 1, QTableWidgetItem(str(row["count"])))
+            self.stats_table.setItem(i, 2, QTableWidgetItem(f"{row['total_ms']:,.1f}"))
+            self.stats_table.setItem(i, 3, QTableWidgetItem(f"{row['p95_ms']:,.1f}"))
+            self.stats_table.setItem(i, 4, QTableWidgetItem(str(row["rows"])))
+        
+        self.stats_table.resizeColumnsToContents()
+        self.stats_table.setColumnWidth(0, min(self.stats_table.columnWidth(0), 400))
+        
+        self.log_view.setPlainText(self.profiler.read_slow_log())
+        self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+    
+    def reset(self):
+        self.profiler.reset()
+        self.refresh()
+    
+    def threshold_changed(self, value):
+        self.profiler.slow_query_ms = value
+        self.settings.set_setting("diagnostics.slow_query_ms", value)
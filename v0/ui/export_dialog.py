@@ -0,0 +1,213 @@
+# ui/export_dialog.py
+import os
+import datetime
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox, QCheckBox,
+                             QDateEdit, QListWidget, QListWidgetItem, QPushButton, QProgressBar,
+                             QFileDialog, QMessageBox)
+from PyQt6.QtCore import Qt, QDate, QThread, pyqtSignal
+
+from utils.data_exporter import DataExporter, ExportCancelled, EXPORT_COLUMNS, DATED_EXPORTS, FORMATS
+
+class ExportWorker(QThread):
+    """Runs one export off the GUI thread; the exporter opens its own connection in this thread."""
+    
+    progress = pyqtSignal(int, int)
+    finished_export = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    
+    def __init__(self, db_manager, kind, output_path, options, parent=None):
+        super().__init__(parent)
+        self.exporter = DataExporter(db_manager)
+        self.kind = kind
+        self.output_path = output_path
+        self.options = options
+        self._cancel_requested = False
+    
+    def cancel(self):
+        self._cancel_requested = True
+    
+    def run(self):
+        def report(done, total):
+            self.progress.emit(done, total)
+            return not self._cancel_requested
+        
+        try:
+            count = self.exporter.export(self.kind, self.output_path, progress_callback=report, **self.options)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished_export.emit(count)
+
+class ExportDialog(QDialog):
+    """Export invoices, appointments or customers to CSV or JSON Lines, with date and column filters."""
+    
+    def __init__(self, db_manager, translate, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.tr = translate
+        self.worker = None
+        
+        self.setup_ui()
+        self.kind_changed()
+    
+    def setup_ui(self):
+        self.setWindowTitle(self.tr("export.title"))
+        self.setMinimumWidth(420)
+        
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+        
+        self.kind_combo = QComboBox()
+        for kind in EXPORT_COLUMNS:
+            self.kind_combo.addItem(self.tr(f"sidebar.{kind}"), kind)
+        self.kind_combo.currentIndexChanged.connect(self.kind_changed)
+        form_layout.addRow(self.tr("export.data"), self.kind_combo)
+        
+        self.format_combo = QComboBox()
+        for file_format in FORMATS:
+            self.format_combo.addItem(self.tr(f"export.format_{file_format}"), file_format)
+        form_layout.addRow(self.tr("export.format"), self.format_combo)
+        
+        # Date range, for the data sets that have dates
+        self.date_check = QCheckBox(self.tr("export.date_range"))
+        self.date_check.toggled.connect(self.update_date_edits)
+        form_layout.addRow(self.date_check)
+        
+        today = QDate.currentDate()
+        self.start_date_edit = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.start_date_edit.setCalendarPopup(True)
+        form_layout.addRow(self.tr("export.from"), self.start_date_edit)
+        
+        self.end_date_edit = QDateEdit(today)
+        self.end_date_edit.setCalendarPopup(True)
+        form_layout.addRow(self.tr("export.to"), self.end_date_edit)
+        
+        layout.addLayout(form_layout)
+        
+        # Columns, all checked by default
+        self.columns_list = QListWidget()
+        layout.addWidget(self.columns_list)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        buttons_layout = QHBoxLayout()
+        
+        self.export_button = QPushButton(self.tr("export.export"))
+        self.export_button.clicked.connect(self.start_export)
+        buttons_layout.addWidget(self.export_button)
+        
+        self.cancel_button = QPushButton(self.tr("common.cancel"))
+        self.cancel_button.clicked.connect(self.cancel)
+        buttons_layout.addWidget(self.cancel_button)
+        
+        layout.addLayout(buttons_layout)
+    
+    def current_kind(self):
+        return self.kind_combo.currentData()
+    
+    def kind_changed(self):
+        kind = self.current_kind()
+        
+        self.columns_list.clear()
+        for column in EXPORT_COLUMNS[kind]:
+            item = QListWidgetItem(self.tr(f"{kind}.{column}"))
+            item.setData(Qt.ItemDataRole.UserRole, column)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.columns_list.addItem(item)
+        
+        dated = kind in DATED_EXPORTS
+        self.date_check.setEnabled(dated)
+        if not dated:
+            self.date_check.setChecked(False)
+        self.update_date_edits()
+    
+    def update_date_edits(self):
+        enabled = self.date_check.isChecked()
+        self.start_date_edit.setEnabled(enabled)
+        self.end_date_edit.setEnabled(enabled)
+    
+    def selected_columns(self):
+        columns = []
+        for row in range(self.columns_list.count()):
+            item = self.columns_list.item(row)
+            if item.checkState() == Qt.CheckState.Checked:
+                columns.append(item.data(Qt.ItemDataRole.UserRole))
+        return columns
+    
+    def start_export(self):
+        columns = self.selected_columns()
+        if not columns:
+            QMessageBox.warning(self, self.tr("common.warning"), self.tr("export.select_columns"))
+            return
+        
+        kind = self.current_kind()
+        file_format = self.format_combo.currentData()
+        default_name = f"{kind}_{datetime.date.today().strftime('%Y_%m_%d')}.{file_format}"
+        file_filter = "CSV Files (*.csv)" if file_format == "csv" else "JSON Lines Files (*.jsonl)"
+        
+        file_path, _ = QFileDialog.getSaveFileName(self, self.tr("export.title"), default_name, file_filter)
+        if not file_path:
+            return
+        
+        if not file_path.endswith(f".{file_format}"):
+            file_path += f".{file_format}"
+        
+        options = {"file_format": file_format, "columns": columns}
+        if self.date_check.isChecked():
+            options["start_date"] = self.start_date_edit.date().toPyDate()
+            options["end_date"] = self.end_date_edit.date().toPyDate()
+        
+        self.worker = ExportWorker(self.db_manager, kind, file_path, options, self)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished_export.connect(lambda count: self.export_finished(file_path, count))
+        self.worker.failed.connect(self.export_failed)
+        self.worker.cancelled.connect(self.export_cancelled)
+        
+        self.set_running(True)
+        self.worker.start()
+    
+    def set_running(self, running):
+        self.export_button.setEnabled(not running)
+        self.kind_combo.setEnabled(not running)
+        self.format_combo.setEnabled(not running)
+        self.columns_list.setEnabled(not running)
+        self.progress_bar.setVisible(running)
+        self.progress_bar.setValue(0)
+    
+    def update_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+    
+    def export_finished(self, file_path, count):
+        self.set_running(False)
+        QMessageBox.information(self, self.tr("common.success"),
+                                f"{self.tr('export.rows_exported')}: {count}\n{os.path.normpath(file_path)}")
+        self.accept()
+    
+    def export_failed(self, message):
+        self.set_running(False)
+        QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {message}")
+    
+    def export_cancelled(self):
+        self.set_running(False)
+        self.reject()
+    
+    def cancel(self):
+        # A running export stops after its current batch and removes the partial file
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+        else:
+            self.reject()
+    
+    def reject(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().reject()
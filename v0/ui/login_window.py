@@ -2,7 +2,9 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                            QCheckBox, QPushButton, QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtGui import QPixmap
+
+from utils.icon_loader import get_icon
 
 class LoginWindow(QDialog):
     login_successful = pyqtSignal(str, bool)
@@ -58,7 +60,7 @@ class LoginWindow(QDialog):
         self.toggle_password_button.setStyleSheet("border: none;")
         
         # Set eye icon
-        self.toggle_password_button.setIcon(QIcon("assets/icons/eye-closed.png"))
+        self.toggle_password_button.setIcon(get_icon("eye-closed.png"))
         
         password_layout.addWidget(self.toggle_password_button)
         
@@ -84,10 +86,10 @@ class LoginWindow(QDialog):
     def toggle_password_visibility(self):
         if self.toggle_password_button.isChecked():
             self.password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-            self.toggle_password_button.setIcon(QIcon("assets/icons/eye-open.png"))
+            self.toggle_password_button.setIcon(get_icon("eye-open.png"))
         else:
             self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.toggle_password_button.setIcon(QIcon("assets/icons/eye-closed.png"))
+            self.toggle_password_button.setIcon(get_icon("eye-closed.png"))
     
     def login(self):
         username = self.username_input.text()
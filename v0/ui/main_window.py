@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPu
                            QGroupBox, QScrollArea, QSplitter, QMenu, QToolBar, QStatusBar,
                            QFileDialog, QDateEdit, QTimeEdit, QDateTimeEdit, QSizePolicy)
 from PyQt6.QtCore import Qt, QDate, QTime, QDateTime, QTimer, QSize, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap, QFont, QColor, QPalette, QAction, QTextCharFormat
+from PyQt6.QtGui import QPixmap, QFont, QColor, QPalette, QAction, QTextCharFormat
 import datetime
 import json
 import os
@@ -15,7 +15,12 @@ from views.tabs.appointments_tab import AppointmentsTab
 from views.tabs.customers_tab import CustomersTab
 from views.tabs.services_tab import ServicesTab
 from views.tabs.invoices_tab import InvoicesTab
+from views.tabs.reports_tab import ReportsTab
 from ui.settings_dialog import SettingsDialog
+from ui.export_dialog import ExportDialog
+from utils.icon_loader import get_icon
+from utils.tracing import traced
+from utils.profiling import profiled
 
 class MainWindow(QMainWindow):
     logout_signal = pyqtSignal()
@@ -40,6 +45,12 @@ class MainWindow(QMainWindow):
                 self.backup_manager.auto_backup(backup_interval)
             except Exception as e:
                 print(f"Auto backup failed: {e}")
+        
+        # Archive the change journal periodically for point-in-time recovery
+        journal_interval = int(self.theme_manager.settings.get_setting("backup.journal_archive_minutes", 15))
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.archive_change_journal)
+        self.journal_timer.start(journal_interval * 60000)
     
     def setup_ui(self):
         self.setWindowTitle(self.tr("app_title"))
@@ -109,27 +120,32 @@ class MainWindow(QMainWindow):
         self.toolbar.addWidget(spacer)
         
         # Add language button
-        self.language_button = QAction(QIcon("assets/icons/language.png"), self.tr("main.languages"), self)
+        self.language_button = QAction(get_icon("language.png"), self.tr("main.languages"), self)
         self.language_button.triggered.connect(self.show_language_menu)
         self.toolbar.addAction(self.language_button)
         
         # Add theme button
-        self.theme_button = QAction(QIcon("assets/icons/theme.png"), self.tr("main.themes"), self)
+        self.theme_button = QAction(get_icon("theme.png"), self.tr("main.themes"), self)
         self.theme_button.triggered.connect(self.show_theme_menu)
         self.toolbar.addAction(self.theme_button)
         
         # Add notifications button
-        self.notifications_button = QAction(QIcon("assets/icons/notification.png"), self.tr("main.notifications"), self)
+        self.notifications_button = QAction(get_icon("notification.png"), self.tr("main.notifications"), self)
         self.notifications_button.triggered.connect(self.show_notifications)
         self.toolbar.addAction(self.notifications_button)
         
+        # Add export button
+        self.export_button = QAction(get_icon("export.png"), self.tr("main.export"), self)
+        self.export_button.triggered.connect(self.show_export)
+        self.toolbar.addAction(self.export_button)
+        
         # Add settings button
-        self.settings_button = QAction(QIcon("assets/icons/settings.png"), self.tr("main.settings"), self)
+        self.settings_button = QAction(get_icon("settings.png"), self.tr("main.settings"), self)
         self.settings_button.triggered.connect(self.show_settings)
         self.toolbar.addAction(self.settings_button)
         
         # Add logout button
-        self.logout_button = QAction(QIcon("assets/icons/logout.png"), self.tr("main.logout"), self)
+        self.logout_button = QAction(get_icon("logout.png"), self.tr("main.logout"), self)
         self.logout_button.triggered.connect(self.logout)
         self.toolbar.addAction(self.logout_button)
     
@@ -148,7 +164,7 @@ class MainWindow(QMainWindow):
         
         # Appointments button
         appointments_button = QPushButton(self.tr("sidebar.appointments"))
-        appointments_button.setIcon(QIcon("assets/icons/calendar.png"))
+        appointments_button.setIcon(get_icon("calendar.png"))
         appointments_button.setCheckable(True)
         appointments_button.clicked.connect(lambda: self.show_tab(0))
         sidebar_layout.addWidget(appointments_button)
@@ -156,7 +172,7 @@ class MainWindow(QMainWindow):
         
         # Customers button
         customers_button = QPushButton(self.tr("sidebar.customers"))
-        customers_button.setIcon(QIcon("assets/icons/customers.png"))
+        customers_button.setIcon(get_icon("customers.png"))
         customers_button.setCheckable(True)
         customers_button.clicked.connect(lambda: self.show_tab(1))
         sidebar_layout.addWidget(customers_button)
@@ -164,7 +180,7 @@ class MainWindow(QMainWindow):
         
         # Services button
         services_button = QPushButton(self.tr("sidebar.services"))
-        services_button.setIcon(QIcon("assets/icons/services.png"))
+        services_button.setIcon(get_icon("services.png"))
         services_button.setCheckable(True)
         services_button.clicked.connect(lambda: self.show_tab(2))
         sidebar_layout.addWidget(services_button)
@@ -172,12 +188,20 @@ class MainWindow(QMainWindow):
         
         # Invoices button
         invoices_button = QPushButton(self.tr("sidebar.invoices"))
-        invoices_button.setIcon(QIcon("assets/icons/invoice.png"))
+        invoices_button.setIcon(get_icon("invoice.png"))
         invoices_button.setCheckable(True)
         invoices_button.clicked.connect(lambda: self.show_tab(3))
         sidebar_layout.addWidget(invoices_button)
         self.sidebar_buttons.append(invoices_button)
         
+        # Reports button
+        reports_button = QPushButton(self.tr("sidebar.reports"))
+        reports_button.setIcon(get_icon("invoices.png"))
+        reports_button.setCheckable(True)
+        reports_button.clicked.connect(lambda: self.show_tab(4))
+        sidebar_layout.addWidget(reports_button)
+        self.sidebar_buttons.append(reports_button)
+        
         # Add spacer
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -193,13 +217,15 @@ class MainWindow(QMainWindow):
         self.appointments_tab = AppointmentsTab(self.db_manager, self.language_manager, self.is_admin)
         self.customers_tab = CustomersTab(self.db_manager, self.language_manager, self.is_admin)
         self.services_tab = ServicesTab(self.db_manager, self.language_manager, self.is_admin)
-        self.invoices_tab = InvoicesTab(self.db_manager, self.language_manager, self.is_admin)
+        self.invoices_tab = InvoicesTab(self.db_manager, self.language_manager, self.is_admin, self.theme_manager.settings)
+        self.reports_tab = ReportsTab(self.db_manager, self.language_manager, self.theme_manager.settings)
         
         # Add tabs to stack
         self.content_stack.addWidget(self.appointments_tab)
         self.content_stack.addWidget(self.customers_tab)
         self.content_stack.addWidget(self.services_tab)
         self.content_stack.addWidget(self.invoices_tab)
+        self.content_stack.addWidget(self.reports_tab)
         
         return self.content_stack
     
@@ -288,21 +314,21 @@ class MainWindow(QMainWindow):
         # Add appointment button
         add_appointment_button = QPushButton(self.tr("appointments.add"))
         add_appointment_button.setObjectName("add_appointment_button")
-        add_appointment_button.setIcon(QIcon("assets/icons/add_appointment.png"))
+        add_appointment_button.setIcon(get_icon("add_appointment.png"))
         add_appointment_button.clicked.connect(self.add_appointment)
         bottom_layout.addWidget(add_appointment_button)
         
         # Add customer button
         add_customer_button = QPushButton(self.tr("customers.add"))
         add_customer_button.setObjectName("add_customer_button")
-        add_customer_button.setIcon(QIcon("assets/icons/add_customer.png"))
+        add_customer_button.setIcon(get_icon("add_customer.png"))
         add_customer_button.clicked.connect(self.add_customer)
         bottom_layout.addWidget(add_customer_button)
         
         # Create invoice button
         create_invoice_button = QPushButton(self.tr("invoices.add"))
         create_invoice_button.setObjectName("create_invoice_button")
-        create_invoice_button.setIcon(QIcon("assets/icons/add_invoice.png"))
+        create_invoice_button.setIcon(get_icon("add_invoice.png"))
         create_invoice_button.clicked.connect(self.create_invoice)
         bottom_layout.addWidget(create_invoice_button)
         
@@ -327,6 +353,13 @@ class MainWindow(QMainWindow):
             self.stats_timer.timeout.connect(self.update_financial_stats)
             self.stats_timer.start(3600000)  # 1 hour in milliseconds
     
+    def archive_change_journal(self):
+        try:
+            self.backup_manager.archive_change_journal()
+        except Exception as e:
+            print(f"Change journal archiving failed: {e}")
+    
+    @profiled()
     def show_tab(self, index):
         # Update sidebar button states
         for i, button in enumerate(self.sidebar_buttons):
@@ -344,7 +377,11 @@ class MainWindow(QMainWindow):
             self.search_box.setPlaceholderText(self.tr("services.search"))
         elif index == 3:
             self.search_box.setPlaceholderText(self.tr("invoices.search"))
+        elif index == 4:
+            # Picks up invoices written since the report was shown; a cache hit otherwise
+            self.reports_tab.load_report()
     
+    @traced(category="search")
     def search(self, text):
         current_tab = self.content_stack.currentIndex()
         
@@ -407,6 +444,7 @@ class MainWindow(QMainWindow):
             
             dialog.exec()
     
+    @traced(category="load")
     def update_appointments_for_date(self):
         # Get selected date
         selected_date = self.calendar.selectedDate().toPyDate()
@@ -430,6 +468,7 @@ class MainWindow(QMainWindow):
         # Mark dates with appointments on the calendar
         self.mark_calendar_dates()
     
+    @traced(category="load")
     def mark_calendar_dates(self):
         # Get all appointments
         appointments = self.db_manager.get_all_appointments()
@@ -462,6 +501,7 @@ class MainWindow(QMainWindow):
                 # Reset format for dates without appointments
                 self.calendar.setDateTextFormat(date, QTextCharFormat())
     
+    @traced(category="load")
     def update_financial_stats(self):
         if not self.is_admin:
             return
@@ -469,18 +509,25 @@ class MainWindow(QMainWindow):
         # Get current date
         today = datetime.date.today()
         
-        # Calculate daily revenue
-        daily_revenue = self.db_manager.get_daily_revenue(today)
-        self.daily_revenue.setText(f"{daily_revenue:,.0f} {self.tr('services.price_currency')}")
-        
-        # Calculate weekly revenue (starting from Monday)
+        # Calculate weekly revenue starting from Monday
         monday = today - datetime.timedelta(days=today.weekday())
-        weekly_revenue = self.db_manager.get_weekly_revenue(monday)
-        self.weekly_revenue.setText(f"{weekly_revenue:,.0f} {self.tr('services.price_currency')}")
         
-        # Calculate monthly revenue
-        monthly_revenue = self.db_manager.get_monthly_revenue(today.year, today.month)
-        self.monthly_revenue.setText(f"{monthly_revenue:,.0f} {self.tr('services.price_currency')}")
+        # Keep the raw values so a language change only has to re-format them
+        self.financial_stats = {
+            "daily": self.db_manager.get_daily_revenue(today),
+            "weekly": self.db_manager.get_weekly_revenue(monday),
+            "monthly": self.db_manager.get_monthly_revenue(today.year, today.month)
+        }
+        self.show_financial_stats()
+    
+    def show_financial_stats(self):
+        if not self.is_admin or not hasattr(self, "financial_stats"):
+            return
+        
+        currency = self.tr('services.price_currency')
+        self.daily_revenue.setText(f"{self.financial_stats['daily']:,.0f} {currency}")
+        self.weekly_revenue.setText(f"{self.financial_stats['weekly']:,.0f} {currency}")
+        self.monthly_revenue.setText(f"{self.financial_stats['monthly']:,.0f} {currency}")
     
     def show_language_menu(self):
         # Toggle between languages directly without popup menu
@@ -500,7 +547,7 @@ class MainWindow(QMainWindow):
     
     def show_theme_menu(self):
         # Toggle between themes directly without popup menu
-        current_theme = self.theme_manager.get_current_theme()
+        current_theme = self.theme_manager.get_current_theme_name()
         new_theme = "dark" if current_theme == "light" else "light"
         self.change_theme(new_theme)
     
@@ -512,6 +559,10 @@ class MainWindow(QMainWindow):
         # Show notifications dialog
         QMessageBox.information(self, self.tr("main.notifications"), self.tr("no_notifications"))
     
+    def show_export(self):
+        export_dialog = ExportDialog(self.db_manager, self.tr, self)
+        export_dialog.exec()
+    
     def show_settings(self):
         # Show settings dialog
         settings_dialog = SettingsDialog(self.db_manager, self.theme_manager, self.language_manager, self.backup_manager, self.is_admin)
@@ -533,6 +584,7 @@ class MainWindow(QMainWindow):
         self.language_button.setText(self.tr("main.languages"))
         self.theme_button.setText(self.tr("main.themes"))
         self.notifications_button.setText(self.tr("main.notifications"))
+        self.export_button.setText(self.tr("main.export"))
         self.settings_button.setText(self.tr("main.settings"))
         self.logout_button.setText(self.tr("main.logout"))
         
@@ -541,6 +593,7 @@ class MainWindow(QMainWindow):
         self.sidebar_buttons[1].setText(self.tr("sidebar.customers"))
         self.sidebar_buttons[2].setText(self.tr("sidebar.services"))
         self.sidebar_buttons[3].setText(self.tr("sidebar.invoices"))
+        self.sidebar_buttons[4].setText(self.tr("sidebar.reports"))
         
         # Update bottom bar buttons
         self.bottom_bar.findChild(QPushButton, "add_appointment_button").setText(self.tr("appointments.add"))
@@ -555,16 +608,15 @@ class MainWindow(QMainWindow):
         # Re-translate all text
         self.retranslateUi()
         
-        # Update all tabs
-        self.appointments_tab.refresh()
-        self.customers_tab.refresh()
-        self.services_tab.refresh()
-        self.invoices_tab.refresh()
+        # Re-translate the tabs from the data they already hold
+        self.appointments_tab.retranslate()
+        self.customers_tab.retranslate()
+        self.services_tab.retranslate()
+        self.invoices_tab.retranslate()
+        self.reports_tab.retranslate()
         
-        # Update calendar and stats
-        self.update_appointments_for_date()
-        if self.is_admin:
-            self.update_financial_stats()
+        # Re-format the cached stats; the calendar list has no translated text
+        self.show_financial_stats()
     
     def add_appointment(self):
         self.show_tab(0)  # Switch to appointments tab
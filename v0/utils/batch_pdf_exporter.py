@@ -0,0 +1,108 @@
+# utils/batch_pdf_exporter.py
+import os
+import shutil
+import zipfile
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from models.invoices_model import InvoicesModel
+from utils.tracing import traced
+
+# Set in each worker process by _init_worker
+_worker_app = None
+_worker_generator = None
+
+def _init_worker(settings_file):
+    """Start an offscreen Qt application and a PDF generator in a worker process.
+    
+    Workers get the settings file path, not the caller's Settings object, and read the
+    clinic details from the file themselves.
+    """
+    global _worker_app, _worker_generator
+    
+    # Workers never show windows, so they don't need a display
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    
+    from PyQt6.QtGui import QGuiApplication
+    from config.settings import Settings
+    from utils.pdf_generator import PDFGenerator
+    
+    _worker_app = QGuiApplication.instance() or QGuiApplication([])
+    _worker_generator = PDFGenerator(Settings(settings_file) if settings_file else None)
+
+def _render_invoice(invoice, output_dir):
+    """Render one invoice to a PDF file in output_dir; returns (invoice_id, path)."""
+    output_path = os.path.join(output_dir, f"invoice_{invoice['id']}.pdf")
+    _worker_generator.generate_invoice_pdf(invoice, output_path)
+    return invoice["id"], output_path
+
+class BatchPDFExporter:
+    """Exports many invoices to PDF in parallel and packs them into one ZIP file."""
+    
+    def __init__(self, db_manager, settings=None, max_workers=None):
+        self.invoices_model = InvoicesModel(db_manager)
+        self.settings = settings
+        self.max_workers = max_workers or os.cpu_count() or 1
+    
+    @traced(category="pdf")
+    def export(self, output_path, invoice_ids=None, start_date=None, end_date=None, progress_callback=None):
+        """Export invoices (by IDs or by date range) to a ZIP of PDFs.
+        
+        progress_callback(done, total) is called in the calling process after each invoice.
+        Returns the number of exported invoices.
+        """
+        if invoice_ids is not None:
+            invoices = self.invoices_model.get_invoices_by_ids(invoice_ids)
+        else:
+            invoices = self.invoices_model.get_invoices_by_date_range(start_date, end_date)
+        
+        total = len(invoices)
+        if progress_callback:
+            progress_callback(0, total)
+        
+        if not invoices:
+            return 0
+        
+        temp_dir = tempfile.mkdtemp(prefix="invoices_")
+        try:
+            pdf_paths = self._render_all(invoices, temp_dir, progress_callback)
+            
+            # PDFs are already compressed, so store them as they are
+            temp_zip = output_path + ".tmp"
+            with zipfile.ZipFile(temp_zip, 'w', zipfile.ZIP_STORED) as zipf:
+                for invoice in invoices:
+                    pdf_path = pdf_paths[invoice["id"]]
+                    zipf.write(pdf_path, os.path.basename(pdf_path))
+            os.replace(temp_zip, output_path)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        return total
+    
+    def _render_all(self, invoices, output_dir, progress_callback):
+        """Render the invoices across the worker pool; returns {invoice_id: pdf_path}."""
+        pdf_paths = {}
+        workers = min(self.max_workers, len(invoices))
+        
+        # Qt is not fork-safe, so always start clean interpreters
+        context = multiprocessing.get_context("spawn")
+        
+        # Unsaved changes would not reach the workers, which read the file
+        settings_file = None
+        if self.settings:
+            self.settings.flush()
+            settings_file = os.path.abspath(self.settings.settings_file)
+        
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(settings_file,)) as executor:
+            futures = [executor.submit(_render_invoice, invoice, output_dir) for invoice in invoices]
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                invoice_id, pdf_path = future.result()
+                pdf_paths[invoice_id] = pdf_path
+                
+                if progress_callback:
+                    progress_callback(done, len(invoices))
+        
+        return pdf_paths
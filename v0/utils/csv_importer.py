@@ -0,0 +1,333 @@
+# utils/csv_importer.py
+import io
+import os
+import re
+import csv
+import json
+import time
+
+from utils.translation_loader import TranslationLoader, SUPPORTED_LANGUAGES
+from utils.tracing import traced
+
+# Rows per executemany call; the whole file is still one transaction
+BATCH_SIZE = 5000
+
+# Bytes read to detect the delimiter (Excel uses ";" in locales with a decimal comma)
+SNIFF_BYTES = 64 * 1024
+
+# Bound parameters per duplicate lookup, below SQLite's limit
+LOOKUP_CHUNK = 500
+
+TRANSLATIONS_DIR = "data/translations"
+
+# Syrian numbers after normalization: a leading 0 and 8 or 9 more digits
+PHONE_PATTERN = re.compile(r"^0[1-9][0-9]{7,8}$")
+
+_EASTERN_DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹٫", "01234567890123456789.")
+_NON_DIGITS = re.compile(r"[^0-9]")
+_NUMBER_SEPARATORS = re.compile(r"[\s,٬']")
+
+# Field -> (required, parser name); the header of a column may be the field name or its
+# label in any language, so files exported by the app come back in unchanged
+CUSTOMER_FIELDS = {
+    "name": (True, "text"),
+    "phone": (True, "phone"),
+    "email": (False, "text"),
+    "hair_type": (False, "text"),
+    "hair_color": (False, "text"),
+    "skin_type": (False, "text"),
+    "allergies": (False, "text"),
+    "current_sessions": (False, "count"),
+    "remaining_sessions": (False, "count"),
+    "most_requested_services": (False, "list"),
+    "remaining_payments": (False, "amount"),
+    "notes": (False, "text")
+}
+
+SERVICE_FIELDS = {
+    "name": (True, "text"),
+    "price": (True, "amount")
+}
+
+def normalize_phone(value):
+    """Digits-only local form of a phone number (e.g. +963 944-123-456 -> 0944123456), or None if invalid."""
+    digits = _NON_DIGITS.sub("", value.translate(_EASTERN_DIGITS))
+    if digits.startswith("00963"):
+        digits = "0" + digits[5:]
+    elif digits.startswith("963"):
+        digits = "0" + digits[3:]
+    elif len(digits) == 9 and not digits.startswith("0"):
+        # Spreadsheets drop the leading zero of numbers stored as numbers
+        digits = "0" + digits
+    
+    return digits if PHONE_PATTERN.match(digits) else None
+
+def parse_amount(value):
+    """A non-negative number written with Arabic or Latin digits and optional thousands separators."""
+    number = float(_NUMBER_SEPARATORS.sub("", value.translate(_EASTERN_DIGITS)))
+    if number < 0:
+        raise ValueError("negative")
+    return number
+
+def parse_count(value):
+    number = parse_amount(value)
+    if number != int(number):
+        raise ValueError("not a whole number")
+    return int(number)
+
+def normalize_header(value):
+    return " ".join(value.strip().lower().replace("_", " ").split())
+
+def header_aliases(section, fields, translations_dir=TRANSLATIONS_DIR):
+    """Normalized header -> field, from the field names and their labels in every language."""
+    aliases = {normalize_header(field): field for field in fields}
+    
+    loader = TranslationLoader(translations_dir)
+    for language in SUPPORTED_LANGUAGES:
+        try:
+            texts, icons = loader.load(language)
+        except (OSError, ValueError):
+            continue
+        for field in fields:
+            label = texts.get(f"{section}.{field}")
+            if label:
+                aliases.setdefault(normalize_header(label), field)
+    
+    return aliases
+
+class ImportCancelled(Exception):
+    pass
+
+class CSVImporter:
+    """Imports customers or services from a UTF-8 CSV file (as saved by Excel or the app).
+    
+    Rows are streamed, validated and inserted with executemany in one transaction,
+    so an import is either applied in full or, when it fails or is cancelled, not at
+    all. Invalid and duplicate rows are skipped and written to an error report.
+    """
+    
+    def __init__(self, db_manager, batch_size=BATCH_SIZE):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+    
+    @traced(category="import")
+    def import_customers(self, path, progress_callback=None, error_report_path=None):
+        """Import customers; a phone number already in the database or earlier in the file is a duplicate.
+        
+        progress_callback(done_bytes, total_bytes) is called after each batch; returning
+        False cancels the import. Returns a summary dict.
+        """
+        return self._import(path, "customers", CUSTOMER_FIELDS, "phone", progress_callback, error_report_path)
+    
+    @traced(category="import")
+    def import_services(self, path, progress_callback=None, error_report_path=None):
+        """Import services; a service name that already exists is a duplicate."""
+        return self._import(path, "services", SERVICE_FIELDS, "name", progress_callback, error_report_path)
+    
+    def _import(self, path, table, fields, unique_field, progress_callback, error_report_path):
+        started = time.perf_counter()
+        total_bytes = os.path.getsize(path)
+        error_report_path = error_report_path or os.path.splitext(path)[0] + "_errors.csv"
+        
+        raw = open(path, 'rb')
+        # utf-8-sig drops the byte order mark Excel writes
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        report = _ErrorReport(error_report_path)
+        conn = self.db_manager.get_connection()
+        
+        counts = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+        try:
+            sample = text.read(SNIFF_BYTES)
+            text.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            
+            reader = csv.reader(text, dialect)
+            columns = self._map_columns(next(reader, []), table, fields)
+            
+            seen = set()
+            batch = []
+            conn.execute("BEGIN")
+            known = self._existing_phones(conn) if table == "customers" else None
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                
+                counts["rows"] += 1
+                record, errors = self._parse_row(row, columns, fields)
+                if errors:
+                    counts["invalid"] += 1
+                    for column, value, message in errors:
+                        report.add(reader.line_num, column, value, message)
+                    continue
+                
+                key = record[unique_field]
+                if key in seen:
+                    counts["duplicates"] += 1
+                    report.add(reader.line_num, unique_field, key, "duplicate in file")
+                    continue
+                seen.add(key)
+                batch.append((reader.line_num, record))
+                
+                if len(batch) >= self.batch_size:
+                    self._flush(conn, table, fields, unique_field, batch, counts, report, known)
+                    batch = []
+                    if progress_callback and progress_callback(raw.tell(), total_bytes) is False:
+                        raise ImportCancelled()
+            
+            if batch:
+                self._flush(conn, table, fields, unique_field, batch, counts, report, known)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+            text.close()
+            report.close()
+        
+        if progress_callback:
+            progress_callback(total_bytes, total_bytes)
+        
+        counts["error_report"] = report.path if report.count else None
+        counts["seconds"] = round(time.perf_counter() - started, 3)
+        return counts
+    
+    def _map_columns(self, header, table, fields):
+        """[(column index, field)] for the header row; raises ValueError if a required field is missing."""
+        aliases = header_aliases(table, fields)
+        columns = []
+        mapped = set()
+        for index, name in enumerate(header):
+            field = aliases.get(normalize_header(name))
+            if field and field not in mapped:
+                columns.append((index, field))
+                mapped.add(field)
+        
+        missing = [field for field, (required, parser) in fields.items() if required and field not in mapped]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        return columns
+    
+    def _parse_row(self, row, columns, fields):
+        """(record dict, [(field, value, error)])."""
+        record = {}
+        errors = []
+        for index, field in columns:
+            value = row[index].strip() if index < len(row) else ""
+            required, parser = fields[field]
+            
+            if not value:
+                if required:
+                    errors.append((field, value, "required"))
+                continue
+            
+            if parser == "phone":
+                phone = normalize_phone(value)
+                if phone is None:
+                    errors.append((field, value, "invalid phone number"))
+                record[field] = phone
+            elif parser in ("amount", "count"):
+                try:
+                    record[field] = parse_amount(value) if parser == "amount" else parse_count(value)
+                except ValueError:
+                    errors.append((field, value, "invalid number"))
+            elif parser == "list":
+                record[field] = [item.strip() for item in re.split(r"[,،]", value) if item.strip()]
+            else:
+                record[field] = value
+        
+        return record, errors
+    
+    def _existing_phones(self, conn):
+        """Every customer phone in the database, normalized like the imported ones.
+        
+        Customers added in the app keep the phone as it was typed (e.g. +963 944 123 456),
+        so the stored values can't be matched with an index lookup.
+        """
+        phones = set()
+        for (phone,) in conn.execute("SELECT phone FROM customers"):
+            normalized = normalize_phone(phone or "")
+            phones.add(normalized or phone)
+        return phones
+    
+    def _existing(self, conn, table, unique_field, keys):
+        """The service names already in the table, looked up in chunks."""
+        existing = set()
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor = conn.execute(f"SELECT name FROM services WHERE name IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+    
+    def _flush(self, conn, table, fields, unique_field, batch, counts, report, known=None):
+        """Insert a batch of parsed rows; known, if given, holds the normalized phones already stored."""
+        if known is not None:
+            existing = known
+        else:
+            existing = self._existing(conn, table, unique_field, [record[unique_field] for line, record in batch])
+        
+        rows = []
+        for line, record in batch:
+            if record[unique_field] in existing:
+                counts["duplicates"] += 1
+                report.add(line, unique_field, record[unique_field], "already exists")
+                continue
+            rows.append(self._row_values(fields, record))
+        
+        if not rows:
+            return
+        
+        if table == "customers":
+            conn.executemany('''
+            INSERT INTO customers (
+                name, phone, email, hair_type, hair_color, skin_type, allergies,
+                current_sessions, remaining_sessions, most_requested_services,
+                remaining_payments, notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        else:
+            conn.executemany("INSERT INTO services (name, price) VALUES (?, ?)", rows)
+        counts["imported"] += len(rows)
+    
+    def _row_values(self, fields, record):
+        """Values in field order (the column order of the INSERT), with the defaults add_customer uses."""
+        values = []
+        for field, (required, parser) in fields.items():
+            value = record.get(field)
+            if parser == "list":
+                value = json.dumps(value or [])
+            elif value is None:
+                value = 0 if parser in ("amount", "count") else ""
+            values.append(value)
+        return values
+
+class _ErrorReport:
+    """CSV of the skipped rows (line, column, value, error), created on the first error.
+    
+    A run without errors removes the report an earlier run left at the same path.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+    
+    def add(self, line, column, value, message):
+        if self._file is None:
+            # utf-8-sig so Excel shows the Arabic text correctly
+            self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["line", "column", "value", "error"])
+        self._writer.writerow([line, column, value, message])
+        self.count += 1
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
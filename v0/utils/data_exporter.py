@@ -0,0 +1,206 @@
+# utils/data_exporter.py
+import os
+import csv
+import json
+
+from database.reports import date_range_bounds
+from utils.tracing import traced
+
+# Rows fetched from the cursor at a time; memory use doesn't depend on the table size
+FETCH_SIZE = 2000
+
+FORMATS = ("csv", "jsonl")
+
+# Exportable columns per data set, in file order. The customer columns use the
+# field names CSVImporter reads, so an exported file can be imported again.
+EXPORT_COLUMNS = {
+    "invoices": (
+        "id", "date", "customer_id", "customer_name", "customer_phone", "appointment_id",
+        "services", "payment_method", "total_amount", "amount_paid", "amount_remaining",
+        "invoice_creator", "service_provider"
+    ),
+    "appointments": (
+        "id", "date_time", "customer_id", "customer_name", "customer_phone", "services",
+        "service_provider", "status", "remaining_payments", "notes"
+    ),
+    "customers": (
+        "id", "name", "phone", "email", "hair_type", "hair_color", "skin_type", "allergies",
+        "current_sessions", "remaining_sessions", "most_requested_services",
+        "remaining_payments", "notes", "created_at"
+    )
+}
+
+# Data sets that can be limited to a date range
+DATED_EXPORTS = ("invoices", "appointments")
+
+# Columns holding JSON lists: written as lists in JSON Lines and as comma-separated names in CSV
+JSON_COLUMNS = ("services", "most_requested_services")
+
+class ExportCancelled(Exception):
+    pass
+
+def _list_names(items):
+    return ", ".join(str(item.get("name", "")) if isinstance(item, dict) else str(item) for item in items)
+
+class DataExporter:
+    """Streams invoices, appointments or customers from the database to a CSV or JSON Lines file.
+    
+    Rows go from the cursor to the file in fetchmany batches, so exports of any size
+    run in constant memory. The file is written under a temporary name and only
+    renamed into place when the export completes.
+    """
+    
+    def __init__(self, db_manager, fetch_size=FETCH_SIZE):
+        self.db_manager = db_manager
+        self.fetch_size = fetch_size
+    
+    @traced(category="export")
+    def export(self, kind, output_path, file_format=None, start_date=None, end_date=None, columns=None,
+               progress_callback=None):
+        """Export one data set; returns the number of rows written.
+        
+        file_format defaults to the file extension. start_date/end_date (dates, both
+        inclusive) limit invoices and appointments. columns picks and orders the columns
+        (default: all of EXPORT_COLUMNS[kind]). progress_callback(done, total) is called
+        after each batch; returning False cancels the export and removes the partial file.
+        """
+        if kind not in EXPORT_COLUMNS:
+            raise ValueError(f"Unknown export: {kind}")
+        
+        file_format = (file_format or os.path.splitext(output_path)[1].lstrip(".")).lower()
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        
+        columns = list(columns or EXPORT_COLUMNS[kind])
+        unknown = [column for column in columns if column not in EXPORT_COLUMNS[kind]]
+        if unknown:
+            raise ValueError(f"Unknown columns for {kind}: {', '.join(unknown)}")
+        
+        date_range = None
+        if start_date or end_date:
+            if kind not in DATED_EXPORTS:
+                raise ValueError(f"{kind} can't be filtered by date")
+            date_range = date_range_bounds(start_date, end_date)
+        
+        conn = self.db_manager.get_connection()
+        temp_path = output_path + ".part"
+        try:
+            total = self._count(conn, kind, date_range)
+            if progress_callback:
+                progress_callback(0, total)
+            
+            cursor = self._select(conn, kind, date_range)
+            indexes = [EXPORT_COLUMNS[kind].index(column) for column in columns]
+            
+            if file_format == "csv":
+                # utf-8-sig so Excel shows the Arabic text correctly
+                f = open(temp_path, 'w', encoding='utf-8-sig', newline='')
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                write_rows = lambda rows: writer.writerows(self._csv_row(row, indexes, columns) for row in rows)
+            else:
+                f = open(temp_path, 'w', encoding='utf-8', newline='\n')
+                write_rows = lambda rows: f.writelines(self._json_line(row, indexes, columns) for row in rows)
+            
+            done = 0
+            with f:
+                while True:
+                    rows = cursor.fetchmany(self.fetch_size)
+                    if not rows:
+                        break
+                    
+                    write_rows(rows)
+                    done += len(rows)
+                    if progress_callback and progress_callback(done, total) is False:
+                        raise ExportCancelled()
+            
+            os.replace(temp_path, output_path)
+            return done
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            conn.close()
+    
+    def _count(self, conn, kind, date_range):
+        if kind == "invoices" and date_range:
+            cursor = conn.execute("SELECT COUNT(*) FROM invoices WHERE date >= ? AND date < ?", date_range)
+        elif kind == "invoices":
+            cursor = conn.execute("SELECT COUNT(*) FROM invoices")
+        elif kind == "appointments" and date_range:
+            cursor = conn.execute("SELECT COUNT(*) FROM appointments WHERE date_time >= ? AND date_time < ?",
+                                  date_range)
+        elif kind == "appointments":
+            cursor = conn.execute("SELECT COUNT(*) FROM appointments")
+        else:
+            cursor = conn.execute("SELECT COUNT(*) FROM customers")
+        return cursor.fetchone()[0]
+    
+    def _select(self, conn, kind, date_range):
+        """A cursor over the rows, with the columns in EXPORT_COLUMNS order."""
+        if kind == "invoices" and date_range:
+            return conn.execute('''
+            SELECT i.id, i.date, i.customer_id, c.name, c.phone, i.appointment_id, i.services,
+                   i.payment_method, i.total_amount, i.amount_paid, i.amount_remaining,
+                   i.invoice_creator, i.service_provider
+            FROM invoices i
+            JOIN customers c ON i.customer_id = c.id
+            WHERE i.date >= ? AND i.date < ?
+            ORDER BY i.date, i.id
+            ''', date_range)
+        
+        if kind == "invoices":
+            return conn.execute('''
+            SELECT i.id, i.date, i.customer_id, c.name, c.phone, i.appointment_id, i.services,
+                   i.payment_method, i.total_amount, i.amount_paid, i.amount_remaining,
+                   i.invoice_creator, i.service_provider
+            FROM invoices i
+            JOIN customers c ON i.customer_id = c.id
+            ORDER BY i.id
+            ''')
+        
+        if kind == "appointments" and date_range:
+            return conn.execute('''
+            SELECT a.id, a.date_time, a.customer_id, c.name, c.phone, a.services,
+                   a.service_provider, a.status, a.remaining_payments, a.notes
+            FROM appointments a
+            JOIN customers c ON a.customer_id = c.id
+            WHERE a.date_time >= ? AND a.date_time < ?
+            ORDER BY a.date_time, a.id
+            ''', date_range)
+        
+        if kind == "appointments":
+            return conn.execute('''
+            SELECT a.id, a.date_time, a.customer_id, c.name, c.phone, a.services,
+                   a.service_provider, a.status, a.remaining_payments, a.notes
+            FROM appointments a
+            JOIN customers c ON a.customer_id = c.id
+            ORDER BY a.id
+            ''')
+        
+        return conn.execute('''
+        SELECT id, name, phone, email, hair_type, hair_color, skin_type, allergies,
+               current_sessions, remaining_sessions, most_requested_services,
+               remaining_payments, notes, created_at
+        FROM customers
+        ORDER BY id
+        ''')
+    
+    def _csv_row(self, row, indexes, columns):
+        values = []
+        for index, column in zip(indexes, columns):
+            value = row[index]
+            if column in JSON_COLUMNS:
+                value = _list_names(json.loads(value or "[]"))
+            values.append(value)
+        return values
+    
+    def _json_line(self, row, indexes, columns):
+        record = {}
+        for index, column in zip(indexes, columns):
+            value = row[index]
+            if column in JSON_COLUMNS:
+                value = json.loads(value or "[]")
+            record[column] = value
+        return json.dumps(record, ensure_ascii=False) + "\n"
@@ -0,0 +1,87 @@
+# utils/document_cache.py
+import os
+import glob
+import hashlib
+from collections import OrderedDict
+
+class DocumentCache:
+    """LRU cache of laid-out invoice documents and of generated PDF files on disk.
+    
+    Keys are built by the caller, normally (invoice_id, the invoice and customer row
+    stamps, language, template version), so a cached entry can never be stale: any change to the
+    invoice, the language or the templates produces a different key.
+    """
+    
+    def __init__(self, max_documents=32, pdf_dir="cache/invoices", max_pdfs=200):
+        self.max_documents = max_documents
+        self.pdf_dir = pdf_dir
+        self.max_pdfs = max_pdfs
+        self._documents = OrderedDict()
+        self._pdfs = None
+    
+    def get_document(self, key, build):
+        """Get the cached document for key, calling build() on a miss."""
+        if key in self._documents:
+            self._documents.move_to_end(key)
+            return self._documents[key]
+        
+        document = build()
+        self._documents[key] = document
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+        
+        return document
+    
+    def get_pdf(self, key, build):
+        """Get the path of the cached PDF for key, calling build(path) to write it on a miss."""
+        pdfs = self._load_pdf_index()
+        path = os.path.join(self.pdf_dir, self._pdf_filename(key))
+        
+        if path in pdfs and os.path.exists(path):
+            pdfs.move_to_end(path)
+            # Keep the on-disk order in step for the next run
+            os.utime(path)
+            return path
+        
+        os.makedirs(self.pdf_dir, exist_ok=True)
+        temp_path = path + ".tmp.pdf"
+        build(temp_path)
+        os.replace(temp_path, path)
+        
+        pdfs[path] = True
+        pdfs.move_to_end(path)
+        while len(pdfs) > self.max_pdfs:
+            old_path, _ = pdfs.popitem(last=False)
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+        
+        return path
+    
+    def clear(self):
+        """Drop the cached documents (the PDF files stay valid, their keys still match)."""
+        self._documents.clear()
+    
+    def _load_pdf_index(self):
+        """Index the PDFs left on disk by earlier runs, least recently used first."""
+        if self._pdfs is None:
+            paths = glob.glob(os.path.join(self.pdf_dir, "invoice_*.pdf"))
+            paths = [path for path in paths if not path.endswith(".tmp.pdf")]
+            paths.sort(key=lambda path: os.path.getmtime(path))
+            self._pdfs = OrderedDict((path, True) for path in paths)
+        return self._pdfs
+    
+    def _pdf_filename(self, key):
+        """Stable file name for a key; the invoice ID stays readable."""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        return f"invoice_{key[0]}_{digest}.pdf"
+
+_shared_cache = None
+
+def get_document_cache():
+    """The document cache shared by the invoice tabs and views."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = DocumentCache()
+    return _shared_cache
@@ -0,0 +1,463 @@
+# utils/document_templates.py
+import datetime
+from collections import deque
+from string import Template
+
+# Bump whenever the template sources change so cached documents are rebuilt
+TEMPLATE_VERSION = 1
+
+# Used when no settings are available
+DEFAULT_CLINIC_INFO = {
+    "name": "مركز جوزيل للتجميل",
+    "phone": "+963956961395",
+    "address": "سوريا - ريف دمشق التل موقف طيبة مقابل امركز الثقافي الجديد"
+}
+
+# Labels used by the PDF generator, which has no translation manager
+ARABIC_INVOICE_LABELS = {
+    "title": "فاتورة",
+    "customer_name": "اسم العميل",
+    "phone": "الهاتف",
+    "date": "التاريخ",
+    "payment_method": "طريقة الدفع",
+    "service": "الخدمة",
+    "price": "السعر",
+    "currency": "ل.س",
+    "total_amount": "المبلغ الإجمالي",
+    "amount_paid": "المبلغ المدفوع",
+    "amount_remaining": "المبلغ المتبقي",
+    "service_provider": "مقدم الخدمة",
+    "invoice_creator": "منشئ الفاتورة",
+    "cash": "نقدي",
+    "installment": "تقسيط"
+}
+
+ARABIC_REPORT_LABELS = {
+    "daily_title": "تقرير يومي",
+    "monthly_title": "تقرير شهري",
+    "yearly_title": "تقرير سنوي",
+    "page": "صفحة",
+    "invoice_id": "رقم الفاتورة",
+    "date": "التاريخ",
+    "customer_name": "اسم العميل",
+    "services": "الخدمات",
+    "amount_paid": "المبلغ المدفوع",
+    "currency": "ل.س",
+    "page_total": "مجموع الصفحة",
+    "total": "المجموع",
+    "invoice_count": "عدد الفواتير",
+    "generated_at": "تاريخ التقرير",
+    "revenue_title": "تقرير الإيرادات",
+    "total_amount": "المبلغ الإجمالي",
+    "amount_remaining": "المبلغ المتبقي",
+    "by_service": "الخدمة",
+    "by_service_provider": "مقدم الخدمة",
+    "by_invoice_creator": "منشئ الفاتورة",
+    "by_payment_method": "طريقة الدفع",
+    "by_day": "اليوم",
+    "by_week": "الأسبوع",
+    "by_month": "الشهر",
+    "cash": "نقدي",
+    "installment": "تقسيط"
+}
+
+# Static parts of every document; kept out of the compiled templates so CSS braces need no escaping
+DOCUMENT_STYLE = """
+        <html dir="rtl">
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .header { text-align: center; margin-bottom: 20px; }
+                .invoice-info { display: flex; justify-content: space-between; margin-bottom: 20px; }
+                .invoice-info div { width: 45%; }
+                table { width: 100%; border-collapse: collapse; margin-bottom: 20px; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: right; }
+                th { background-color: #f2f2f2; }
+                .total { text-align: left; font-weight: bold; }
+            </style>
+        </head>
+        <body>
+"""
+
+DOCUMENT_END = """
+        </body>
+        </html>
+"""
+
+# Template sources: $label placeholders are filled once at compile time,
+# {field} placeholders are filled by str.format on every render
+INVOICE_SOURCES = {
+    "head": """
+                <h2>$title #{id}</h2>
+            </div>
+            
+            <div class="invoice-info">
+                <div>
+                    <p><strong>$customer_name:</strong> {customer_name}</p>
+                    <p><strong>$phone:</strong> {customer_phone}</p>
+                </div>
+                <div>
+                    <p><strong>$date:</strong> {date}</p>
+                    <p><strong>$payment_method:</strong> {payment_method}</p>
+                </div>
+            </div>
+            
+            <table>
+                <tr>
+                    <th>#</th>
+                    <th>$service</th>
+                    <th>$price</th>
+                </tr>
+""",
+    "row": """
+                <tr>
+                    <td>{index}</td>
+                    <td>{name}</td>
+                    <td>{price:,.0f} $currency</td>
+                </tr>
+""",
+    "totals": """
+                <tr>
+                    <td colspan="2" class="total">$total_amount</td>
+                    <td>{total_amount:,.0f} $currency</td>
+                </tr>
+                <tr>
+                    <td colspan="2" class="total">$amount_paid</td>
+                    <td>{amount_paid:,.0f} $currency</td>
+                </tr>
+""",
+    "remaining": """
+                <tr>
+                    <td colspan="2" class="total">$amount_remaining</td>
+                    <td>{amount_remaining:,.0f} $currency</td>
+                </tr>
+""",
+    "footer": """
+            </table>
+            
+            <div>
+                <p><strong>$service_provider:</strong> {service_provider}</p>
+                <p><strong>$invoice_creator:</strong> {invoice_creator}</p>
+            </div>
+"""
+}
+
+# Report pages are rendered one at a time so long reports never exist as a single document
+REPORT_SOURCES = {
+    "head": """
+                <h2>{title} - {period}</h2>
+                <p>$page {page}</p>
+            </div>
+            
+            <table>
+                <tr>
+                    <th>#</th>
+                    <th>$invoice_id</th>
+                    <th>$date</th>
+                    <th>$customer_name</th>
+                    <th>$services</th>
+                    <th>$amount_paid</th>
+                </tr>
+""",
+    "row": """
+                <tr>
+                    <td>{index}</td>
+                    <td>{id}</td>
+                    <td>{date}</td>
+                    <td>{customer_name}</td>
+                    <td>{services}</td>
+                    <td>{amount_paid:,.0f} $currency</td>
+                </tr>
+""",
+    "page_total": """
+                <tr>
+                    <td colspan="5" class="total">$page_total</td>
+                    <td>{page_total:,.0f} $currency</td>
+                </tr>
+""",
+    "total": """
+                <tr>
+                    <td colspan="5" class="total">$total</td>
+                    <td>{total_revenue:,.0f} $currency</td>
+                </tr>
+""",
+    "summary": """
+            </table>
+            
+            <div>
+                <p><strong>$invoice_count:</strong> {invoice_count}</p>
+                <p><strong>$generated_at:</strong> {generated_at}</p>
+            </div>
+"""
+}
+
+# Grouped revenue reports (ReportEngine rows) fit one document; QTextDocument paginates it when printing
+REVENUE_REPORT_SOURCES = {
+    "head": """
+                <h2>{title} - {period}</h2>
+            </div>
+            
+            <table>
+                <tr>
+                    <th>{group_label}</th>
+                    <th>$invoice_count</th>
+                    <th>$total_amount</th>
+                    <th>$amount_paid</th>
+                    <th>$amount_remaining</th>
+                </tr>
+""",
+    "row": """
+                <tr>
+                    <td>{key}</td>
+                    <td>{invoice_count}</td>
+                    <td>{total_amount:,.0f} $currency</td>
+                    <td>{amount_paid:,.0f} $currency</td>
+                    <td>{amount_remaining:,.0f} $currency</td>
+                </tr>
+""",
+    "total": """
+                <tr>
+                    <td class="total">$total</td>
+                    <td>{invoice_count}</td>
+                    <td>{total_amount:,.0f} $currency</td>
+                    <td>{amount_paid:,.0f} $currency</td>
+                    <td>{amount_remaining:,.0f} $currency</td>
+                </tr>
+            </table>
+            
+            <div>
+                <p><strong>$generated_at:</strong> {generated_at}</p>
+            </div>
+"""
+}
+
+def invoice_labels(tr):
+    """Build invoice labels from a translation function (the tabs' and views' self.tr)."""
+    return {
+        "title": tr("invoices.title"),
+        "customer_name": tr("invoices.customer_name"),
+        "phone": tr("invoices.phone"),
+        "date": tr("invoices.date"),
+        "payment_method": tr("invoices.payment_method"),
+        "service": tr("services.name"),
+        "price": tr("services.price"),
+        "currency": tr("services.price_currency"),
+        "total_amount": tr("invoices.total_amount"),
+        "amount_paid": tr("invoices.amount_paid"),
+        "amount_remaining": tr("invoices.amount_remaining"),
+        "service_provider": tr("invoices.service_provider"),
+        "invoice_creator": tr("invoices.invoice_creator"),
+        "cash": tr("invoices.cash"),
+        "installment": tr("invoices.installment")
+    }
+
+class DocumentTemplates:
+    """Compiled invoice and report HTML templates shared by printing, PDF export and previews."""
+    
+    def __init__(self, settings=None):
+        self.settings = settings
+        self._compiled = {}
+        self._header_version = object()
+        self._header = None
+    
+    @property
+    def version(self):
+        """Version of the rendered output: the template sources plus the clinic settings."""
+        if not self.settings:
+            return (TEMPLATE_VERSION, None)
+        self.settings.reload_if_changed()
+        return (TEMPLATE_VERSION, self.settings.version)
+    
+    def clinic_header(self):
+        """The clinic header fragment, rebuilt only when the settings change."""
+        version = None
+        if self.settings:
+            self.settings.reload_if_changed()
+            version = self.settings.version
+        
+        if self._header is None or version != self._header_version:
+            info = dict(DEFAULT_CLINIC_INFO)
+            if self.settings:
+                for key in info:
+                    info[key] = self.settings.get_setting(f"clinic_info.{key}", info[key])
+            
+            self._header = (
+                DOCUMENT_STYLE
+                + '            <div class="header">\n'
+                + f"                <h1>{info['name']}</h1>\n"
+                + f"                <p>{info['address']}</p>\n"
+                + f"                <p>{info['phone']}</p>"
+            )
+            self._header_version = version
+        
+        return self._header
+    
+    def render_invoice(self, invoice, labels=None):
+        """Render an invoice to HTML."""
+        labels = labels or ARABIC_INVOICE_LABELS
+        template = self._compile("invoice", INVOICE_SOURCES, labels)
+        
+        payment_method = labels["cash"] if invoice["payment_method"] == "cash" else labels["installment"]
+        
+        parts = [
+            self.clinic_header(),
+            template["head"].format(
+                id=invoice["id"],
+                customer_name=invoice["customer_name"],
+                customer_phone=invoice["customer_phone"],
+                date=invoice["date"].split("T")[0],
+                payment_method=payment_method
+            )
+        ]
+        
+        row = template["row"].format
+        parts.extend(
+            row(index=i, name=service["name"], price=float(service["price"]) * service.get("quantity", 1))
+            for i, service in enumerate(invoice["services"], 1)
+        )
+        
+        parts.append(template["totals"].format(
+            total_amount=invoice["total_amount"],
+            amount_paid=invoice["amount_paid"]
+        ))
+        if invoice["amount_remaining"] > 0:
+            parts.append(template["remaining"].format(amount_remaining=invoice["amount_remaining"]))
+        
+        parts.append(template["footer"].format(
+            service_provider=invoice["service_provider"],
+            invoice_creator=invoice["invoice_creator"]
+        ))
+        parts.append(DOCUMENT_END)
+        
+        return "".join(parts)
+    
+    def iter_report_pages(self, title, period, invoices, rows_per_page=30, total_revenue=None, labels=None,
+                          fits=None):
+        """Yield the HTML of each report page for an iterable of invoices.
+        
+        Only one page of rows is held at a time. Every page ends with its subtotal;
+        the last page also carries the grand total and the invoice count.
+        
+        A page has at most rows_per_page rows. fits(html), if given, says whether a page
+        lays out on one sheet; rows that don't fit (long names wrap) move to the next page.
+        """
+        labels = labels or ARABIC_REPORT_LABELS
+        template = self._compile("report", REPORT_SOURCES, labels)
+        header = self.clinic_header()
+        
+        invoices = iter(invoices)
+        pending = deque()
+        page = 1
+        count = 0
+        revenue = 0
+        
+        while True:
+            # One row past the page, so the last page is known and can carry the summary
+            while len(pending) <= rows_per_page:
+                invoice = next(invoices, None)
+                if invoice is None:
+                    break
+                pending.append(invoice)
+            
+            rows = min(rows_per_page, len(pending))
+            while True:
+                last = rows == len(pending)
+                html, page_total = self._report_page(template, header, title, period, page, list(pending)[:rows],
+                                                     count, revenue, total_revenue, last)
+                if rows <= 1 or fits is None or fits(html):
+                    break
+                rows -= 1
+            
+            yield html
+            
+            if last:
+                return
+            
+            for _ in range(rows):
+                pending.popleft()
+            count += rows
+            revenue += page_total
+            page += 1
+    
+    def _report_page(self, template, header, title, period, page, page_rows, count, revenue, total_revenue, last):
+        """The HTML of one report page and its subtotal; rows are numbered on from count."""
+        row = template["row"].format
+        page_total = sum(invoice["amount_paid"] for invoice in page_rows)
+        
+        parts = [header, template["head"].format(title=title, period=period, page=page)]
+        parts.extend(
+            row(
+                index=i,
+                id=invoice["id"],
+                date=invoice["date"].split("T")[0],
+                customer_name=invoice["customer_name"],
+                services=", ".join(service["name"] for service in invoice["services"]),
+                amount_paid=invoice["amount_paid"]
+            )
+            for i, invoice in enumerate(page_rows, count + 1)
+        )
+        parts.append(template["page_total"].format(page_total=page_total))
+        
+        if last:
+            parts.append(template["total"].format(
+                total_revenue=revenue + page_total if total_revenue is None else total_revenue
+            ))
+            parts.append(template["summary"].format(
+                invoice_count=count + len(page_rows),
+                generated_at=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            ))
+        else:
+            parts.append("            </table>\n")
+        parts.append(DOCUMENT_END)
+        
+        return "".join(parts), page_total
+    
+    def render_revenue_report(self, title, period, grouping, rows, totals, labels=None):
+        """Render a grouped revenue report (ReportEngine.revenue_by rows and totals) to HTML."""
+        labels = labels or ARABIC_REPORT_LABELS
+        template = self._compile("revenue_report", REVENUE_REPORT_SOURCES, labels)
+        
+        parts = [
+            self.clinic_header(),
+            template["head"].format(title=title, period=period, group_label=labels[f"by_{grouping}"])
+        ]
+        
+        row = template["row"].format
+        for report_row in rows:
+            key = report_row["key"]
+            if grouping == "payment_method":
+                key = labels.get(key, key)
+            parts.append(row(**dict(report_row, key=key)))
+        
+        parts.append(template["total"].format(
+            generated_at=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **totals
+        ))
+        parts.append(DOCUMENT_END)
+        
+        return "".join(parts)
+    
+    def _compile(self, name, sources, labels):
+        """Fill the labels into a template's sources once per label set."""
+        key = (name, tuple(labels.items()))
+        if key not in self._compiled:
+            # Labels end up inside format strings, so their braces must be escaped
+            escaped = {
+                label: str(value).replace("{", "{{").replace("}", "}}")
+                for label, value in labels.items()
+            }
+            self._compiled[key] = {
+                part: Template(source).substitute(escaped)
+                for part, source in sources.items()
+            }
+        return self._compiled[key]
+
+_shared_templates = None
+
+def get_document_templates():
+    """The templates instance shared by the invoice tabs and views."""
+    global _shared_templates
+    if _shared_templates is None:
+        from config.settings import Settings
+        _shared_templates = DocumentTemplates(Settings())
+    return _shared_templates
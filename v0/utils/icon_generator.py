@@ -5,8 +5,8 @@ import os
 class IconGenerator:
     """Generates icons for the application."""
     
-    def __init__(self):
-        self.icons_dir = "resources/assets/icons"
+    def __init__(self, icons_dir="resources/assets/icons"):
+        self.icons_dir = icons_dir
         self._ensure_icons_dir()
     
     def _ensure_icons_dir(self):
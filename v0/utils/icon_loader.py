@@ -1,7 +1,23 @@
 import os
+import zipfile
 
 ICON_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'icons')
 
+# Every icon (plus the IconGenerator output) packed into one file by build_icons.py
+BUNDLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'icons.bundle')
+
+_icon_files = None
+
+def _available_icons():
+    """Names of the files in the icons directory, listed once."""
+    global _icon_files
+    if _icon_files is None:
+        try:
+            _icon_files = set(os.listdir(ICON_PATH))
+        except OSError:
+            _icon_files = set()
+    return _icon_files
+
 def load_icon(icon_name):
     """
     Load an icon by its name from the icons directory.
@@ -15,10 +31,112 @@ def load_icon(icon_name):
     Raises:
         FileNotFoundError: If the icon does not exist.
     """
-    icon_file = os.path.join(ICON_PATH, icon_name)
-    if not os.path.exists(icon_file):
+    if icon_name not in _available_icons():
         raise FileNotFoundError(f"Icon '{icon_name}' not found in {ICON_PATH}")
-    return icon_file
+    return os.path.join(ICON_PATH, icon_name)
+
+class IconRegistry:
+    """Loads each icon once and keeps the QIcon / QPixmap per name and size.
+    
+    Icon data comes from the bundle written by build_icons.py when it exists,
+    read with a single file open, and from the icons directory otherwise.
+    """
+    
+    def __init__(self, icons_dir=ICON_PATH, bundle_path=BUNDLE_PATH):
+        self.icons_dir = icons_dir
+        self.bundle_path = bundle_path
+        self._bundle = None
+        self._icons = {}
+        self._pixmaps = {}
+        self._missing = set()
+    
+    def icon(self, icon_name, size=None):
+        """The QIcon for an icon name ('add.png' or 'assets/icons/add.png'), optionally fixed to a size."""
+        from PyQt6.QtGui import QIcon
+        
+        icon_name = os.path.basename(icon_name)
+        key = (icon_name, size)
+        if key not in self._icons:
+            pixmap = self.pixmap(icon_name, size)
+            self._icons[key] = QIcon(pixmap) if not pixmap.isNull() else QIcon()
+        return self._icons[key]
+    
+    def pixmap(self, icon_name, size=None):
+        """The QPixmap for an icon name, scaled to size (a number or a (width, height) pair)."""
+        from PyQt6.QtGui import QPixmap
+        from PyQt6.QtCore import Qt
+        
+        icon_name = os.path.basename(icon_name)
+        key = (icon_name, size)
+        if key in self._pixmaps:
+            return self._pixmaps[key]
+        
+        if size is None:
+            pixmap = QPixmap()
+            data = self._read(icon_name)
+            if data is not None:
+                pixmap.loadFromData(data)
+        else:
+            width, height = (size, size) if isinstance(size, int) else size
+            pixmap = self.pixmap(icon_name)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(
+                    width, height,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+        
+        self._pixmaps[key] = pixmap
+        return pixmap
+    
+    def has_icon(self, icon_name):
+        icon_name = os.path.basename(icon_name)
+        return icon_name in self._load_bundle() or os.path.isfile(os.path.join(self.icons_dir, icon_name))
+    
+    def clear(self):
+        self._bundle = None
+        self._icons.clear()
+        self._pixmaps.clear()
+        self._missing.clear()
+    
+    def _load_bundle(self):
+        """Read the whole bundle into memory on first use ({} if there is none)."""
+        if self._bundle is None:
+            self._bundle = {}
+            try:
+                with zipfile.ZipFile(self.bundle_path) as bundle:
+                    self._bundle = {name: bundle.read(name) for name in bundle.namelist()}
+            except (OSError, zipfile.BadZipFile):
+                pass
+        return self._bundle
+    
+    def _read(self, icon_name):
+        bundle = self._load_bundle()
+        if icon_name in bundle:
+            return bundle[icon_name]
+        
+        try:
+            with open(os.path.join(self.icons_dir, icon_name), 'rb') as f:
+                return f.read()
+        except OSError:
+            # Warn once per icon; callers get an empty icon
+            if icon_name not in self._missing:
+                self._missing.add(icon_name)
+                print(f"Warning: Icon '{icon_name}' not found.")
+            return None
+
+_shared_registry = None
+
+def get_icon_registry():
+    """The icon registry shared by every window."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = IconRegistry()
+    return _shared_registry
+
+def get_icon(icon_name, size=None):
+    """Shortcut for get_icon_registry().icon(icon_name, size)."""
+    return get_icon_registry().icon(icon_name, size)
 
 # Example usage
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 import json
 import os
 from PyQt6.QtCore import pyqtSignal, QObject
+from utils.translation_loader import TranslationLoader
 
 class LanguageManager(QObject):
     language_changed = pyqtSignal()  # Signal emitted when language changes
@@ -12,28 +13,26 @@ class LanguageManager(QObject):
         self.translations_dir = "data/translations"
         self.ensure_translations_dir()
         self.load_translations()
+        
+        # The current language is cached and only re-read when set_language changes it
+        self.refresh_current_language()
     
     def ensure_translations_dir(self):
         os.makedirs(self.translations_dir, exist_ok=True)
     
     def load_translations(self):
-        self.translations = {}
-        
-        # Load Arabic translations
-        ar_file = os.path.join(self.translations_dir, "ar.json")
-        if not os.path.exists(ar_file):
-            self.create_default_arabic_translations(ar_file)
-        
-        with open(ar_file, 'r', encoding='utf-8') as f:
-            self.translations["ar"] = json.load(f)
-        
-        # Load English translations
-        en_file = os.path.join(self.translations_dir, "en.json")
-        if not os.path.exists(en_file):
-            self.create_default_english_translations(en_file)
-        
-        with open(en_file, 'r', encoding='utf-8') as f:
-            self.translations["en"] = json.load(f)
+        # Compiled flat tables, cached on disk; a language is loaded when it is first used
+        self.loader = TranslationLoader(self.translations_dir, self.create_default_translations)
+    
+    def refresh_current_language(self):
+        self.current_language = self.settings.get_setting("language", "ar")
+        self.current_texts, self.current_icons = self.loader.load(self.current_language)
+    
+    def create_default_translations(self, language, file_path):
+        if language == "ar":
+            self.create_default_arabic_translations(file_path)
+        elif language == "en":
+            self.create_default_english_translations(file_path)
     
     def create_default_arabic_translations(self, file_path):
         translations = {
@@ -366,11 +365,12 @@ class LanguageManager(QObject):
             json.dump(translations, f, ensure_ascii=False, indent=4)
     
     def get_current_language(self):
-        return self.settings.get_setting("language", "ar")
+        return self.current_language
     
     def set_language(self, language_code, force_refresh=False):
-        if language_code in self.translations:
+        if self.loader.supports(language_code):
             self.settings.set_setting("language", language_code)
+            self.refresh_current_language()
             self.apply_language()
             self.language_changed.emit()  # Notify listeners of language change
             if force_refresh:
@@ -398,20 +398,11 @@ class LanguageManager(QObject):
             default: Default value if key not found
             return_icon: If True, returns icon path instead of text
         """
-        language = self.get_current_language()
-        translations = self.translations.get(language, {})
+        if return_icon and key in self.current_icons:
+            return self.current_icons[key]
         
-        keys = key.split('.')
-        value = translations
-        
-        for k in keys:
-            if k in value:
-                value = value[k]
-            else:
-                return default if default is not None else key
-
-        # Handle new icon format
-        if isinstance(value, dict) and 'text' in value:
-            return value['icon'] if return_icon else value['text']
+        value = self.current_texts.get(key)
+        if value is None:
+            return default if default is not None else key
         
         return value
@@ -0,0 +1,219 @@
+# utils/page_preview.py
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QScrollArea)
+from PyQt6.QtGui import QTextDocument, QImage, QPainter, QPixmap, QGuiApplication, QPageSize
+from PyQt6.QtCore import Qt, QSizeF, QRectF
+from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
+
+# A4 in points (1/72 inch)
+A4_WIDTH_POINTS = 595
+A4_HEIGHT_POINTS = 842
+
+def screen_dpi():
+    """Logical DPI of the primary screen (96 if there is no screen)."""
+    screen = QGuiApplication.primaryScreen()
+    return screen.logicalDotsPerInch() if screen else 96
+
+def printer_page_size(printer):
+    """The printable area of a page, in the printer's device pixels."""
+    page_rect = printer.pageRect(QPrinter.Unit.DevicePixel)
+    return QSizeF(page_rect.width(), page_rect.height())
+
+def html_page(html, page_size, paint_device=None):
+    """A QTextDocument of page HTML laid out on page_size pages (for paint_device, if given)."""
+    document = QTextDocument()
+    if paint_device is not None:
+        document.documentLayout().setPaintDevice(paint_device)
+    document.setPageSize(page_size)
+    document.setHtml(html)
+    return document
+
+def page_fits(page_size, paint_device=None):
+    """fits(html) for DocumentTemplates.iter_report_pages: whether html lays out on one page."""
+    return lambda html: html_page(html, page_size, paint_device).pageCount() == 1
+
+def print_html_pages(printer, pages):
+    """Print page HTML strings one page at a time, each laid out at the printer's resolution.
+    
+    Only the first page of each document is printed, so each must fit on one (see page_fits).
+    """
+    page_size = printer_page_size(printer)
+    
+    painter = QPainter(printer)
+    try:
+        for page_number, html in enumerate(pages):
+            if page_number:
+                printer.newPage()
+            document = html_page(html, page_size, printer)
+            document.drawContents(painter, QRectF(0, 0, page_size.width(), page_size.height()))
+    finally:
+        painter.end()
+
+class PagePreview(ABC):
+    """Renders pages to QImages at screen resolution, one page at a time, keeping the last few.
+    
+    Subclasses say which pages exist, draw one page and print them all.
+    """
+    
+    def __init__(self, dpi=None, max_images=8):
+        self.dpi = dpi or screen_dpi()
+        self.page_width = round(A4_WIDTH_POINTS * self.dpi / 72)
+        self.page_height = round(A4_HEIGHT_POINTS * self.dpi / 72)
+        self.max_images = max_images
+        self._images = OrderedDict()
+    
+    @abstractmethod
+    def has_page(self, index):
+        """Whether a page with this index exists."""
+    
+    def page_image(self, index):
+        """Get the image of a page, rendering it on first use."""
+        if index in self._images:
+            self._images.move_to_end(index)
+            return self._images[index]
+        
+        image = QImage(self.page_width, self.page_height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.white)
+        
+        painter = QPainter(image)
+        try:
+            self._draw_page(index, painter)
+        finally:
+            painter.end()
+        
+        self._images[index] = image
+        while len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        
+        return image
+    
+    @abstractmethod
+    def print(self, printer):
+        """Print every page at the printer's (high) resolution."""
+    
+    @abstractmethod
+    def _draw_page(self, index, painter):
+        """Draw a page onto a white page_width x page_height image."""
+
+class DocumentPagePreview(PagePreview):
+    """Preview of a single QTextDocument (e.g. an invoice) split into A4 pages."""
+    
+    def __init__(self, document, dpi=None, max_images=8):
+        super().__init__(dpi, max_images)
+        # Work on a copy so the caller's (possibly cached) layout is left alone
+        self.source = document
+        self.document = document.clone()
+        self.document.setPageSize(QSizeF(self.page_width, self.page_height))
+    
+    def has_page(self, index):
+        return 0 <= index < self.document.pageCount()
+    
+    def print(self, printer):
+        self.source.print(printer)
+    
+    def _draw_page(self, index, painter):
+        top = index * self.page_height
+        painter.translate(0, -top)
+        self.document.drawContents(painter, QRectF(0, top, self.page_width, self.page_height))
+
+class HtmlPagesPreview(PagePreview):
+    """Preview of a report given as page HTML, pulled only as far as the user pages.
+    
+    pages(fits) returns a fresh iterator of page HTML, each page fitting on one sheet by
+    fits(html); it is called once for the screen and again, paginated for the printer,
+    when printing.
+    """
+    
+    def __init__(self, pages, dpi=None, max_images=8):
+        super().__init__(dpi, max_images)
+        self.pages = pages
+        self._pages = iter(pages(page_fits(self.page_size())))
+        self._html = []
+        self._exhausted = False
+    
+    def page_size(self):
+        return QSizeF(self.page_width, self.page_height)
+    
+    def has_page(self, index):
+        while index >= len(self._html) and not self._exhausted:
+            try:
+                self._html.append(next(self._pages))
+            except StopIteration:
+                self._exhausted = True
+        return 0 <= index < len(self._html)
+    
+    def print(self, printer):
+        print_html_pages(printer, self.pages(page_fits(printer_page_size(printer), printer)))
+    
+    def _draw_page(self, index, painter):
+        self.has_page(index)
+        document = html_page(self._html[index], self.page_size())
+        document.drawContents(painter, QRectF(0, 0, self.page_width, self.page_height))
+
+class PagePreviewDialog(QDialog):
+    """Shows a PagePreview page by page; only printing uses a high-resolution printer."""
+    
+    def __init__(self, preview, translate, parent=None):
+        super().__init__(parent)
+        self.preview = preview
+        self.tr = translate
+        self.page = 0
+        
+        self.setWindowTitle(self.tr("invoices.print"))
+        self.resize(self.preview.page_width + 60, min(self.preview.page_height + 100, 900))
+        
+        self.setup_ui()
+        self.show_page(0)
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        scroll_area = QScrollArea()
+        scroll_area.setWidget(self.page_label)
+        scroll_area.setWidgetResizable(True)
+        layout.addWidget(scroll_area)
+        
+        buttons_layout = QHBoxLayout()
+        
+        self.previous_button = QPushButton(self.tr("common.previous"))
+        self.previous_button.clicked.connect(lambda: self.show_page(self.page - 1))
+        buttons_layout.addWidget(self.previous_button)
+        
+        self.page_number_label = QLabel()
+        self.page_number_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        buttons_layout.addWidget(self.page_number_label)
+        
+        self.next_button = QPushButton(self.tr("common.next"))
+        self.next_button.clicked.connect(lambda: self.show_page(self.page + 1))
+        buttons_layout.addWidget(self.next_button)
+        
+        self.print_button = QPushButton(self.tr("invoices.print"))
+        self.print_button.clicked.connect(self.print_pages)
+        buttons_layout.addWidget(self.print_button)
+        
+        layout.addLayout(buttons_layout)
+    
+    def show_page(self, index):
+        if not self.preview.has_page(index):
+            return
+        
+        self.page = index
+        self.page_label.setPixmap(QPixmap.fromImage(self.preview.page_image(index)))
+        self.page_number_label.setText(f"{self.tr('common.page')} {index + 1}")
+        
+        self.previous_button.setEnabled(index > 0)
+        self.next_button.setEnabled(self.preview.has_page(index + 1))
+    
+    def print_pages(self):
+        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        
+        dialog = QPrintDialog(printer, self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.preview.print(printer)
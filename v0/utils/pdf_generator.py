@@ -4,122 +4,26 @@ from PyQt6.QtPrintSupport import QPrinter
 from PyQt6.QtCore import QSizeF, Qt
 import os
 import datetime
+from utils.document_templates import DocumentTemplates, ARABIC_REPORT_LABELS
+from utils.page_preview import HtmlPagesPreview, print_html_pages, page_fits, printer_page_size
+from utils.tracing import traced
+from utils.profiling import profiled
+
+# Most rows on a report page; about as many one-line rows as fit on A4. Pages are still
+# measured, and rows that wrap push the last ones to the next page
+REPORT_ROWS_PER_PAGE = 25
 
 class PDFGenerator:
     """Generates PDF files for invoices and reports."""
     
     def __init__(self, settings=None):
         self.settings = settings
+        self.templates = DocumentTemplates(settings)
     
+    @traced(category="pdf")
     def generate_invoice_pdf(self, invoice, output_path=None):
         """Generate a PDF for an invoice."""
-        # Get clinic info from settings
-        clinic_name = "مركز جوزيل للتجميل"
-        clinic_phone = "+963956961395"
-        clinic_address = "سوريا - ريف دمشق التل موقف طيبة مقابل امركز الثقافي الجديد"
-        
-        if self.settings:
-            clinic_name = self.settings.get_setting("clinic_info.name", clinic_name)
-            clinic_phone = self.settings.get_setting("clinic_info.phone", clinic_phone)
-            clinic_address = self.settings.get_setting("clinic_info.address", clinic_address)
-        
-        # Format date
-        date_str = invoice["date"]
-        if "T" in date_str:
-            date_str = date_str.split("T")[0]
-        
-        # Format payment method
-        if invoice["payment_method"] == "cash":
-            payment_method = "نقدي"
-        else:
-            payment_method = "تقسيط"
-        
-        # Generate HTML
-        html = f"""
-        <html dir="rtl">
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ text-align: center; margin-bottom: 20px; }}
-                .invoice-info {{ display: flex; justify-content: space-between; margin-bottom: 20px; }}
-                .invoice-info div {{ width: 45%; }}
-                table {{ width: 100%; border-collapse: collapse; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: right; }}
-                th {{ background-color: #f2f2f2; }}
-                .total {{ text-align: left; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{clinic_name}</h1>
-                <p>{clinic_address}</p>
-                <p>{clinic_phone}</p>
-                <h2>فاتورة #{invoice["id"]}</h2>
-            </div>
-            
-            <div class="invoice-info">
-                <div>
-                    <p><strong>اسم العميل:</strong> {invoice["customer_name"]}</p>
-                    <p><strong>الهاتف:</strong> {invoice["customer_phone"]}</p>
-                </div>
-                <div>
-                    <p><strong>التاريخ:</strong> {date_str}</p>
-                    <p><strong>طريقة الدفع:</strong> {payment_method}</p>
-                </div>
-            </div>
-            
-            <table>
-                <tr>
-                    <th>#</th>
-                    <th>الخدمة</th>
-                    <th>السعر</th>
-                </tr>
-        """
-        
-        # Add services
-        for i, service in enumerate(invoice["services"]):
-            price = service["price"]
-            quantity = service.get("quantity", 1)
-            total_price = price * quantity
-            
-            html += f"""
-                <tr>
-                    <td>{i+1}</td>
-                    <td>{service["name"]}</td>
-                    <td>{total_price:,.0f} ل.س</td>
-                </tr>
-            """
-        
-        # Add totals
-        html += f"""
-                <tr>
-                    <td colspan="2" class="total">المبلغ الإجمالي</td>
-                    <td>{invoice["total_amount"]:,.0f} ل.س</td>
-                </tr>
-                <tr>
-                    <td colspan="2" class="total">المبلغ المدفوع</td>
-                    <td>{invoice["amount_paid"]:,.0f} ل.س</td>
-                </tr>
-        """
-        
-        if invoice["amount_remaining"] > 0:
-            html += f"""
-                <tr>
-                    <td colspan="2" class="total">المبلغ المتبقي</td>
-                    <td>{invoice["amount_remaining"]:,.0f} ل.س</td>
-                </tr>
-            """
-        
-        html += f"""
-            </table>
-            
-            <div>
-                <p><strong>مقدم الخدمة:</strong> {invoice["service_provider"]}</p>
-                <p><strong>منشئ الفاتورة:</strong> {invoice["invoice_creator"]}</p>
-            </div>
-        </body>
-        </html>
-        """
+        html = self.templates.render_invoice(invoice)
         
         # Create PDF
         document = QTextDocument()
@@ -141,105 +45,111 @@ class PDFGenerator:
         printer.setOutputFileName(output_path)
         
         # Print document to PDF
-        document.print_(printer)
+        document.print(printer)
         
         return output_path
     
-    def generate_daily_report_pdf(self, date, invoices, total_revenue, output_path=None):
-        """Generate a PDF for a daily report."""
-        # Get clinic info from settings
-        clinic_name = "مركز جوزيل للتجميل"
-        clinic_phone = "+963956961395"
-        clinic_address = "سوريا - ريف دمشق التل موقف طيبة مقابل امركز الثقافي الجديد"
-        
-        if self.settings:
-            clinic_name = self.settings.get_setting("clinic_info.name", clinic_name)
-            clinic_phone = self.settings.get_setting("clinic_info.phone", clinic_phone)
-            clinic_address = self.settings.get_setting("clinic_info.address", clinic_address)
-        
-        # Format date
+    def generate_daily_report_pdf(self, date, invoices, total_revenue=None, output_path=None):
+        """Generate a PDF for a daily report.
+        
+        invoices can be any iterable, e.g. InvoicesModel.iter_invoices_by_date_range.
+        """
         date_str = date.strftime("%Y-%m-%d")
         
-        # Generate HTML
-        html = f"""
-        <html dir="rtl">
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ text-align: center; margin-bottom: 20px; }}
-                table {{ width: 100%; border-collapse: collapse; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: right; }}
-                th {{ background-color: #f2f2f2; }}
-                .total {{ text-align: left; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{clinic_name}</h1>
-                <p>{clinic_address}</p>
-                <p>{clinic_phone}</p>
-                <h2>تقرير يومي - {date_str}</h2>
-            </div>
-            
-            <table>
-                <tr>
-                    <th>#</th>
-                    <th>رقم الفاتورة</th>
-                    <th>اسم العميل</th>
-                    <th>الخدمات</th>
-                    <th>المبلغ المدفوع</th>
-                </tr>
+        if not output_path:
+            output_path = f"reports/daily_report_{date_str}.pdf"
+        
+        return self.generate_report_pdf(ARABIC_REPORT_LABELS["daily_title"], date_str, invoices,
+                                        output_path, total_revenue)
+    
+    def generate_monthly_report_pdf(self, year, month, invoices, output_path=None):
+        """Generate a PDF for a monthly report from an iterable of invoices."""
+        period = f"{year:04d}-{month:02d}"
+        
+        if not output_path:
+            output_path = f"reports/monthly_report_{period}.pdf"
+        
+        return self.generate_report_pdf(ARABIC_REPORT_LABELS["monthly_title"], period, invoices, output_path)
+    
+    def generate_yearly_report_pdf(self, year, invoices, output_path=None):
+        """Generate a PDF for a yearly report from an iterable of invoices."""
+        period = f"{year:04d}"
+        
+        if not output_path:
+            output_path = f"reports/yearly_report_{period}.pdf"
+        
+        return self.generate_report_pdf(ARABIC_REPORT_LABELS["yearly_title"], period, invoices, output_path)
+    
+    @profiled()
+    @traced(category="pdf")
+    def generate_report_pdf(self, title, period, invoices, output_path, total_revenue=None):
+        """Lay out and print a report one page at a time.
+        
+        Each page is its own small QTextDocument, so memory stays flat no matter
+        how many invoices the report covers.
         """
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
         
-        # Add invoices
-        for i, invoice in enumerate(invoices):
-            services = ", ".join([service["name"] for service in invoice["services"]])
-            
-            html += f"""
-                <tr>
-                    <td>{i+1}</td>
-                    <td>{invoice["id"]}</td>
-                    <td>{invoice["customer_name"]}</td>
-                    <td>{services}</td>
-                    <td>{invoice["amount_paid"]:,.0f} ل.س</td>
-                </tr>
-            """
-        
-        # Add total
-        html += f"""
-                <tr>
-                    <td colspan="4" class="total">المجموع</td>
-                    <td>{total_revenue:,.0f} ل.س</td>
-                </tr>
-            </table>
-            
-            <div>
-                <p><strong>عدد الفواتير:</strong> {len(invoices)}</p>
-                <p><strong>تاريخ التقرير:</strong> {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-            </div>
-        </body>
-        </html>
+        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
+        printer.setOutputFileName(output_path)
+        
+        print_html_pages(printer, self.templates.iter_report_pages(
+            title, period, invoices, REPORT_ROWS_PER_PAGE, total_revenue,
+            fits=page_fits(printer_page_size(printer), printer)
+        ))
+        
+        return output_path
+    
+    @profiled()
+    @traced(category="pdf")
+    def generate_revenue_report_pdf(self, report_engine, grouping, start_date, end_date, output_path=None,
+                                    labels=None):
+        """Generate a PDF of revenue grouped by service, provider, creator, payment method or period.
+        
+        The figures come from report_engine (a ReportEngine), so a report that is already
+        cached, e.g. the one shown in the reports tab, isn't computed again.
         """
+        labels = labels or ARABIC_REPORT_LABELS
+        period = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+        
+        if not output_path:
+            output_path = (f"reports/revenue_by_{grouping}_{start_date.strftime('%Y-%m-%d')}_"
+                           f"{end_date.strftime('%Y-%m-%d')}.pdf")
+        
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        html = self.templates.render_revenue_report(
+            labels["revenue_title"], period, grouping,
+            report_engine.revenue_by(grouping, start_date, end_date),
+            report_engine.totals(start_date, end_date),
+            labels
+        )
         
-        # Create PDF
         document = QTextDocument()
         document.setHtml(html)
         
         printer = QPrinter(QPrinter.PrinterMode.HighResolution)
         printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
         printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-        
-        # Set output path
-        if not output_path:
-            # Create output directory if it doesn't exist
-            os.makedirs("reports", exist_ok=True)
-            
-            # Generate filename
-            output_path = f"reports/daily_report_{date_str}.pdf"
-        
         printer.setOutputFileName(output_path)
         
-        # Print document to PDF
-        document.print_(printer)
+        document.print(printer)
         
         return output_path
+    
+    @profiled()
+    def report_preview(self, title, period, get_invoices):
+        """Screen-resolution preview of a report, rendered lazily page by page.
+        
+        get_invoices returns a fresh iterable of invoices; it is called again when printing.
+        """
+        def pages(fits):
+            return self.templates.iter_report_pages(title, period, get_invoices(), REPORT_ROWS_PER_PAGE, fits=fits)
+        
+        return HtmlPagesPreview(pages)
@@ -0,0 +1,115 @@
+# utils/profiling.py
+import os
+import io
+import time
+import pstats
+import cProfile
+import functools
+from contextlib import contextmanager
+
+from utils.tracing import positional_limit
+
+PROFILE_DIR = "logs/profiles"
+
+# Functions listed in each summary, by cumulative time
+SUMMARY_LINES = 30
+
+class ActionProfiler:
+    """cProfile sessions for startup and user actions, one .pstats file (plus a summary) each.
+    
+    Only one profile runs at a time; an action started while another is being
+    profiled is simply part of the outer profile.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = None
+        self._count = 0
+        self._active = None
+        self._active_name = None
+    
+    def enable(self, output_dir=None):
+        """Start a profiling session; files go to a new timestamped directory."""
+        self.enabled = True
+        self.output_dir = output_dir or os.path.join(PROFILE_DIR, time.strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(self.output_dir, exist_ok=True)
+    
+    def begin(self, name):
+        """Start profiling under name, unless disabled or a profile is already running."""
+        if not self.enabled or self._active is not None:
+            return False
+        
+        self._active = cProfile.Profile()
+        self._active_name = name
+        self._active.enable()
+        return True
+    
+    def end(self, name):
+        """Stop the profile started under name and save it; returns the .pstats path."""
+        if self._active is None or self._active_name != name:
+            return None
+        
+        profile = self._active
+        profile.disable()
+        self._active = None
+        self._active_name = None
+        return self.save(name, profile)
+    
+    @contextmanager
+    def profile(self, name):
+        started = self.begin(name)
+        try:
+            yield
+        finally:
+            if started:
+                self.end(name)
+    
+    def profiled(self, name=None):
+        """Decorator profiling every call of a function as its own action.
+        
+        For discrete actions (a tab switch, an export); every call saves a file, so not
+        for slots that run on each keystroke.
+        """
+        def decorator(func):
+            action_name = name or func.__qualname__
+            limit = positional_limit(func)
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # Signal arguments the function doesn't take, as in Tracer.traced
+                if limit is not None and len(args) > limit:
+                    args = args[:limit]
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.profile(action_name):
+                    return func(*args, **kwargs)
+            
+            return wrapper
+        return decorator
+    
+    def save(self, name, profile):
+        self._count += 1
+        base = os.path.join(self.output_dir, f"{self._count:03d}_{name.replace('.', '_')}")
+        
+        stats_path = base + ".pstats"
+        profile.dump_stats(stats_path)
+        
+        summary = io.StringIO()
+        stats = pstats.Stats(profile, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write(f"{name}\n")
+            f.write(summary.getvalue())
+        
+        print(f"Profile saved: {stats_path} ({stats.total_tt * 1000:.0f} ms)")
+        return stats_path
+
+_shared_profiler = ActionProfiler()
+
+def get_profiler():
+    """The action profiler shared by the whole process."""
+    return _shared_profiler
+
+def profiled(name=None):
+    """Shortcut for get_profiler().profiled(...)."""
+    return _shared_profiler.profiled(name)
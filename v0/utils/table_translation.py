@@ -0,0 +1,62 @@
+# utils/table_translation.py
+from PyQt6.QtCore import QObject, QEvent
+
+class VisibleRowTranslator(QObject):
+    """Rewrites the language-dependent cells of a QTableWidget's rows as they come into view.
+    
+    retranslate() rewrites the rows in the viewport right away and leaves the others to
+    be rewritten when scrolling or resizing shows them, so a language switch costs the
+    visible rows, not all the loaded ones. Call reset() after the table is repopulated.
+    """
+    
+    def __init__(self, table, get_rows, translated_cells):
+        super().__init__(table)
+        self.table = table
+        # get_rows() returns the loaded rows in table order; translated_cells(row) their
+        # (column, text) pairs in the current language
+        self.get_rows = get_rows
+        self.translated_cells = translated_cells
+        self._done = None
+        
+        table.verticalScrollBar().valueChanged.connect(self._translate_visible)
+        table.viewport().installEventFilter(self)
+    
+    def reset(self):
+        """Every row's cells were just written in the current language."""
+        self._done = None
+    
+    def retranslate(self):
+        self._done = set()
+        self._translate_visible()
+    
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Resize:
+            self._translate_visible()
+        return False
+    
+    def visible_rows(self):
+        """First and last row in the viewport (-1, -1 for an empty table)."""
+        count = self.table.rowCount()
+        if not count:
+            return -1, -1
+        first = self.table.rowAt(0)
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        return (0 if first < 0 else first), (count - 1 if last < 0 else last)
+    
+    def _translate_visible(self, *args):
+        if self._done is None:
+            return
+        
+        rows = self.get_rows()
+        first, last = self.visible_rows()
+        for i in range(max(first, 0), min(last + 1, len(rows))):
+            if i in self._done:
+                continue
+            for column, text in self.translated_cells(rows[i]):
+                item = self.table.item(i, column)
+                if item is not None:
+                    item.setText(text)
+            self._done.add(i)
+        
+        if len(self._done) >= len(rows):
+            self._done = None
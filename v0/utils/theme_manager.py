@@ -1,30 +1,51 @@
 # utils/theme_manager.py
+import os
+from string import Template
+
 from PyQt6.QtGui import QPalette, QColor
 from PyQt6.QtCore import Qt
 
+STYLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "styles")
+
+# Stylesheets are built from the theme's own file followed by the shared one
+SHARED_STYLESHEET = "shared.qss"
+
 class ThemeManager:
-    def __init__(self, settings):
+    def __init__(self, settings, styles_dir=STYLES_DIR):
         self.settings = settings
+        self.styles_dir = styles_dir
         self.themes = {
             "light": {
                 "primary": "#FF69B4",  # Pink
                 "secondary": "#FFFFFF",  # White
                 "background": "#F5F5F5",
                 "text": "#333333",
-                "accent": "#FF1493"  # Deep Pink
+                "accent": "#FF1493",  # Deep Pink
+                "border": "#DDDDDD",
+                "hover": "#F0F0F0"
             },
             "dark": {
                 "primary": "#9370DB",  # Medium Purple
                 "secondary": "#333333",  # Dark Gray
                 "background": "#1E1E1E",
                 "text": "#FFFFFF",
-                "accent": "#FF00FF"  # Magenta
+                "accent": "#FF00FF",  # Magenta
+                "border": "#3D3D3D",
+                "hover": "#2D2D2D"
             }
         }
+        
+        # QSS sources are read once; compiled stylesheets and palettes are kept per theme
+        self._sources = {}
+        self._stylesheets = {}
+        self._palettes = {}
     
-    def get_current_theme(self):
+    def get_current_theme_name(self):
         theme_name = self.settings.get_setting("theme", "light")
-        return self.themes[theme_name]
+        return theme_name if theme_name in self.themes else "light"
+    
+    def get_current_theme(self):
+        return self.themes[self.get_current_theme_name()]
     
     def set_theme(self, theme_name, force_refresh=False):
         if theme_name in self.themes:
@@ -39,162 +60,82 @@ class ThemeManager:
     def apply_theme(self):
         from PyQt6.QtWidgets import QApplication
         
-        theme = self.get_current_theme()
         app = QApplication.instance()
         
         if not app:
             return
         
-        palette = QPalette()
-        
-        # Set window background
-        palette.setColor(QPalette.ColorRole.Window, QColor(theme["background"]))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(theme["text"]))
-        
-        # Set base colors (for input fields, etc.)
-        palette.setColor(QPalette.ColorRole.Base, QColor(theme["secondary"]))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(theme["background"]))
-        
-        # Set text colors
-        palette.setColor(QPalette.ColorRole.Text, QColor(theme["text"]))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(theme["accent"]))
-        
-        # Set button colors
-        palette.setColor(QPalette.ColorRole.Button, QColor(theme["primary"]))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(theme["secondary"]))
+        theme_name = self.get_current_theme_name()
         
-        # Set highlight colors
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(theme["accent"]))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(theme["secondary"]))
+        # Setting either one re-polishes every widget, so skip them when nothing changed
+        palette = self.get_palette(theme_name)
+        if app.palette() != palette:
+            app.setPalette(palette)
         
-        # Set link colors
-        palette.setColor(QPalette.ColorRole.Link, QColor(theme["accent"]))
-        palette.setColor(QPalette.ColorRole.LinkVisited, QColor(theme["primary"]))
-        
-        # Apply the palette
-        app.setPalette(palette)
-        
-        # Apply stylesheet for additional styling
-        self._apply_stylesheet(theme)
+        stylesheet = self.get_stylesheet(theme_name)
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
     
-    def _apply_stylesheet(self, theme):
-        from PyQt6.QtWidgets import QApplication
-        
-        app = QApplication.instance()
-        
-        if not app:
-            return
-        
-        # Create a stylesheet with the theme colors
-        stylesheet = f"""
-        QMainWindow, QDialog {{
-            background-color: {theme["background"]};
-            color: {theme["text"]};
-        }}
-        
-        QPushButton {{
-            background-color: {theme["primary"]};
-            color: {theme["secondary"]};
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-        }}
-        
-        QPushButton:hover {{
-            background-color: {theme["accent"]};
-        }}
-        
-        QPushButton:pressed {{
-            background-color: {theme["primary"]};
-        }}
-        
-        QLineEdit, QTextEdit, QComboBox, QSpinBox, QDateEdit, QTimeEdit {{
-            background-color: {theme["secondary"]};
-            color: {theme["text"]};
-            border: 1px solid {theme["primary"]};
-            border-radius: 4px;
-            padding: 4px;
-        }}
-        
-        QLineEdit:focus, QTextEdit:focus, QComboBox:focus, QSpinBox:focus, QDateEdit:focus, QTimeEdit:focus {{
-            border: 2px solid {theme["accent"]};
-        }}
-        
-        QTableWidget {{
-            background-color: {theme["secondary"]};
-            color: {theme["text"]};
-            gridline-color: {theme["primary"]};
-            selection-background-color: {theme["accent"]};
-            selection-color: {theme["secondary"]};
-        }}
-        
-        QHeaderView::section {{
-            background-color: {theme["primary"]};
-            color: {theme["secondary"]};
-            padding: 4px;
-            border: 1px solid {theme["secondary"]};
-        }}
-        
-        QCalendarWidget QToolButton {{
-            background-color: {theme["primary"]};
-            color: {theme["secondary"]};
-        }}
-        
-        QCalendarWidget QMenu {{
-            background-color: {theme["secondary"]};
-            color: {theme["text"]};
-        }}
-        
-        QCalendarWidget QSpinBox {{
-            background-color: {theme["secondary"]};
-            color: {theme["text"]};
-        }}
-        
-        QCalendarWidget QAbstractItemView:enabled {{
-            background-color: {theme["secondary"]};
-            color: {theme["text"]};
-        }}
-        
-        QCalendarWidget QAbstractItemView:disabled {{
-            color: gray;
-        }}
-        
-        QTabWidget::pane {{
-            border: 1px solid {theme["primary"]};
-            background-color: {theme["background"]};
-        }}
-        
-        QTabBar::tab {{
-            background-color: {theme["background"]};
-            color: {theme["text"]};
-            border: 1px solid {theme["primary"]};
-            padding: 6px 12px;
-            margin-right: 2px;
-        }}
-        
-        QTabBar::tab:selected {{
-            background-color: {theme["primary"]};
-            color: {theme["secondary"]};
-        }}
-        
-        QTabBar::tab:hover {{
-            background-color: {theme["accent"]};
-            color: {theme["secondary"]};
-        }}
-        
-        QGroupBox {{
-            border: 1px solid {theme["primary"]};
-            border-radius: 4px;
-            margin-top: 8px;
-            font-weight: bold;
-        }}
-        
-        QGroupBox::title {{
-            subcontrol-origin: margin;
-            subcontrol-position: top center;
-            padding: 0 5px;
-            color: {theme["text"]};
-        }}
-        """
-        
-        app.setStyleSheet(stylesheet)
+    def get_palette(self, theme_name):
+        """The palette for a theme, built on first use."""
+        if theme_name not in self._palettes:
+            theme = self.themes[theme_name]
+            palette = QPalette()
+            
+            # Set window background
+            palette.setColor(QPalette.ColorRole.Window, QColor(theme["background"]))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(theme["text"]))
+            
+            # Set base colors (for input fields, etc.)
+            palette.setColor(QPalette.ColorRole.Base, QColor(theme["secondary"]))
+            palette.setColor(QPalette.ColorRole.AlternateBase, QColor(theme["background"]))
+            
+            # Set text colors
+            palette.setColor(QPalette.ColorRole.Text, QColor(theme["text"]))
+            palette.setColor(QPalette.ColorRole.BrightText, QColor(theme["accent"]))
+            
+            # Set button colors
+            palette.setColor(QPalette.ColorRole.Button, QColor(theme["primary"]))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(theme["secondary"]))
+            
+            # Set highlight colors
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(theme["accent"]))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(theme["secondary"]))
+            
+            # Set link colors
+            palette.setColor(QPalette.ColorRole.Link, QColor(theme["accent"]))
+            palette.setColor(QPalette.ColorRole.LinkVisited, QColor(theme["primary"]))
+            
+            self._palettes[theme_name] = palette
+        
+        return self._palettes[theme_name]
+    
+    def get_stylesheet(self, theme_name):
+        """The stylesheet for a theme: its QSS file plus the shared one, with the theme's colors filled in."""
+        if theme_name not in self._stylesheets:
+            source = "\n".join((
+                self._read_source(f"{theme_name}.qss"),
+                self._read_source(SHARED_STYLESHEET)
+            ))
+            # safe_substitute leaves anything that is not a theme variable alone
+            self._stylesheets[theme_name] = Template(source).safe_substitute(self.themes[theme_name])
+        
+        return self._stylesheets[theme_name]
+    
+    def clear_cache(self):
+        """Forget the loaded QSS files, e.g. after editing them while the app runs."""
+        self._sources.clear()
+        self._stylesheets.clear()
+        self._palettes.clear()
+    
+    def _read_source(self, filename):
+        if filename not in self._sources:
+            path = os.path.join(self.styles_dir, filename)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._sources[filename] = f.read()
+            except OSError as e:
+                print(f"Error loading stylesheet {path}: {e}")
+                self._sources[filename] = ""
+        
+        return self._sources[filename]
@@ -0,0 +1,211 @@
+# utils/tracing.py
+import os
+import json
+import time
+import atexit
+import inspect
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# Set to a file path (or 1 for the default path) to record a trace
+TRACE_ENV = "GUZEL_TRACE"
+
+TRACE_FILE = "logs/trace.json"
+
+# Oldest events are dropped beyond this many
+MAX_EVENTS = 200000
+
+# The heartbeat ticks every HEARTBEAT_MS; a tick arriving STALL_MS late is a GUI stall
+HEARTBEAT_MS = 50
+STALL_MS = 100
+
+def positional_limit(func):
+    """How many positional arguments func accepts, or None if it takes *args.
+    
+    Qt drops the signal arguments a slot doesn't declare (clicked's checked flag, a
+    combo's index), but a decorator's *args wrapper would pass them all on; wrappers
+    cut args to this many first.
+    """
+    limit = 0
+    for parameter in inspect.signature(func).parameters.values():
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            limit += 1
+    return limit
+
+class Tracer:
+    """Records spans as Chrome trace events (chrome://tracing, Perfetto).
+    
+    Disabled by default; spans and traced functions then cost one attribute check.
+    """
+    
+    def __init__(self, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.path = TRACE_FILE
+        self.events = deque(maxlen=max_events)
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._heartbeat = None
+        self._dump_registered = False
+    
+    def enable(self, path=None):
+        self.enabled = True
+        if path:
+            self.path = path
+        if not self._dump_registered:
+            atexit.register(self.dump)
+            self._dump_registered = True
+    
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+    
+    @contextmanager
+    def span(self, name, category="app", **args):
+        """Record the time spent in the with block as one complete event."""
+        if not self.enabled:
+            yield
+            return
+        
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self.add_complete(name, category, start, self._now_us() - start, args)
+    
+    def traced(self, name=None, category="app"):
+        """Decorator recording every call of a function as a span."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+            limit = positional_limit(func)
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if limit is not None and len(args) > limit:
+                    args = args[:limit]
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                
+                start = self._now_us()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_complete(span_name, category, start, self._now_us() - start)
+            
+            return wrapper
+        return decorator
+    
+    def add_complete(self, name, category, start_us, duration_us, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start_us, 1),
+            "dur": round(duration_us, 1),
+            "pid": self.pid,
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+    
+    def instant(self, name, category="app", **args):
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": round(self._now_us(), 1),
+            "pid": self.pid,
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+    
+    def start_heartbeat(self, interval_ms=HEARTBEAT_MS, stall_ms=STALL_MS):
+        """Watch the GUI event loop; every late timer tick is recorded as a stall."""
+        from PyQt6.QtCore import QTimer
+        
+        if self._heartbeat:
+            return
+        
+        timer = QTimer()
+        timer.setInterval(interval_ms)
+        last_tick = [self._now_us()]
+        
+        def tick():
+            now = self._now_us()
+            lag_ms = (now - last_tick[0]) / 1000 - interval_ms
+            if lag_ms >= stall_ms:
+                # The loop was blocked from the expected tick until now
+                expected = last_tick[0] + interval_ms * 1000
+                self.add_complete("gui_stall", "heartbeat", expected, now - expected, {"lag_ms": round(lag_ms, 1)})
+            last_tick[0] = now
+        
+        timer.timeout.connect(tick)
+        timer.start()
+        self._heartbeat = timer
+    
+    def stop_heartbeat(self):
+        if self._heartbeat:
+            self._heartbeat.stop()
+            self._heartbeat = None
+    
+    def dump(self, path=None):
+        """Write the recorded events as a Chrome trace JSON file; returns its path."""
+        path = path or self.path
+        if not self.events:
+            return None
+        
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing trace file: {e}")
+            return None
+        
+        return path
+
+_shared_tracer = Tracer()
+
+def get_tracer():
+    """The tracer shared by the whole process."""
+    return _shared_tracer
+
+def span(name, category="app", **args):
+    """Shortcut for get_tracer().span(...)."""
+    return _shared_tracer.span(name, category, **args)
+
+def traced(name=None, category="app"):
+    """Shortcut for get_tracer().traced(...)."""
+    return _shared_tracer.traced(name, category)
+
+def configure_tracing(settings=None):
+    """Enable tracing if GUZEL_TRACE is set or the diagnostics.trace setting is on.
+    
+    Call once the QApplication exists, so the stall heartbeat can start.
+    Returns True if tracing was enabled.
+    """
+    path = os.environ.get(TRACE_ENV)
+    if path in ("0", "false", "no"):
+        path = None
+    elif path in ("1", "true", "yes"):
+        path = TRACE_FILE
+    
+    if not path and settings and settings.get_setting("diagnostics.trace", False):
+        path = settings.get_setting("diagnostics.trace_file", TRACE_FILE)
+    
+    if not path:
+        return False
+    
+    _shared_tracer.enable(path)
+    _shared_tracer.start_heartbeat()
+    return True
@@ -0,0 +1,163 @@
+# utils/translation_loader.py
+import os
+import json
+import marshal
+
+# Language whose strings fill in keys missing from the other languages
+FALLBACK_LANGUAGE = "ar"
+
+SUPPORTED_LANGUAGES = ("ar", "en")
+
+# Compiled tables are cached here, one marshal file per translations directory and language
+CACHE_DIR = "cache/translations"
+
+# Bump when the compiled layout changes so old cache files are ignored
+CACHE_FORMAT = 1
+
+def flatten_translations(translations, prefix=""):
+    """Flatten nested translation dicts into {"section.key": value}.
+    
+    Entries in the icon format ({"text": ..., "icon": ...}) are kept whole as leaves.
+    """
+    flat = {}
+    for key, value in translations.items():
+        full_key = f"{prefix}{key}"
+        if isinstance(value, dict) and "text" not in value:
+            flat.update(flatten_translations(value, f"{full_key}."))
+        else:
+            flat[full_key] = value
+    return flat
+
+def compile_language(values, fallback_values=None):
+    """Compile one language into flat (texts, icons) tables with the fallback merged in."""
+    merged = flatten_translations(fallback_values) if fallback_values else {}
+    merged.update(flatten_translations(values))
+    
+    texts = {}
+    icons = {}
+    for key, value in merged.items():
+        if isinstance(value, dict):
+            texts[key] = value["text"]
+            if "icon" in value:
+                icons[key] = value["icon"]
+        else:
+            texts[key] = value
+    
+    return texts, icons
+
+def compile_translations(translations, fallback_language=FALLBACK_LANGUAGE):
+    """Compile nested per-language translations into flat lookup tables.
+    
+    Returns (texts, icons): texts maps language -> {key: text} with the fallback
+    language already merged in, icons maps language -> {key: icon path} for the
+    entries that have an icon.
+    """
+    fallback = translations.get(fallback_language)
+    
+    texts = {}
+    icons = {}
+    for language, values in translations.items():
+        texts[language], icons[language] = compile_language(
+            values, fallback if language != fallback_language else None
+        )
+    
+    return texts, icons
+
+class TranslationLoader:
+    """Loads compiled translation tables one language at a time.
+    
+    A language is compiled from its JSON file (plus the fallback language's)
+    once, then read back from a marshal cache file for as long as the JSON
+    files' modification times and sizes stay the same.
+    """
+    
+    def __init__(self, translations_dir, create_default=None, fallback_language=FALLBACK_LANGUAGE,
+                 cache_dir=CACHE_DIR):
+        self.translations_dir = translations_dir
+        # Called as create_default(language, path) when a JSON file is missing
+        self.create_default = create_default
+        self.fallback_language = fallback_language
+        self.cache_dir = cache_dir
+        self.texts = {}
+        self.icons = {}
+    
+    def supports(self, language):
+        return language in SUPPORTED_LANGUAGES
+    
+    def load(self, language):
+        """Make sure a language's tables are loaded; returns (texts, icons)."""
+        if language not in self.texts:
+            stamps = self._source_stamps(language)
+            cache_path = self._cache_path(language)
+            
+            tables = self._read_cache(cache_path, stamps)
+            if tables is None:
+                tables = self._compile(language)
+                self._write_cache(cache_path, stamps, tables)
+            
+            self.texts[language], self.icons[language] = tables
+        
+        return self.texts[language], self.icons[language]
+    
+    def _source_languages(self, language):
+        if language == self.fallback_language:
+            return (language,)
+        return (language, self.fallback_language)
+    
+    def _source_path(self, language):
+        return os.path.join(self.translations_dir, f"{language}.json")
+    
+    def _source_stamps(self, language):
+        """(mtime, size) of every JSON file the compiled tables depend on."""
+        stamps = []
+        for source_language in self._source_languages(language):
+            path = self._source_path(source_language)
+            if not os.path.exists(path) and self.create_default:
+                self.create_default(source_language, path)
+            
+            try:
+                stat = os.stat(path)
+                stamps.append((source_language, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append((source_language, None, None))
+        
+        return (CACHE_FORMAT, tuple(stamps))
+    
+    def _compile(self, language):
+        values = {}
+        for source_language in self._source_languages(language):
+            path = self._source_path(source_language)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    values[source_language] = json.load(f)
+        
+        fallback = values.get(self.fallback_language) if language != self.fallback_language else None
+        return compile_language(values.get(language, {}), fallback)
+    
+    def _cache_path(self, language):
+        # One cache per translations directory, e.g. data_translations_ar.marshal
+        prefix = os.path.normpath(self.translations_dir).strip(os.sep).replace(os.sep, "_")
+        return os.path.join(self.cache_dir, f"{prefix}_{language}.marshal")
+    
+    def _read_cache(self, cache_path, stamps):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_stamps, texts, icons = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        
+        if cached_stamps != stamps:
+            return None
+        
+        return texts, icons
+    
+    def _write_cache(self, cache_path, stamps, tables):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = cache_path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                marshal.dump((stamps, tables[0], tables[1]), f)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            # The cache is only an optimization
+            print(f"Error writing translation cache: {e}")
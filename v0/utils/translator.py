@@ -1,6 +1,7 @@
 import os
 import json
 from PyQt6.QtCore import QTranslator, QLocale, QCoreApplication, Qt
+from utils.translation_loader import TranslationLoader
 
 class TranslationManager:
     """Manages translations for the application."""
@@ -8,40 +9,32 @@ class TranslationManager:
     def __init__(self, settings=None):
         self.settings = settings
         self.translator = QTranslator()
-        self.translations = {}
         self.current_language = "ar"  # Default to Arabic
         
-        # Load translations
-        self.load_translations()
-        
-        # Apply initial language
         if self.settings:
             self.current_language = self.settings.get_setting("language", "ar")
         
+        # Load translations (only the current language; others load on switch)
+        self.load_translations()
+        
         self.apply_language()
     
     def load_translations(self):
-        """Load translations from JSON files."""
+        """Load the current language's compiled translations (cached on disk)."""
         translations_dir = "resources/translations"
         
         # Ensure the directory exists
         os.makedirs(translations_dir, exist_ok=True)
         
-        # Load Arabic translations
-        ar_path = os.path.join(translations_dir, "ar.json")
-        if not os.path.exists(ar_path):
-            self.create_default_arabic_translations(ar_path)
-        
-        with open(ar_path, "r", encoding="utf-8") as f:
-            self.translations["ar"] = json.load(f)
-        
-        # Load English translations
-        en_path = os.path.join(translations_dir, "en.json")
-        if not os.path.exists(en_path):
-            self.create_default_english_translations(en_path)
-        
-        with open(en_path, "r", encoding="utf-8") as f:
-            self.translations["en"] = json.load(f)
+        self.loader = TranslationLoader(translations_dir, self.create_default_translations)
+        self.current_texts, _ = self.loader.load(self.current_language)
+    
+    def create_default_translations(self, language, path):
+        """Create the default translations file for a language."""
+        if language == "ar":
+            self.create_default_arabic_translations(path)
+        elif language == "en":
+            self.create_default_english_translations(path)
     
     def create_default_arabic_translations(self, path):
         """Create default Arabic translations."""
@@ -469,20 +462,15 @@ class TranslationManager:
     
     def get_translation(self, key):
         """Get a translation for a key."""
-        if self.current_language in self.translations and key in self.translations[self.current_language]:
-            return self.translations[self.current_language][key]
-        
-        # Fallback to Arabic
-        if "ar" in self.translations and key in self.translations["ar"]:
-            return self.translations["ar"][key]
-        
+        # The Arabic fallback is already merged into the compiled table
         # Return the key if no translation is found
-        return key
+        return self.current_texts.get(key, key)
     
     def set_language(self, language_code):
         """Set the current language."""
-        if language_code in self.translations:
+        if self.loader.supports(language_code):
             self.current_language = language_code
+            self.current_texts, _ = self.loader.load(language_code)
             
             if self.settings:
                 self.settings.set_setting("language", language_code)
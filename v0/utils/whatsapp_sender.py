@@ -44,3 +44,14 @@ class WhatsAppSender:
         message = f"مرحباً {customer_name}،\n\n{message_text}\n\nمركز جوزيل للتجميل"
         return self.send_message(customer_phone, message)
 
+class NotificationManager:
+    """Sends customer notifications through WhatsApp."""
+    
+    def __init__(self, settings=None):
+        self.settings = settings
+        self.sender = WhatsAppSender()
+    
+    def send_notification(self, customer_name, customer_phone, message):
+        """Send a notification message to a customer."""
+        return self.sender.send_custom_message(customer_name, customer_phone, message)
+
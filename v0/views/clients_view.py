@@ -4,9 +4,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QFormLayout, QLineEdit, QTextEdit, QMessageBox,
                            QSpinBox, QDoubleSpinBox, QComboBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon
 import json
-from utils.icon_loader import load_icon
+from utils.icon_loader import get_icon
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
+from ui.csv_import import run_csv_import
 
 class ClientsView(QWidget):
     """View for managing clients."""
@@ -26,32 +28,20 @@ class ClientsView(QWidget):
         layout = QVBoxLayout(self)
         
         # Title
-        title = QLabel(self.tr("customers.title"))
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
+        self.title_label = QLabel(self.tr("customers.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
         
         # Clients table
         self.clients_table = QTableWidget()
         self.clients_table.setColumnCount(12)
-        self.clients_table.setHorizontalHeaderLabels([
-            self.tr("customers.id"),
-            self.tr("customers.name"),
-            self.tr("customers.phone"),
-            self.tr("customers.email"),
-            self.tr("customers.hair_type"),
-            self.tr("customers.hair_color"),
-            self.tr("customers.skin_type"),
-            self.tr("customers.allergies"),
-            self.tr("customers.current_sessions"),
-            self.tr("customers.remaining_sessions"),
-            self.tr("customers.most_requested_services"),
-            self.tr("customers.remaining_payments")
-        ])
+        self.set_header_labels()
         self.clients_table.horizontalHeader().setStretchLastSection(True)
         self.clients_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.clients_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.clients_table.doubleClicked.connect(self.view_client)
         
+        self.row_translator = VisibleRowTranslator(self.clients_table, lambda: self.clients, self.translated_cells)
         layout.addWidget(self.clients_table)
         
         # Buttons layout
@@ -59,39 +49,39 @@ class ClientsView(QWidget):
         
         # Add client button
         self.add_button = QPushButton(self.tr("customers.add"))
-        try:
-            self.add_button.setIcon(QIcon(load_icon("add.png")))
-        except FileNotFoundError:
-            print("Warning: add.png icon not found")
+        self.add_button.setIcon(get_icon("add.png"))
         self.add_button.clicked.connect(self.add_client)
         buttons_layout.addWidget(self.add_button)
         
         # Edit client button
         self.edit_button = QPushButton(self.tr("customers.edit"))
-        try:
-            self.edit_button.setIcon(QIcon(load_icon("edit.png")))
-        except FileNotFoundError:
-            print("Warning: edit.png icon not found")
+        self.edit_button.setIcon(get_icon("edit.png"))
         self.edit_button.clicked.connect(self.edit_client)
         buttons_layout.addWidget(self.edit_button)
         
         # Delete client button
         self.delete_button = QPushButton(self.tr("customers.delete"))
-        try:
-            self.delete_button.setIcon(QIcon(load_icon("delete.png")))
-        except FileNotFoundError:
-            print("Warning: delete.png icon not found")
+        self.delete_button.setIcon(get_icon("delete.png"))
         self.delete_button.clicked.connect(self.delete_client)
         buttons_layout.addWidget(self.delete_button)
         
+        # Import from CSV button
+        self.import_button = QPushButton(self.tr("common.import_csv"))
+        self.import_button.setIcon(get_icon("import.png"))
+        self.import_button.clicked.connect(self.import_customers)
+        buttons_layout.addWidget(self.import_button)
+        
         # Add buttons layout to main layout
         layout.addLayout(buttons_layout)
     
+    @traced(category="load")
     def load_clients(self):
-        clients = self.clients_controller.get_all_clients()
-        
-        self.clients_table.setRowCount(len(clients))
-        for i, client in enumerate(clients):
+        self.clients = self.clients_controller.get_all_clients()
+        self.populate_table()
+    
+    def populate_table(self):
+        self.clients_table.setRowCount(len(self.clients))
+        for i, client in enumerate(self.clients):
             # ID
             self.clients_table.setItem(i, 0, QTableWidgetItem(str(client["id"])))
             
@@ -127,61 +117,65 @@ class ClientsView(QWidget):
             self.clients_table.setItem(i, 10, QTableWidgetItem(most_requested))
             
             # Remaining payments
-            remaining_payments = f"{client['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if client["remaining_payments"] > 0 else ""
-            self.clients_table.setItem(i, 11, QTableWidgetItem(remaining_payments))
+            for column, text in self.translated_cells(client):
+                self.clients_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.row_translator.reset()
         
         # Resize columns to content
         self.clients_table.resizeColumnsToContents()
     
+    def translated_cells(self, client):
+        # The only cells whose text depends on the language
+        remaining_payments = f"{client['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if client["remaining_payments"] > 0 else ""
+        return ((11, remaining_payments),)
+    
+    def set_header_labels(self):
+        self.clients_table.setHorizontalHeaderLabels([
+            self.tr("customers.id"),
+            self.tr("customers.name"),
+            self.tr("customers.phone"),
+            self.tr("customers.email"),
+            self.tr("customers.hair_type"),
+            self.tr("customers.hair_color"),
+            self.tr("customers.skin_type"),
+            self.tr("customers.allergies"),
+            self.tr("customers.current_sessions"),
+            self.tr("customers.remaining_sessions"),
+            self.tr("customers.most_requested_services"),
+            self.tr("customers.remaining_payments")
+        ])
+    
+    def refresh(self):
+        # Clear existing data
+        self.clients_table.clearContents()
+        # Reload data
+        self.load_clients()
+        self.retranslate()
+    
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("customers.title"))
+        self.set_header_labels()
+        
+        self.add_button.setText(self.tr("customers.add"))
+        self.edit_button.setText(self.tr("customers.edit"))
+        self.delete_button.setText(self.tr("customers.delete"))
+        self.import_button.setText(self.tr("common.import_csv"))
+        
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        
+        self.clients_table.resizeColumnsToContents()
+    
+    @traced(category="search")
     def search(self, text):
         if not text:
             self.load_clients()
             return
         
-        clients = self.clients_controller.search_clients(text)
-        
-        self.clients_table.setRowCount(len(clients))
-        for i, client in enumerate(clients):
-            # ID
-            self.clients_table.setItem(i, 0, QTableWidgetItem(str(client["id"])))
-            
-            # Name
-            self.clients_table.setItem(i, 1, QTableWidgetItem(client["name"]))
-            
-            # Phone
-            self.clients_table.setItem(i, 2, QTableWidgetItem(client["phone"]))
-            
-            # Email
-            self.clients_table.setItem(i, 3, QTableWidgetItem(client["email"] or ""))
-            
-            # Hair type
-            self.clients_table.setItem(i, 4, QTableWidgetItem(client["hair_type"] or ""))
-            
-            # Hair color
-            self.clients_table.setItem(i, 5, QTableWidgetItem(client["hair_color"] or ""))
-            
-            # Skin type
-            self.clients_table.setItem(i, 6, QTableWidgetItem(client["skin_type"] or ""))
-            
-            # Allergies
-            self.clients_table.setItem(i, 7, QTableWidgetItem(client["allergies"] or ""))
-            
-            # Current sessions
-            self.clients_table.setItem(i, 8, QTableWidgetItem(str(client["current_sessions"])))
-            
-            # Remaining sessions
-            self.clients_table.setItem(i, 9, QTableWidgetItem(str(client["remaining_sessions"])))
-            
-            # Most requested services
-            most_requested = ", ".join(client["most_requested_services"]) if client["most_requested_services"] else ""
-            self.clients_table.setItem(i, 10, QTableWidgetItem(most_requested))
-            
-            # Remaining payments
-            remaining_payments = f"{client['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if client["remaining_payments"] > 0 else ""
-            self.clients_table.setItem(i, 11, QTableWidgetItem(remaining_payments))
-        
-        # Resize columns to content
-        self.clients_table.resizeColumnsToContents()
+        self.clients = self.clients_controller.search_clients(text)
+        self.populate_table()
     
     def add_client(self):
         dialog = ClientDialog(self.db_manager, self.translation_manager, self.clients_controller)
@@ -231,6 +225,14 @@ class ClientsView(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {str(e)}")
     
+    def import_customers(self):
+        if not self.is_admin:
+            QMessageBox.warning(self, self.tr("common.warning"), self.tr("admin_only"))
+            return
+        
+        if run_csv_import(self, self.db_manager, "customers", self.tr):
+            self.load_clients()
+    
     def view_client(self):
         selected_rows = self.clients_table.selectedIndexes()
         if not selected_rows:
@@ -246,6 +248,7 @@ class ClientsView(QWidget):
 class ClientDialog(QDialog):
     """Dialog for adding, editing, or viewing a client."""
     
+    @traced(category="dialog")
     def __init__(self, db_manager, translation_manager, clients_controller, client_id=None, view_only=False):
         super().__init__()
         self.db_manager = db_manager
@@ -2,8 +2,9 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                            QCheckBox, QPushButton, QMessageBox, QWidget)
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtGui import QPixmap
 from controllers.auth_controller import AuthController
+from utils.icon_loader import get_icon
 
 class LoginView(QDialog):
     """Login dialog for user authentication."""
@@ -73,7 +74,7 @@ class LoginView(QDialog):
                 background: rgba(0,0,0,0.1);
             }
         """)
-        self.toggle_password_button.setIcon(QIcon("resources/assets/icons/eye-closed.png"))
+        self.toggle_password_button.setIcon(get_icon("eye-closed.png"))
         password_layout.addWidget(self.toggle_password_button)
         
         layout.addWidget(password_label)
@@ -98,10 +99,10 @@ class LoginView(QDialog):
     def toggle_password_visibility(self):
         if self.toggle_password_button.isChecked():
             self.password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-            self.toggle_password_button.setIcon(QIcon("resources/assets/icons/eye-open.png"))
+            self.toggle_password_button.setIcon(get_icon("eye-open.png"))
         else:
             self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-            self.toggle_password_button.setIcon(QIcon("resources/assets/icons/eye-closed.png"))
+            self.toggle_password_button.setIcon(get_icon("eye-closed.png"))
     
     def login(self):
         username = self.username_input.text()
@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPu
                            QGroupBox, QScrollArea, QSplitter, QMenu, QToolBar, QStatusBar,
                            QAction, QFileDialog, QDateEdit, QTimeEdit, QDateTimeEdit, QSizePolicy)
 from PyQt6.QtCore import Qt, QDate, QTime, QDateTime, QTimer, QSize, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap, QFont, QColor, QPalette, QAction, QTextCharFormat
+from PyQt6.QtGui import QPixmap, QFont, QColor, QPalette, QAction, QTextCharFormat
 import datetime
 import json
 import os
@@ -15,7 +15,9 @@ from views.clients_view import ClientsView
 from views.appointments_view import AppointmentsView
 from views.services_view import ServicesView
 from views.invoices_view import InvoicesView
+from views.tabs.reports_tab import ReportsTab
 from views.settings_view import SettingsView
+from ui.export_dialog import ExportDialog
 
 from controllers.clients_controller import ClientsController
 from controllers.appointments_controller import AppointmentsController
@@ -23,8 +25,10 @@ from controllers.services_controller import ServicesController
 from controllers.invoices_controller import InvoicesController
 from controllers.notifications_controller import NotificationsController
 
-from utils.icon_loader import load_icon
+from utils.icon_loader import get_icon
 from utils.theme_manager import ThemeManager  # Import ThemeManager
+from utils.tracing import traced
+from utils.profiling import profiled
 
 class MainView(QMainWindow):
     """Main application window."""
@@ -75,6 +79,12 @@ class MainView(QMainWindow):
                 self.backup_manager.auto_backup(backup_interval)
             except Exception as e:
                 print(f"Auto backup failed: {e}")
+        
+        # Archive the change journal periodically for point-in-time recovery
+        journal_interval = int(self.settings.get_setting("backup.journal_archive_minutes", 15))
+        self.journal_timer = QTimer(self)
+        self.journal_timer.timeout.connect(self.archive_change_journal)
+        self.journal_timer.start(journal_interval * 60000)
     
     def setup_ui(self):
         """
@@ -128,43 +138,23 @@ class MainView(QMainWindow):
         # Unified button definitions with error handling for icons
         buttons_layout = QHBoxLayout()
 
-        try:
-            add_button = QPushButton(self.tr("common.add"))
-            add_button.setIcon(QIcon(load_icon("add.png")))
-        except FileNotFoundError:
-            add_button = QPushButton(self.tr("common.add"))
-            add_button.setIcon(QIcon())  # Default empty icon
-            print("Warning: Icon 'add.png' not found.")
+        add_button = QPushButton(self.tr("common.add"))
+        add_button.setIcon(get_icon("add.png"))
         add_button.clicked.connect(self.add_appointment)
         buttons_layout.addWidget(add_button)
 
-        try:
-            edit_button = QPushButton(self.tr("common.edit"))
-            edit_button.setIcon(QIcon(load_icon("edit.png")))
-        except FileNotFoundError:
-            edit_button = QPushButton(self.tr("common.edit"))
-            edit_button.setIcon(QIcon())
-            print("Warning: Icon 'edit.png' not found.")
+        edit_button = QPushButton(self.tr("common.edit"))
+        edit_button.setIcon(get_icon("edit.png"))
         edit_button.clicked.connect(self.edit_item)
         buttons_layout.addWidget(edit_button)
 
-        try:
-            delete_button = QPushButton(self.tr("common.delete"))
-            delete_button.setIcon(QIcon(load_icon("delete.png")))
-        except FileNotFoundError:
-            delete_button = QPushButton(self.tr("common.delete"))
-            delete_button.setIcon(QIcon())
-            print("Warning: Icon 'delete.png' not found.")
+        delete_button = QPushButton(self.tr("common.delete"))
+        delete_button.setIcon(get_icon("delete.png"))
         delete_button.clicked.connect(self.delete_item)
         buttons_layout.addWidget(delete_button)
 
-        try:
-            create_invoice_button = QPushButton(self.tr("invoices.add"))
-            create_invoice_button.setIcon(QIcon(load_icon("add_invoice.png")))
-        except FileNotFoundError:
-            create_invoice_button = QPushButton(self.tr("invoices.add"))
-            create_invoice_button.setIcon(QIcon())
-            print("Warning: Icon 'add_invoice.png' not found.")
+        create_invoice_button = QPushButton(self.tr("invoices.add"))
+        create_invoice_button.setIcon(get_icon("add_invoice.png"))
         create_invoice_button.clicked.connect(self.create_invoice)
         buttons_layout.addWidget(create_invoice_button)
 
@@ -192,43 +182,27 @@ class MainView(QMainWindow):
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.toolbar.addWidget(spacer)
         
-        try:
-            self.language_button = QAction(QIcon(load_icon("language.png")), self.tr("main.languages"), self)
-        except FileNotFoundError:
-            self.language_button = QAction(QIcon(), self.tr("main.languages"), self)
-            print("Warning: Icon 'language.png' not found.")
+        self.language_button = QAction(get_icon("language.png"), self.tr("main.languages"), self)
         self.language_button.triggered.connect(self.toggle_language)
         self.toolbar.addAction(self.language_button)
         
-        try:
-            self.theme_button = QAction(QIcon(load_icon("theme.png")), self.tr("main.themes"), self)
-        except FileNotFoundError:
-            self.theme_button = QAction(QIcon(), self.tr("main.themes"), self)
-            print("Warning: Icon 'theme.png' not found.")
+        self.theme_button = QAction(get_icon("theme.png"), self.tr("main.themes"), self)
         self.theme_button.triggered.connect(self.toggle_theme)
         self.toolbar.addAction(self.theme_button)
         
-        try:
-            self.notifications_button = QAction(QIcon(load_icon("notification.png")), self.tr("main.notifications"), self)
-        except FileNotFoundError:
-            self.notifications_button = QAction(QIcon(), self.tr("main.notifications"), self)
-            print("Warning: Icon 'notification.png' not found.")
+        self.notifications_button = QAction(get_icon("notification.png"), self.tr("main.notifications"), self)
         self.notifications_button.triggered.connect(self.show_notifications)
         self.toolbar.addAction(self.notifications_button)
         
-        try:
-            self.settings_button = QAction(QIcon(load_icon("settings.png")), self.tr("main.settings"), self)
-        except FileNotFoundError:
-            self.settings_button = QAction(QIcon(), self.tr("main.settings"), self)
-            print("Warning: Icon 'settings.png' not found.")
+        self.export_button = QAction(get_icon("export.png"), self.tr("main.export"), self)
+        self.export_button.triggered.connect(self.show_export)
+        self.toolbar.addAction(self.export_button)
+        
+        self.settings_button = QAction(get_icon("settings.png"), self.tr("main.settings"), self)
         self.settings_button.triggered.connect(self.show_settings)
         self.toolbar.addAction(self.settings_button)
         
-        try:
-            self.logout_button = QAction(QIcon(load_icon("logout.png")), self.tr("main.logout"), self)
-        except FileNotFoundError:
-            self.logout_button = QAction(QIcon(), self.tr("main.logout"), self)
-            print("Warning: Icon 'logout.png' not found.")
+        self.logout_button = QAction(get_icon("logout.png"), self.tr("main.logout"), self)
         self.logout_button.triggered.connect(self.logout)
         self.toolbar.addAction(self.logout_button)
     
@@ -248,54 +222,41 @@ class MainView(QMainWindow):
         # Create sidebar buttons
         self.sidebar_buttons = []
         
-        try:
-            appointments_button = QPushButton(self.tr("sidebar.appointments"))
-            appointments_button.setIcon(QIcon(load_icon("calendar.png")))
-        except FileNotFoundError:
-            appointments_button = QPushButton(self.tr("sidebar.appointments"))
-            appointments_button.setIcon(QIcon())
-            print("Warning: Icon 'calendar.png' not found.")
+        appointments_button = QPushButton(self.tr("sidebar.appointments"))
+        appointments_button.setIcon(get_icon("calendar.png"))
         appointments_button.setCheckable(True)
         appointments_button.clicked.connect(lambda: self.show_tab(0))
         sidebar_layout.addWidget(appointments_button)
         self.sidebar_buttons.append(appointments_button)
         
-        try:
-            customers_button = QPushButton(self.tr("sidebar.customers"))
-            customers_button.setIcon(QIcon(load_icon("customers.png")))
-        except FileNotFoundError:
-            customers_button = QPushButton(self.tr("sidebar.customers"))
-            customers_button.setIcon(QIcon())
-            print("Warning: Icon 'customers.png' not found.")
+        customers_button = QPushButton(self.tr("sidebar.customers"))
+        customers_button.setIcon(get_icon("customers.png"))
         customers_button.setCheckable(True)
         customers_button.clicked.connect(lambda: self.show_tab(1))
         sidebar_layout.addWidget(customers_button)
         self.sidebar_buttons.append(customers_button)
         
-        try:
-            services_button = QPushButton(self.tr("sidebar.services"))
-            services_button.setIcon(QIcon(load_icon("services.png")))
-        except FileNotFoundError:
-            services_button = QPushButton(self.tr("sidebar.services"))
-            services_button.setIcon(QIcon())
-            print("Warning: Icon 'services.png' not found.")
+        services_button = QPushButton(self.tr("sidebar.services"))
+        services_button.setIcon(get_icon("services.png"))
         services_button.setCheckable(True)
         services_button.clicked.connect(lambda: self.show_tab(2))
         sidebar_layout.addWidget(services_button)
         self.sidebar_buttons.append(services_button)
         
-        try:
-            invoices_button = QPushButton(self.tr("sidebar.invoices"))
-            invoices_button.setIcon(QIcon(load_icon("invoice.png")))
-        except FileNotFoundError:
-            invoices_button = QPushButton(self.tr("sidebar.invoices"))
-            invoices_button.setIcon(QIcon())
-            print("Warning: Icon 'invoice.png' not found.")
+        invoices_button = QPushButton(self.tr("sidebar.invoices"))
+        invoices_button.setIcon(get_icon("invoice.png"))
         invoices_button.setCheckable(True)
         invoices_button.clicked.connect(lambda: self.show_tab(3))
         sidebar_layout.addWidget(invoices_button)
         self.sidebar_buttons.append(invoices_button)
         
+        reports_button = QPushButton(self.tr("sidebar.reports"))
+        reports_button.setIcon(get_icon("invoices.png"))
+        reports_button.setCheckable(True)
+        reports_button.clicked.connect(lambda: self.show_tab(4))
+        sidebar_layout.addWidget(reports_button)
+        self.sidebar_buttons.append(reports_button)
+        
         # Add spacer
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -341,11 +302,15 @@ class MainView(QMainWindow):
             self.is_admin
         )
         
+        # Only uses get_translation, which the translation manager has too
+        self.reports_view = ReportsTab(self.db_manager, self.translation_manager, self.settings)
+        
         # Add tabs to stack
         self.content_stack.addWidget(self.appointments_view)
         self.content_stack.addWidget(self.clients_view)
         self.content_stack.addWidget(self.services_view)
         self.content_stack.addWidget(self.invoices_view)
+        self.content_stack.addWidget(self.reports_view)
         
         return self.content_stack
     
@@ -431,39 +396,24 @@ class MainView(QMainWindow):
         bottom_layout.setContentsMargins(20, 10, 20, 10)
         bottom_layout.setSpacing(20)
         
-        try:
-            add_appointment_button = QPushButton(self.tr("appointments.add"))
-            add_appointment_button.setIcon(QIcon(load_icon("add_appointment.png")))
-        except FileNotFoundError:
-            add_appointment_button = QPushButton(self.tr("appointments.add"))
-            add_appointment_button.setIcon(QIcon())
-            print("Warning: Icon 'add_appointment.png' not found.")
+        add_appointment_button = QPushButton(self.tr("appointments.add"))
+        add_appointment_button.setIcon(get_icon("add_appointment.png"))
         add_appointment_button.setObjectName("add_appointment_button")  # Assign object name
         add_appointment_button.setIconSize(QSize(24, 24))
         add_appointment_button.setStyleSheet("QPushButton { padding: 5px; }")
         add_appointment_button.clicked.connect(self.add_appointment)
         bottom_layout.addWidget(add_appointment_button)
         
-        try:
-            add_customer_button = QPushButton(self.tr("customers.add"))
-            add_customer_button.setIcon(QIcon(load_icon("add_customer.png")))
-        except FileNotFoundError:
-            add_customer_button = QPushButton(self.tr("customers.add"))
-            add_customer_button.setIcon(QIcon())
-            print("Warning: Icon 'add_customer.png' not found.")
+        add_customer_button = QPushButton(self.tr("customers.add"))
+        add_customer_button.setIcon(get_icon("add_customer.png"))
         add_customer_button.setObjectName("add_customer_button")  # Assign object name
         add_customer_button.setIconSize(QSize(24, 24))
         add_customer_button.setStyleSheet("QPushButton { padding: 5px; }")
         add_customer_button.clicked.connect(self.add_customer)
         bottom_layout.addWidget(add_customer_button)
         
-        try:
-            create_invoice_button = QPushButton(self.tr("invoices.add"))
-            create_invoice_button.setIcon(QIcon(load_icon("add_invoice.png")))
-        except FileNotFoundError:
-            create_invoice_button = QPushButton(self.tr("invoices.add"))
-            create_invoice_button.setIcon(QIcon())
-            print("Warning: Icon 'add_invoice.png' not found.")
+        create_invoice_button = QPushButton(self.tr("invoices.add"))
+        create_invoice_button.setIcon(get_icon("add_invoice.png"))
         create_invoice_button.setObjectName("create_invoice_button")  # Assign object name
         create_invoice_button.setIconSize(QSize(24, 24))
         create_invoice_button.setStyleSheet("QPushButton { padding: 5px; }")
@@ -491,6 +441,13 @@ class MainView(QMainWindow):
             self.stats_timer.timeout.connect(self.update_financial_stats)
             self.stats_timer.start(3600000)  # 1 hour in milliseconds
     
+    def archive_change_journal(self):
+        try:
+            self.backup_manager.archive_change_journal()
+        except Exception as e:
+            print(f"Change journal archiving failed: {e}")
+    
+    @profiled()
     def show_tab(self, index):
         # Update sidebar button states
         for i, button in enumerate(self.sidebar_buttons):
@@ -508,7 +465,11 @@ class MainView(QMainWindow):
             self.search_box.setPlaceholderText(self.tr("services.search"))
         elif index == 3:
             self.search_box.setPlaceholderText(self.tr("invoices.search"))
+        elif index == 4:
+            # Picks up invoices written since the report was shown; a cache hit otherwise
+            self.reports_view.load_report()
     
+    @traced(category="search")
     def search(self, text):
         current_tab = self.content_stack.currentIndex()
         
@@ -571,6 +532,7 @@ class MainView(QMainWindow):
             
             dialog.exec()
     
+    @traced(category="load")
     def update_appointments_for_date(self):
         # Get selected date
         selected_date = self.calendar.selectedDate().toPyDate()
@@ -600,6 +562,7 @@ class MainView(QMainWindow):
         # Mark dates with appointments on the calendar
         self.mark_calendar_dates()
     
+    @traced(category="load")
     def mark_calendar_dates(self):
         # Get appointments for the currently displayed month
         try:
@@ -642,6 +605,7 @@ class MainView(QMainWindow):
                 # Reset format for dates without appointments
                 self.calendar.setDateTextFormat(date, QTextCharFormat())
     
+    @traced(category="load")
     def update_financial_stats(self):
         if not self.is_admin:
             return
@@ -649,18 +613,25 @@ class MainView(QMainWindow):
         # Get current date
         today = datetime.date.today()
         
-        # Calculate daily revenue
-        daily_revenue = self.invoices_controller.get_daily_revenue(today)
-        self.daily_revenue.setText(f"{daily_revenue:,.0f} {self.tr('services.price_currency')}")
-        
-        # Calculate weekly revenue (starting from Monday)
+        # Calculate weekly revenue starting from Monday
         monday = today - datetime.timedelta(days=today.weekday())
-        weekly_revenue = self.invoices_controller.get_weekly_revenue(monday)
-        self.weekly_revenue.setText(f"{weekly_revenue:,.0f} {self.tr('services.price_currency')}")
         
-        # Calculate monthly revenue
-        monthly_revenue = self.invoices_controller.get_monthly_revenue(today.year, today.month)
-        self.monthly_revenue.setText(f"{monthly_revenue:,.0f} {self.tr('services.price_currency')}")
+        # Keep the raw values so a language change only has to re-format them
+        self.financial_stats = {
+            "daily": self.invoices_controller.get_daily_revenue(today),
+            "weekly": self.invoices_controller.get_weekly_revenue(monday),
+            "monthly": self.invoices_controller.get_monthly_revenue(today.year, today.month)
+        }
+        self.show_financial_stats()
+    
+    def show_financial_stats(self):
+        if not self.is_admin or not hasattr(self, "financial_stats"):
+            return
+        
+        currency = self.tr('services.price_currency')
+        self.daily_revenue.setText(f"{self.financial_stats['daily']:,.0f} {currency}")
+        self.weekly_revenue.setText(f"{self.financial_stats['weekly']:,.0f} {currency}")
+        self.monthly_revenue.setText(f"{self.financial_stats['monthly']:,.0f} {currency}")
     
     def toggle_language(self):
         # تبديل اللغة بين العربية والإنجليزية
@@ -691,12 +662,13 @@ class MainView(QMainWindow):
         self.language_button.setText(self.tr("main.languages"))
         self.theme_button.setText(self.tr("main.themes"))
         self.notifications_button.setText(self.tr("main.notifications"))
+        self.export_button.setText(self.tr("main.export"))
         self.settings_button.setText(self.tr("main.settings"))
         self.logout_button.setText(self.tr("main.logout"))
         
         # Update sidebar buttons
         for i, button in enumerate(self.sidebar_buttons):
-            button.setText(self.tr(f"sidebar.{['appointments', 'customers', 'services', 'invoices'][i]}"))
+            button.setText(self.tr(f"sidebar.{['appointments', 'customers', 'services', 'invoices', 'reports'][i]}"))
         
         # Update bottom bar buttons
         button = self.bottom_bar.findChild(QPushButton, "add_appointment_button")
@@ -711,7 +683,7 @@ class MainView(QMainWindow):
         if button:
             button.setText(self.tr("invoices.add"))
 
-        self.update_financial_stats()
+        self.show_financial_stats()
 
     def refresh_ui(self):
         """
@@ -723,16 +695,12 @@ class MainView(QMainWindow):
         # Re-translate all text
         self.retranslate_ui()
         
-        # Update all views
-        self.appointments_view.refresh()
-        self.clients_view.refresh()
-        self.services_view.refresh()
-        self.invoices_view.refresh()
-        
-        # Update calendar and stats
-        self.update_appointments_for_date()
-        if self.is_admin:
-            self.update_financial_stats()
+        # Re-translate the views from the data they already hold
+        self.appointments_view.retranslate()
+        self.clients_view.retranslate()
+        self.services_view.retranslate()
+        self.invoices_view.retranslate()
+        self.reports_view.retranslate()
     
     def show_notifications(self):
         # Check for upcoming appointments
@@ -745,6 +713,10 @@ class MainView(QMainWindow):
         else:
             QMessageBox.information(self, self.tr("main.notifications"), self.tr("no_notifications"))
     
+    def show_export(self):
+        export_dialog = ExportDialog(self.db_manager, self.tr, self)
+        export_dialog.exec()
+    
     def show_settings(self):
         # Show settings dialog
         settings_view = SettingsView(
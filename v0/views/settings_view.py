@@ -7,9 +7,13 @@ from PyQt6.QtCore import Qt
 import os
 import hashlib
 
+from ui.diagnostics_panel import DiagnosticsPanel
+from utils.tracing import traced
+
 class SettingsView(QDialog):
     """Settings dialog for application configuration."""
     
+    @traced(category="dialog")
     def __init__(self, db_manager, settings, translation_manager, backup_manager, is_admin):
         super().__init__()
         self.db_manager = db_manager
@@ -47,6 +51,11 @@ class SettingsView(QDialog):
             self.setup_users_tab()
             self.tab_widget.addTab(self.users_tab, self.tr("settings.users"))
         
+        # Diagnostics tab (admin only)
+        if self.is_admin:
+            self.diagnostics_tab = DiagnosticsPanel(self.settings, self.tr)
+            self.tab_widget.addTab(self.diagnostics_tab, self.tr("settings.diagnostics"))
+        
         # About tab
         self.about_tab = QWidget()
         self.setup_about_tab()
@@ -148,11 +157,12 @@ class SettingsView(QDialog):
         backups_layout = QVBoxLayout(backups_group)
         
         self.backups_table = QTableWidget()
-        self.backups_table.setColumnCount(3)
+        self.backups_table.setColumnCount(4)
         self.backups_table.setHorizontalHeaderLabels([
             self.tr("filename"),
             self.tr("date"),
-            self.tr("size")
+            self.tr("size"),
+            self.tr("settings.backup_type")
         ])
         self.backups_table.horizontalHeader().setStretchLastSection(True)
         self.backups_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
@@ -259,6 +269,9 @@ class SettingsView(QDialog):
         self.settings.set_setting("backup.backup_interval_days", self.backup_interval_spin.value())
         self.settings.set_setting("backup.backup_location", self.backup_location_edit.text())
         
+        # Write the whole batch now rather than after the write-behind delay
+        self.settings.flush()
+        
         self.accept()
     
     def browse_backup_location(self):
@@ -269,6 +282,7 @@ class SettingsView(QDialog):
                 directory += '/'
             self.backup_location_edit.setText(directory)
     
+    @traced(category="backup")
     def backup_now(self):
         try:
             backup_path = self.backup_manager.create_backup()
@@ -279,6 +293,7 @@ class SettingsView(QDialog):
             QMessageBox.critical(self, self.tr("common.error"), 
                                f"{self.tr('backup_failed')}: {str(e)}")
     
+    @traced(category="backup")
     def restore_backup(self):
         selected_rows = self.backups_table.selectedIndexes()
         if not selected_rows:
@@ -288,9 +303,24 @@ class SettingsView(QDialog):
         # Get the backup path from the hidden data
         backup_path = self.backups_table.item(selected_rows[0].row(), 0).data(Qt.ItemDataRole.UserRole)
         
+        # Preview the backup contents without extracting it
+        try:
+            preview = self.backup_manager.preview_backup(backup_path)
+        except Exception as e:
+            QMessageBox.critical(self, self.tr("common.error"), 
+                               f"{self.tr('restore_failed')}: {str(e)}")
+            return
+        
+        details = "\n".join(
+            f"{member['name']} ({self.format_size(member['size'])})" for member in preview["members"]
+        )
+        backup_date = preview["metadata"].get("backup_date")
+        if backup_date:
+            details = f"{self.tr('date')}: {backup_date}\n{details}"
+        
         # Confirm restoration
         reply = QMessageBox.question(self, self.tr("common.confirm"), 
-                                    self.tr("confirm_restore_backup"),
+                                    f"{self.tr('confirm_restore_backup')}\n\n{details}",
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
@@ -329,6 +359,7 @@ class SettingsView(QDialog):
                                    f"{self.tr('delete_failed')}: {str(e)}")
     
     def load_available_backups(self):
+        # Read from the backup catalog instead of scanning the backup directory
         backups = self.backup_manager.get_available_backups()
         
         self.backups_table.setRowCount(len(backups))
@@ -345,6 +376,10 @@ class SettingsView(QDialog):
             # Size
             size_str = self.format_size(backup["size"])
             self.backups_table.setItem(i, 2, QTableWidgetItem(size_str))
+            
+            # Type (full archive or database-only copy)
+            type_str = self.tr(f"settings.backup_type_{backup['type']}")
+            self.backups_table.setItem(i, 3, QTableWidgetItem(type_str))
         
         # Resize columns to content
         self.backups_table.resizeColumnsToContents()
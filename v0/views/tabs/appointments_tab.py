@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QTextEdit, QMessageBox, QCheckBox, QDoubleSpinBox)
 from PyQt6.QtCore import Qt, QDateTime
 import json
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
 
 class AppointmentsTab(QWidget):
     def __init__(self, db_manager, language_manager, is_admin):
@@ -21,29 +23,20 @@ class AppointmentsTab(QWidget):
         layout = QVBoxLayout(self)
         
         # Title
-        title = QLabel(self.tr("appointments.title"))
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
+        self.title_label = QLabel(self.tr("appointments.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
         
         # Appointments table
         self.appointments_table = QTableWidget()
         self.appointments_table.setColumnCount(9)
-        self.appointments_table.setHorizontalHeaderLabels([
-            self.tr("appointments.id"),
-            self.tr("appointments.customer_name"),
-            self.tr("appointments.phone"),
-            self.tr("appointments.date_time"),
-            self.tr("appointments.services"),
-            self.tr("appointments.service_provider"),
-            self.tr("appointments.notes"),
-            self.tr("appointments.status"),
-            self.tr("appointments.remaining_payments")
-        ])
+        self.set_header_labels()
         self.appointments_table.horizontalHeader().setStretchLastSection(True)
         self.appointments_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.appointments_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.appointments_table.doubleClicked.connect(self.view_appointment)
         
+        self.row_translator = VisibleRowTranslator(self.appointments_table, lambda: self.appointments, self.translated_cells)
         layout.addWidget(self.appointments_table)
         
         # Buttons layout
@@ -67,11 +60,14 @@ class AppointmentsTab(QWidget):
         # Add buttons layout to main layout
         layout.addLayout(buttons_layout)
     
+    @traced(category="load")
     def load_appointments(self):
-        appointments = self.db_manager.get_all_appointments()
-        
-        self.appointments_table.setRowCount(len(appointments))
-        for i, appointment in enumerate(appointments):
+        self.appointments = self.db_manager.get_all_appointments()
+        self.populate_table()
+    
+    def populate_table(self):
+        self.appointments_table.setRowCount(len(self.appointments))
+        for i, appointment in enumerate(self.appointments):
             # ID
             self.appointments_table.setItem(i, 0, QTableWidgetItem(str(appointment["id"])))
             
@@ -95,59 +91,56 @@ class AppointmentsTab(QWidget):
             # Notes
             self.appointments_table.setItem(i, 6, QTableWidgetItem(appointment["notes"]))
             
-            # Status
-            status = self.tr("appointments.confirmed") if appointment["status"] == "confirmed" else self.tr("appointments.unconfirmed")
-            self.appointments_table.setItem(i, 7, QTableWidgetItem(status))
-            
-            # Remaining payments
-            remaining_payments = f"{appointment['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if appointment["remaining_payments"] > 0 else ""
-            self.appointments_table.setItem(i, 8, QTableWidgetItem(remaining_payments))
+            # Status and remaining payments
+            for column, text in self.translated_cells(appointment):
+                self.appointments_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.row_translator.reset()
         
         # Resize columns to content
         self.appointments_table.resizeColumnsToContents()
     
+    def translated_cells(self, appointment):
+        # The only cells whose text depends on the language
+        status = self.tr("appointments.confirmed") if appointment["status"] == "confirmed" else self.tr("appointments.unconfirmed")
+        remaining_payments = f"{appointment['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if appointment["remaining_payments"] > 0 else ""
+        return ((7, status), (8, remaining_payments))
+    
+    def set_header_labels(self):
+        self.appointments_table.setHorizontalHeaderLabels([
+            self.tr("appointments.id"),
+            self.tr("appointments.customer_name"),
+            self.tr("appointments.phone"),
+            self.tr("appointments.date_time"),
+            self.tr("appointments.services"),
+            self.tr("appointments.service_provider"),
+            self.tr("appointments.notes"),
+            self.tr("appointments.status"),
+            self.tr("appointments.remaining_payments")
+        ])
+    
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("appointments.title"))
+        self.set_header_labels()
+        
+        self.add_button.setText(self.tr("appointments.add"))
+        self.edit_button.setText(self.tr("appointments.edit"))
+        self.delete_button.setText(self.tr("appointments.delete"))
+        
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        
+        self.appointments_table.resizeColumnsToContents()
+    
+    @traced(category="search")
     def search(self, text):
         if not text:
             self.load_appointments()
             return
         
-        appointments = self.db_manager.search_appointments(text)
-        
-        self.appointments_table.setRowCount(len(appointments))
-        for i, appointment in enumerate(appointments):
-            # ID
-            self.appointments_table.setItem(i, 0, QTableWidgetItem(str(appointment["id"])))
-            
-            # Customer name
-            self.appointments_table.setItem(i, 1, QTableWidgetItem(appointment["customer_name"]))
-            
-            # Phone
-            self.appointments_table.setItem(i, 2, QTableWidgetItem(appointment["customer_phone"]))
-            
-            # Date and time
-            date_time = QDateTime.fromString(appointment["date_time"], Qt.DateFormat.ISODate)
-            self.appointments_table.setItem(i, 3, QTableWidgetItem(date_time.toString("yyyy-MM-dd hh:mm")))
-            
-            # Services
-            services = ", ".join([service["name"] for service in appointment["services"]])
-            self.appointments_table.setItem(i, 4, QTableWidgetItem(services))
-            
-            # Service provider
-            self.appointments_table.setItem(i, 5, QTableWidgetItem(appointment["service_provider"]))
-            
-            # Notes
-            self.appointments_table.setItem(i, 6, QTableWidgetItem(appointment["notes"]))
-            
-            # Status
-            status = self.tr("appointments.confirmed") if appointment["status"] == "confirmed" else self.tr("appointments.unconfirmed")
-            self.appointments_table.setItem(i, 7, QTableWidgetItem(status))
-            
-            # Remaining payments
-            remaining_payments = f"{appointment['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if appointment["remaining_payments"] > 0 else ""
-            self.appointments_table.setItem(i, 8, QTableWidgetItem(remaining_payments))
-        
-        # Resize columns to content
-        self.appointments_table.resizeColumnsToContents()
+        self.appointments = self.db_manager.search_appointments(text)
+        self.populate_table()
     
     def add_appointment(self):
         dialog = AppointmentDialog(self.db_manager, self.language_manager)
@@ -207,11 +200,13 @@ class AppointmentsTab(QWidget):
     def refresh(self):
         # Clear existing data
         self.appointments_table.clearContents()
-        # Reload data with updated language
+        # Reload data
         self.load_appointments()
+        self.retranslate()
 
 
 class AppointmentDialog(QDialog):
+    @traced(category="dialog")
     def __init__(self, db_manager, language_manager, appointment_id=None, view_only=False):
         super().__init__()
         self.db_manager = db_manager
@@ -5,6 +5,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QSpinBox, QDoubleSpinBox, QComboBox)
 from PyQt6.QtCore import Qt
 import json
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
+from ui.csv_import import run_csv_import
 
 class CustomersTab(QWidget):
     def __init__(self, db_manager, language_manager, is_admin):
@@ -21,32 +24,20 @@ class CustomersTab(QWidget):
         layout = QVBoxLayout(self)
         
         # Title
-        title = QLabel(self.tr("customers.title"))
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
+        self.title_label = QLabel(self.tr("customers.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
         
         # Customers table
         self.customers_table = QTableWidget()
         self.customers_table.setColumnCount(12)
-        self.customers_table.setHorizontalHeaderLabels([
-            self.tr("customers.id"),
-            self.tr("customers.name"),
-            self.tr("customers.phone"),
-            self.tr("customers.email"),
-            self.tr("customers.hair_type"),
-            self.tr("customers.hair_color"),
-            self.tr("customers.skin_type"),
-            self.tr("customers.allergies"),
-            self.tr("customers.current_sessions"),
-            self.tr("customers.remaining_sessions"),
-            self.tr("customers.most_requested_services"),
-            self.tr("customers.remaining_payments")
-        ])
+        self.set_header_labels()
         self.customers_table.horizontalHeader().setStretchLastSection(True)
         self.customers_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.customers_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.customers_table.doubleClicked.connect(self.view_customer)
         
+        self.row_translator = VisibleRowTranslator(self.customers_table, lambda: self.customers, self.translated_cells)
         layout.addWidget(self.customers_table)
         
         # Buttons layout
@@ -67,17 +58,25 @@ class CustomersTab(QWidget):
         self.delete_button.clicked.connect(self.delete_customer)
         buttons_layout.addWidget(self.delete_button)
         
+        # Import from CSV button
+        self.import_button = QPushButton(self.tr("common.import_csv"))
+        self.import_button.clicked.connect(self.import_customers)
+        buttons_layout.addWidget(self.import_button)
+        
         # Add buttons layout to main layout
         layout.addLayout(buttons_layout)
 
         # Initialize table attribute
         self.table = self.customers_table
     
+    @traced(category="load")
     def load_customers(self):
-        customers = self.db_manager.get_all_customers()
-        
-        self.customers_table.setRowCount(len(customers))
-        for i, customer in enumerate(customers):
+        self.customers = self.db_manager.get_all_customers()
+        self.populate_table()
+    
+    def populate_table(self):
+        self.customers_table.setRowCount(len(self.customers))
+        for i, customer in enumerate(self.customers):
             # ID
             self.customers_table.setItem(i, 0, QTableWidgetItem(str(customer["id"])))
             
@@ -113,61 +112,58 @@ class CustomersTab(QWidget):
             self.customers_table.setItem(i, 10, QTableWidgetItem(most_requested))
             
             # Remaining payments
-            remaining_payments = f"{customer['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if customer["remaining_payments"] > 0 else ""
-            self.customers_table.setItem(i, 11, QTableWidgetItem(remaining_payments))
+            for column, text in self.translated_cells(customer):
+                self.customers_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.row_translator.reset()
         
         # Resize columns to content
         self.customers_table.resizeColumnsToContents()
     
+    def translated_cells(self, customer):
+        # The only cells whose text depends on the language
+        remaining_payments = f"{customer['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if customer["remaining_payments"] > 0 else ""
+        return ((11, remaining_payments),)
+    
+    def set_header_labels(self):
+        self.customers_table.setHorizontalHeaderLabels([
+            self.tr("customers.id"),
+            self.tr("customers.name"),
+            self.tr("customers.phone"),
+            self.tr("customers.email"),
+            self.tr("customers.hair_type"),
+            self.tr("customers.hair_color"),
+            self.tr("customers.skin_type"),
+            self.tr("customers.allergies"),
+            self.tr("customers.current_sessions"),
+            self.tr("customers.remaining_sessions"),
+            self.tr("customers.most_requested_services"),
+            self.tr("customers.remaining_payments")
+        ])
+    
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("customers.title"))
+        self.set_header_labels()
+        
+        self.add_button.setText(self.tr("customers.add"))
+        self.edit_button.setText(self.tr("customers.edit"))
+        self.delete_button.setText(self.tr("customers.delete"))
+        self.import_button.setText(self.tr("common.import_csv"))
+        
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        
+        self.customers_table.resizeColumnsToContents()
+    
+    @traced(category="search")
     def search(self, text):
         if not text:
             self.load_customers()
             return
         
-        customers = self.db_manager.search_customers(text)
-        
-        self.customers_table.setRowCount(len(customers))
-        for i, customer in enumerate(customers):
-            # ID
-            self.customers_table.setItem(i, 0, QTableWidgetItem(str(customer["id"])))
-            
-            # Name
-            self.customers_table.setItem(i, 1, QTableWidgetItem(customer["name"]))
-            
-            # Phone
-            self.customers_table.setItem(i, 2, QTableWidgetItem(customer["phone"]))
-            
-            # Email
-            self.customers_table.setItem(i, 3, QTableWidgetItem(customer["email"] or ""))
-            
-            # Hair type
-            self.customers_table.setItem(i, 4, QTableWidgetItem(customer["hair_type"] or ""))
-            
-            # Hair color
-            self.customers_table.setItem(i, 5, QTableWidgetItem(customer["hair_color"] or ""))
-            
-            # Skin type
-            self.customers_table.setItem(i, 6, QTableWidgetItem(customer["skin_type"] or ""))
-            
-            # Allergies
-            self.customers_table.setItem(i, 7, QTableWidgetItem(customer["allergies"] or ""))
-            
-            # Current sessions
-            self.customers_table.setItem(i, 8, QTableWidgetItem(str(customer["current_sessions"])))
-            
-            # Remaining sessions
-            self.customers_table.setItem(i, 9, QTableWidgetItem(str(customer["remaining_sessions"])))
-            
-            # Most requested services
-            most_requested = ", ".join(customer["most_requested_services"]) if customer["most_requested_services"] else ""
-            self.customers_table.setItem(i, 10, QTableWidgetItem(most_requested))
-            
-            # Remaining payments
-            remaining_payments = f"{customer['remaining_payments']:,.0f} {self.tr('services.price_currency')}" if customer["remaining_payments"] > 0 else ""
-            self.customers_table.setItem(i, 11, QTableWidgetItem(remaining_payments))
-        
-        # Resize columns to content
-        self.customers_table.resizeColumnsToContents()
+        self.customers = self.db_manager.search_customers(text)
+        self.populate_table()
     
     def add_customer(self):
         dialog = CustomerDialog(self.db_manager, self.language_manager)
@@ -217,6 +213,14 @@ class CustomersTab(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {str(e)}")
     
+    def import_customers(self):
+        if not self.is_admin:
+            QMessageBox.warning(self, self.tr("common.warning"), self.tr("admin_only"))
+            return
+        
+        if run_csv_import(self, self.db_manager, "customers", self.tr):
+            self.load_customers()
+    
     def view_customer(self):
         selected_rows = self.customers_table.selectedIndexes()
         if not selected_rows:
@@ -231,11 +235,13 @@ class CustomersTab(QWidget):
     def refresh(self):
         # Clear existing data
         self.table.clearContents()
-        # Reload data with updated language
+        # Reload data
         self.load_customers()
+        self.retranslate()
 
 
 class CustomerDialog(QDialog):
+    @traced(category="dialog")
     def __init__(self, db_manager, language_manager, customer_id=None, view_only=False):
         super().__init__()
         self.db_manager = db_manager
@@ -3,21 +3,29 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QLabel, QTableWidget, QTableWidgetItem, QDialog,
                            QFormLayout, QLineEdit, QDateEdit, QComboBox,
                            QTextEdit, QMessageBox, QCheckBox, QDoubleSpinBox, QSpinBox,
-                           QFileDialog)
+                           QFileDialog, QProgressDialog, QApplication)
 from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog
+from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 import json
 import datetime
 import os
+import shutil
 from PyQt6.QtGui import QTextDocument
 from PyQt6.QtGui import QPageSize  # استيراد QPageSize لتحديد حجم الصفحة
+from utils.document_templates import get_document_templates, invoice_labels
+from utils.document_cache import get_document_cache
+from utils.page_preview import PagePreviewDialog, DocumentPagePreview
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
+from utils.profiling import profiled
 
 class InvoicesTab(QWidget):
-    def __init__(self, db_manager, language_manager, is_admin):
+    def __init__(self, db_manager, language_manager, is_admin, settings):
         super().__init__()
         self.db_manager = db_manager
         self.language_manager = language_manager
         self.is_admin = is_admin
+        self.settings = settings
         self.tr = self.language_manager.get_translation
         
         self.setup_ui()
@@ -27,29 +35,20 @@ class InvoicesTab(QWidget):
         layout = QVBoxLayout(self)
         
         # Title
-        title = QLabel(self.tr("invoices.title"))
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
+        self.title_label = QLabel(self.tr("invoices.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
         
         # Invoices table
         self.invoices_table = QTableWidget()
         self.invoices_table.setColumnCount(9)
-        self.invoices_table.setHorizontalHeaderLabels([
-            self.tr("invoices.id"),
-            self.tr("invoices.customer_name"),
-            self.tr("invoices.phone"),
-            self.tr("invoices.date"),
-            self.tr("invoices.services"),
-            self.tr("invoices.payment_method"),
-            self.tr("invoices.amount_paid"),
-            self.tr("invoices.amount_remaining"),
-            self.tr("invoices.total_amount")
-        ])
+        self.set_header_labels()
         self.invoices_table.horizontalHeader().setStretchLastSection(True)
         self.invoices_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.invoices_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.invoices_table.doubleClicked.connect(self.view_invoice)
         
+        self.row_translator = VisibleRowTranslator(self.invoices_table, lambda: self.invoices, self.translated_cells)
         layout.addWidget(self.invoices_table)
         
         # Buttons layout
@@ -75,17 +74,25 @@ class InvoicesTab(QWidget):
         self.print_button.clicked.connect(self.print_invoice)
         buttons_layout.addWidget(self.print_button)
         
+        # Batch PDF export button
+        self.export_button = QPushButton(self.tr("invoices.export_pdfs"))
+        self.export_button.clicked.connect(self.export_invoices_batch)
+        buttons_layout.addWidget(self.export_button)
+        
         # Add buttons layout to main layout
         layout.addLayout(buttons_layout)
         
         self.table = QTableWidget()  # Ensure the table is initialized
         self.load_data()
 
+    @traced(category="load")
     def load_invoices(self):
-        invoices = self.db_manager.get_all_invoices()
-        
-        self.invoices_table.setRowCount(len(invoices))
-        for i, invoice in enumerate(invoices):
+        self.invoices = self.db_manager.get_all_invoices()
+        self.populate_table()
+    
+    def populate_table(self):
+        self.invoices_table.setRowCount(len(self.invoices))
+        for i, invoice in enumerate(self.invoices):
             # ID
             self.invoices_table.setItem(i, 0, QTableWidgetItem(str(invoice["id"])))
             
@@ -103,35 +110,29 @@ class InvoicesTab(QWidget):
             services = ", ".join([service["name"] for service in invoice["services"]])
             self.invoices_table.setItem(i, 4, QTableWidgetItem(services))
             
-            # Payment method
-            payment_method = self.tr("invoices.cash") if invoice["payment_method"] == "cash" else self.tr("invoices.installment")
-            self.invoices_table.setItem(i, 5, QTableWidgetItem(payment_method))
-            
-            # Amount paid
-            amount_paid = f"{invoice['amount_paid']:,.0f} {self.tr('invoices.price_currency')}"
-            self.invoices_table.setItem(i, 6, QTableWidgetItem(amount_paid))
-            
-            # Amount remaining
-            amount_remaining = f"{invoice['amount_remaining']:,.0f} {self.tr('invoices.price_currency')}" if invoice["amount_remaining"] > 0 else ""
-            self.invoices_table.setItem(i, 7, QTableWidgetItem(amount_remaining))
-            
-            # Total amount
-            total_amount = f"{invoice['total_amount']:,.0f} {self.tr('invoices.price_currency')}"
-            self.invoices_table.setItem(i, 8, QTableWidgetItem(total_amount))
+            # Payment method and amounts
+            for column, text in self.translated_cells(invoice):
+                self.invoices_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.row_translator.reset()
         
         # Resize columns to content
         self.invoices_table.resizeColumnsToContents()
-
-    def load_data(self):
-        # Call the existing method to load invoices
-        self.load_invoices()
-
-    def refresh(self):
-        # Clear existing data
-        self.invoices_table.clearContents()
-        # Reload data with updated language
-        self.load_data()
-        # Update table headers with the current language
+    
+    def translated_cells(self, invoice):
+        # The only cells whose text depends on the language
+        currency = self.tr('invoices.price_currency')
+        payment_method = self.tr("invoices.cash") if invoice["payment_method"] == "cash" else self.tr("invoices.installment")
+        amount_remaining = f"{invoice['amount_remaining']:,.0f} {currency}" if invoice["amount_remaining"] > 0 else ""
+        
+        return (
+            (5, payment_method),
+            (6, f"{invoice['amount_paid']:,.0f} {currency}"),
+            (7, amount_remaining),
+            (8, f"{invoice['total_amount']:,.0f} {currency}")
+        )
+    
+    def set_header_labels(self):
         self.invoices_table.setHorizontalHeaderLabels([
             self.tr("invoices.id"),
             self.tr("invoices.customer_name"),
@@ -143,51 +144,42 @@ class InvoicesTab(QWidget):
             self.tr("invoices.amount_remaining"),
             self.tr("invoices.total_amount")
         ])
+
+    def load_data(self):
+        # Call the existing method to load invoices
+        self.load_invoices()
+
+    def refresh(self):
+        # Clear existing data
+        self.invoices_table.clearContents()
+        # Reload data
+        self.load_data()
+        self.retranslate()
+    
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("invoices.title"))
+        self.set_header_labels()
+        
+        self.create_button.setText(self.tr("invoices.add"))
+        self.edit_button.setText(self.tr("invoices.edit"))
+        self.delete_button.setText(self.tr("invoices.delete"))
+        self.print_button.setText(self.tr("invoices.print"))
+        self.export_button.setText(self.tr("invoices.export_pdfs"))
+        
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        
+        self.invoices_table.resizeColumnsToContents()
     
+    @traced(category="search")
     def search(self, text):
         if not text:
             self.load_invoices()
             return
         
-        invoices = self.db_manager.search_invoices(text)
-        
-        self.invoices_table.setRowCount(len(invoices))
-        for i, invoice in enumerate(invoices):
-            # ID
-            self.invoices_table.setItem(i, 0, QTableWidgetItem(str(invoice["id"])))
-            
-            # Customer name
-            self.invoices_table.setItem(i, 1, QTableWidgetItem(invoice["customer_name"]))
-            
-            # Phone
-            self.invoices_table.setItem(i, 2, QTableWidgetItem(invoice["customer_phone"]))
-            
-            # Date
-            date = QDate.fromString(invoice["date"].split("T")[0], Qt.DateFormat.ISODate)
-            self.invoices_table.setItem(i, 3, QTableWidgetItem(date.toString("yyyy-MM-dd")))
-            
-            # Services
-            services = ", ".join([service["name"] for service in invoice["services"]])
-            self.invoices_table.setItem(i, 4, QTableWidgetItem(services))
-            
-            # Payment method
-            payment_method = self.tr("invoices.cash") if invoice["payment_method"] == "cash" else self.tr("invoices.installment")
-            self.invoices_table.setItem(i, 5, QTableWidgetItem(payment_method))
-            
-            # Amount paid
-            amount_paid = f"{invoice['amount_paid']:,.0f} {self.tr('invoices.price_currency')}"
-            self.invoices_table.setItem(i, 6, QTableWidgetItem(amount_paid))
-            
-            # Amount remaining
-            amount_remaining = f"{invoice['amount_remaining']:,.0f} {self.tr('invoices.price_currency')}" if invoice["amount_remaining"] > 0 else ""
-            self.invoices_table.setItem(i, 7, QTableWidgetItem(amount_remaining))
-            
-            # Total amount
-            total_amount = f"{invoice['total_amount']:,.0f} {self.tr('invoices.price_currency')}"
-            self.invoices_table.setItem(i, 8, QTableWidgetItem(total_amount))
-        
-        # Resize columns to content
-        self.invoices_table.resizeColumnsToContents()
+        self.invoices = self.db_manager.search_invoices(text)
+        self.populate_table()
     
     def create_invoice(self):
         dialog = InvoiceDialog(self.db_manager, self.language_manager)
@@ -257,33 +249,56 @@ class InvoicesTab(QWidget):
         # Get the invoice ID from the first column
         invoice_id = int(self.invoices_table.item(selected_rows[0].row(), 0).text())
         
-        # Get invoice data
-        invoice = self.db_manager.get_invoice(invoice_id)
-        
-        # Create HTML content for the invoice
-        html_content = self.generate_invoice_html(invoice)
-        
-        # Create printer
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))  # تحديد حجم الصفحة A4
+        # Reuse the laid-out document if the invoice hasn't changed since the last print
+        document = self.get_invoice_document(invoice_id)
+        if document is None:
+            # Deleted since the table was loaded
+            QMessageBox.critical(self, self.tr("common.error"), self.tr("common.operation_failed"))
+            self.load_invoices()
+            return
         
-        # Show print preview dialog
-        preview = QPrintPreviewDialog(printer, self)
-        preview.paintRequested.connect(lambda p: self.print_invoice_content(p, html_content))
+        # Preview at screen resolution; the high-resolution printer is only used to print
+        preview = PagePreviewDialog(DocumentPagePreview(document), self.tr, self)
         preview.exec()
 
+    def invoice_cache_key(self, invoice_id):
+        return (
+            invoice_id,
+            self.db_manager.get_invoice_version(invoice_id),
+            self.language_manager.get_current_language(),
+            get_document_templates().version
+        )
+    
+    def get_invoice_document(self, invoice_id):
+        """The laid-out invoice, or None if it no longer exists."""
+        key = self.invoice_cache_key(invoice_id)
+        if key[1] is None:
+            return None
+        
+        def build():
+            document = QTextDocument()
+            document.setHtml(self.generate_invoice_html(self.db_manager.get_invoice(invoice_id)))
+            return document
+        
+        return get_document_cache().get_document(key, build)
+    
+    @traced(category="pdf")
+    def get_invoice_pdf(self, invoice_id):
+        """Path of the invoice's cached PDF, or None if it no longer exists."""
+        key = self.invoice_cache_key(invoice_id)
+        if key[1] is None:
+            return None
+        
+        def build(path):
+            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
+            printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
+            printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))  # تحديد حجم الصفحة A4
+            printer.setOutputFileName(path)
+            self.get_invoice_document(invoice_id).print(printer)
+        
+        return get_document_cache().get_pdf(key, build)
+
     def export_invoice_to_pdf(self, invoice_id):
-        # Get invoice data
-        invoice = self.db_manager.get_invoice(invoice_id)
-        
-        # Create HTML content for the invoice
-        html_content = self.generate_invoice_html(invoice)
-        
-        # Create printer for PDF
-        printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-        printer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))  # تحديد حجم الصفحة A4
-        
         # Ask user for file location
         file_path, _ = QFileDialog.getSaveFileName(self, self.tr("save_pdf"), f"invoice_{invoice_id}.pdf", "PDF Files (*.pdf)")
         if not file_path:
@@ -293,127 +308,73 @@ class InvoicesTab(QWidget):
         if not file_path.endswith(".pdf"):
             file_path += ".pdf"
         
-        printer.setOutputFileName(file_path)
-        
-        # Print to PDF
-        document = QTextDocument()
-        document.setHtml(html_content)
-        document.print(printer)
+        # Copy the cached PDF; it is only rendered if the invoice changed
+        pdf_path = self.get_invoice_pdf(invoice_id)
+        if pdf_path is None:
+            QMessageBox.critical(self, self.tr("common.error"), self.tr("common.operation_failed"))
+            self.load_invoices()
+            return
+        shutil.copyfile(pdf_path, file_path)
         
         # Show success message
         QMessageBox.information(self, self.tr("common.success"), self.tr("pdf_saved_successfully"))
 
-    def print_invoice_content(self, printer, html_content):
-        document = QTextDocument()
-        document.setHtml(html_content)
-        document.print(printer)  # استبدل print_ بـ print
-    
-    def generate_invoice_html(self, invoice):
-        # Get clinic info from settings
+    @profiled()
+    @traced(category="pdf")
+    def export_invoices_batch(self):
+        from utils.batch_pdf_exporter import BatchPDFExporter
+        
+        # Export the selected invoices, or the current month when nothing is selected
+        selected_rows = sorted({index.row() for index in self.invoices_table.selectedIndexes()})
+        invoice_ids = [int(self.invoices_table.item(row, 0).text()) for row in selected_rows]
+        
+        today = datetime.date.today()
+        default_name = f"invoices_{today.strftime('%Y_%m')}.zip"
+        
+        file_path, _ = QFileDialog.getSaveFileName(self, self.tr("invoices.export_pdfs"), default_name, "ZIP Files (*.zip)")
+        if not file_path:
+            return
+        
+        if not file_path.endswith(".zip"):
+            file_path += ".zip"
+        
+        progress = QProgressDialog(self.tr("invoices.exporting_pdfs"), None, 0, 0, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        def update_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+            QApplication.processEvents()
+        
         try:
-            from config.settings import Settings
-        except ModuleNotFoundError:
-            raise ImportError("The module 'utils.settings' could not be resolved. Ensure it exists and the path is correct.")
-        settings = Settings()
-        clinic_name = settings.get_setting("clinic_info.name", "مركز جوزيل للتجميل")
-        clinic_phone = settings.get_setting("clinic_info.phone", "+963956961395")
-        clinic_address = settings.get_setting("clinic_info.address", "سوريا - ريف دمشق التل موقف طيبة مقابل امركز الثقافي الجديد")
-        
-        # Format date
-        date = QDate.fromString(invoice["date"].split("T")[0], Qt.DateFormat.ISODate)
-        formatted_date = date.toString("yyyy-MM-dd")
+            # The application's settings, so clinic info edits not yet written are flushed for the workers
+            exporter = BatchPDFExporter(self.db_manager, self.settings)
+            if invoice_ids:
+                count = exporter.export(file_path, invoice_ids=invoice_ids, progress_callback=update_progress)
+            else:
+                count = exporter.export(file_path, start_date=today.replace(day=1), end_date=today,
+                                        progress_callback=update_progress)
+        except Exception as e:
+            progress.close()
+            QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {str(e)}")
+            return
         
-        # Format payment method
-        payment_method = self.tr("invoices.cash") if invoice["payment_method"] == "cash" else self.tr("invoices.installment")
+        progress.close()
         
-        # Generate HTML
-        html = f"""
-        <html dir="rtl">
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ text-align: center; margin-bottom: 20px; }}
-                .invoice-info {{ display: flex; justify-content: space-between; margin-bottom: 20px; }}
-                .invoice-info div {{ width: 45%; }}
-                table {{ width: 100%; border-collapse: collapse; margin-bottom: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: right; }}
-                th {{ background-color: #f2f2f2; }}
-                .total {{ text-align: left; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{clinic_name}</h1>
-                <p>{clinic_address}</p>
-                <p>{clinic_phone}</p>
-                <h2>{self.tr("invoices.title")} #{invoice["id"]}</h2>
-            </div>
-            
-            <div class="invoice-info">
-                <div>
-                    <p><strong>{self.tr("invoices.customer_name")}:</strong> {invoice["customer_name"]}</p>
-                    <p><strong>{self.tr("invoices.phone")}:</strong> {invoice["customer_phone"]}</p>
-                </div>
-                <div>
-                    <p><strong>{self.tr("invoices.date")}:</strong> {formatted_date}</p>
-                    <p><strong>{self.tr("invoices.payment_method")}:</strong> {payment_method}</p>
-                </div>
-            </div>
-            
-            <table>
-                <tr>
-                    <th>#</th>
-                    <th>{self.tr("services.name")}</th>
-                    <th>{self.tr("services.price")}</th>
-                </tr>
-        """
-        
-        # Add services
-        for i, service in enumerate(invoice["services"]):
-            html += f"""
-                <tr>
-                    <td>{i+1}</td>
-                    <td>{service["name"]}</td>
-                    <td>{float(service["price"]):,.0f} {self.tr("services.price_currency")}</td>
-                </tr>
-            """
-        
-        # Add totals
-        html += f"""
-                <tr>
-                    <td colspan="2" class="total">{self.tr("invoices.total_amount")}</td>
-                    <td>{invoice["total_amount"]:,.0f} {self.tr("services.price_currency")}</td>
-                </tr>
-                <tr>
-                    <td colspan="2" class="total">{self.tr("invoices.amount_paid")}</td>
-                    <td>{invoice["amount_paid"]:,.0f} {self.tr("services.price_currency")}</td>
-                </tr>
-        """
-        
-        if invoice["amount_remaining"] > 0:
-            html += f"""
-                <tr>
-                    <td colspan="2" class="total">{self.tr("invoices.amount_remaining")}</td>
-                    <td>{invoice["amount_remaining"]:,.0f} {self.tr("services.price_currency")}</td>
-                </tr>
-            """
-        
-        html += f"""
-            </table>
-            
-            <div>
-                <p><strong>{self.tr("invoices.service_provider")}:</strong> {invoice["service_provider"]}</p>
-                <p><strong>{self.tr("invoices.invoice_creator")}:</strong> {invoice["invoice_creator"]}</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        if count == 0:
+            QMessageBox.information(self, self.tr("common.info"), self.tr("invoices.no_invoices_to_export"))
+        else:
+            QMessageBox.information(self, self.tr("common.success"), f"{self.tr('invoices.pdfs_exported')}: {count}")
+    
+    def generate_invoice_html(self, invoice):
+        # Shared compiled templates; the clinic header is cached until the settings change
+        return get_document_templates().render_invoice(invoice, invoice_labels(self.tr))
     
 
 
 class InvoiceDialog(QDialog):
+    @traced(category="dialog")
     def __init__(self, db_manager, language_manager, invoice_id=None, view_only=False):
         super().__init__()
         self.db_manager = db_manager
@@ -0,0 +1,196 @@
+# views/tabs/reports_tab.py
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                           QTableWidget, QTableWidgetItem, QComboBox, QDateEdit,
+                           QFileDialog, QMessageBox)
+from PyQt6.QtCore import QDate
+from database.reports import ReportEngine, GROUPINGS
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
+from utils.profiling import profiled
+
+class ReportsTab(QWidget):
+    def __init__(self, db_manager, language_manager, settings):
+        super().__init__()
+        self.db_manager = db_manager
+        self.language_manager = language_manager
+        self.settings = settings
+        self.tr = self.language_manager.get_translation
+        # Long ranges are computed by several processes unless reports.parallel is turned off
+        workers = (os.cpu_count() or 1) if self.settings.get_setting("reports.parallel", True) else 1
+        self.report_engine = ReportEngine(db_manager, workers=workers)
+        self.rows = []
+        self.totals = None
+        
+        self.setup_ui()
+        self.load_report()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Title
+        self.title_label = QLabel(self.tr("reports.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
+        
+        # Report options
+        options_layout = QHBoxLayout()
+        
+        self.grouping_label = QLabel(self.tr("reports.group_by"))
+        options_layout.addWidget(self.grouping_label)
+        
+        self.grouping_combo = QComboBox()
+        for grouping in GROUPINGS:
+            self.grouping_combo.addItem(self.tr(f"reports.by_{grouping}"), grouping)
+        self.grouping_combo.currentIndexChanged.connect(self.load_report)
+        options_layout.addWidget(self.grouping_combo)
+        
+        self.from_label = QLabel(self.tr("reports.from"))
+        options_layout.addWidget(self.from_label)
+        
+        today = QDate.currentDate()
+        self.start_date_edit = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.start_date_edit.setCalendarPopup(True)
+        self.start_date_edit.dateChanged.connect(self.load_report)
+        options_layout.addWidget(self.start_date_edit)
+        
+        self.to_label = QLabel(self.tr("reports.to"))
+        options_layout.addWidget(self.to_label)
+        
+        self.end_date_edit = QDateEdit(today)
+        self.end_date_edit.setCalendarPopup(True)
+        self.end_date_edit.dateChanged.connect(self.load_report)
+        options_layout.addWidget(self.end_date_edit)
+        
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+        
+        # Report table
+        self.report_table = QTableWidget()
+        self.report_table.setColumnCount(5)
+        self.set_header_labels()
+        self.report_table.horizontalHeader().setStretchLastSection(True)
+        self.report_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.report_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        
+        self.row_translator = VisibleRowTranslator(self.report_table, lambda: self.rows, self.translated_cells)
+        layout.addWidget(self.report_table)
+        
+        # Totals of the whole range
+        self.totals_label = QLabel()
+        self.totals_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.totals_label)
+        
+        # Buttons layout
+        buttons_layout = QHBoxLayout()
+        
+        # Export PDF button
+        self.export_button = QPushButton(self.tr("reports.export_pdf"))
+        self.export_button.clicked.connect(self.export_pdf)
+        buttons_layout.addWidget(self.export_button)
+        
+        # Add buttons layout to main layout
+        layout.addLayout(buttons_layout)
+    
+    def current_grouping(self):
+        return self.grouping_combo.currentData()
+    
+    def date_range(self):
+        return self.start_date_edit.date().toPyDate(), self.end_date_edit.date().toPyDate()
+    
+    @traced(category="load")
+    def load_report(self):
+        # Cached per (report, range) until an invoice changes, so switching back and forth is free
+        start_date, end_date = self.date_range()
+        self.rows = self.report_engine.revenue_by(self.current_grouping(), start_date, end_date)
+        self.totals = self.report_engine.totals(start_date, end_date)
+        self.populate_table()
+    
+    def populate_table(self):
+        # The first column's title depends on the grouping
+        self.set_header_labels()
+        self.report_table.setRowCount(len(self.rows))
+        for i, row in enumerate(self.rows):
+            for column, text in self.translated_cells(row):
+                self.report_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.set_totals_text()
+        self.row_translator.reset()
+        self.report_table.resizeColumnsToContents()
+    
+    def translated_cells(self, row):
+        currency = self.tr("invoices.price_currency")
+        key = row["key"]
+        if self.current_grouping() == "payment_method":
+            key = self.tr(f"invoices.{key}")
+        
+        return (
+            (0, key),
+            (1, str(row["invoice_count"])),
+            (2, f"{row['total_amount']:,.0f} {currency}"),
+            (3, f"{row['amount_paid']:,.0f} {currency}"),
+            (4, f"{row['amount_remaining']:,.0f} {currency}")
+        )
+    
+    def set_totals_text(self):
+        currency = self.tr("invoices.price_currency")
+        self.totals_label.setText(
+            f"{self.tr('reports.invoice_count')}: {self.totals['invoice_count']}    "
+            f"{self.tr('invoices.total_amount')}: {self.totals['total_amount']:,.0f} {currency}    "
+            f"{self.tr('invoices.amount_paid')}: {self.totals['amount_paid']:,.0f} {currency}    "
+            f"{self.tr('invoices.amount_remaining')}: {self.totals['amount_remaining']:,.0f} {currency}"
+        )
+    
+    def set_header_labels(self):
+        self.report_table.setHorizontalHeaderLabels([
+            self.tr(f"reports.by_{self.current_grouping()}"),
+            self.tr("reports.invoice_count"),
+            self.tr("invoices.total_amount"),
+            self.tr("invoices.amount_paid"),
+            self.tr("invoices.amount_remaining")
+        ])
+    
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("reports.title"))
+        self.grouping_label.setText(self.tr("reports.group_by"))
+        self.from_label.setText(self.tr("reports.from"))
+        self.to_label.setText(self.tr("reports.to"))
+        self.export_button.setText(self.tr("reports.export_pdf"))
+        
+        for index, grouping in enumerate(GROUPINGS):
+            self.grouping_combo.setItemText(index, self.tr(f"reports.by_{grouping}"))
+        
+        self.set_header_labels()
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        self.set_totals_text()
+        
+        self.report_table.resizeColumnsToContents()
+    
+    def refresh(self):
+        self.load_report()
+    
+    @profiled()
+    @traced(category="pdf")
+    def export_pdf(self):
+        from utils.pdf_generator import PDFGenerator
+        
+        grouping = self.current_grouping()
+        start_date, end_date = self.date_range()
+        default_name = f"revenue_by_{grouping}_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}.pdf"
+        
+        file_path, _ = QFileDialog.getSaveFileName(self, self.tr("reports.export_pdf"), default_name, "PDF Files (*.pdf)")
+        if not file_path:
+            return
+        
+        if not file_path.endswith(".pdf"):
+            file_path += ".pdf"
+        
+        try:
+            PDFGenerator(self.settings).generate_revenue_report_pdf(self.report_engine, grouping, start_date, end_date, file_path)
+        except Exception as e:
+            QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {str(e)}")
+            return
+        
+        QMessageBox.information(self, self.tr("common.success"), self.tr("pdf_saved_successfully"))
@@ -3,6 +3,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QLabel, QTableWidget, QTableWidgetItem, QDialog,
                            QFormLayout, QLineEdit, QDoubleSpinBox, QMessageBox)
 from PyQt6.QtCore import Qt
+from utils.tracing import traced
+from utils.table_translation import VisibleRowTranslator
+from ui.csv_import import run_csv_import
 
 class ServicesTab(QWidget):
     def __init__(self, db_manager, language_manager, is_admin):
@@ -19,23 +22,20 @@ class ServicesTab(QWidget):
         layout = QVBoxLayout(self)
         
         # Title
-        title = QLabel(self.tr("services.title"))
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
+        self.title_label = QLabel(self.tr("services.title"))
+        self.title_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        layout.addWidget(self.title_label)
         
         # Services table
         self.services_table = QTableWidget()
         self.services_table.setColumnCount(3)
-        self.services_table.setHorizontalHeaderLabels([
-            self.tr("services.id"),
-            self.tr("services.name"),
-            self.tr("services.price")
-        ])
+        self.set_header_labels()
         self.services_table.horizontalHeader().setStretchLastSection(True)
         self.services_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.services_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.services_table.doubleClicked.connect(self.view_service)
         
+        self.row_translator = VisibleRowTranslator(self.services_table, lambda: self.services, self.translated_cells)
         layout.addWidget(self.services_table)
         
         # Buttons layout
@@ -56,14 +56,22 @@ class ServicesTab(QWidget):
         self.delete_button.clicked.connect(self.delete_service)
         buttons_layout.addWidget(self.delete_button)
         
+        # Import from CSV button
+        self.import_button = QPushButton(self.tr("common.import_csv"))
+        self.import_button.clicked.connect(self.import_services)
+        buttons_layout.addWidget(self.import_button)
+        
         # Add buttons layout to main layout
         layout.addLayout(buttons_layout)
     
+    @traced(category="load")
     def load_services(self):
-        services = self.db_manager.get_all_services()
-        
-        self.services_table.setRowCount(len(services))
-        for i, service in enumerate(services):
+        self.services = self.db_manager.get_all_services()
+        self.populate_table()
+    
+    def populate_table(self):
+        self.services_table.setRowCount(len(self.services))
+        for i, service in enumerate(self.services):
             # ID
             self.services_table.setItem(i, 0, QTableWidgetItem(str(service["id"])))
             
@@ -71,18 +79,48 @@ class ServicesTab(QWidget):
             self.services_table.setItem(i, 1, QTableWidgetItem(service["name"]))
             
             # Price
-            price_text = f"{service['price']:,.0f} {self.tr('services.price_currency')}"
-            self.services_table.setItem(i, 2, QTableWidgetItem(price_text))
+            for column, text in self.translated_cells(service):
+                self.services_table.setItem(i, column, QTableWidgetItem(text))
+        
+        self.row_translator.reset()
         
         # Resize columns to content
         self.services_table.resizeColumnsToContents()
+    
+    def translated_cells(self, service):
+        # The only cells whose text depends on the language
+        return ((2, f"{service['price']:,.0f} {self.tr('services.price_currency')}"),)
+    
+    def set_header_labels(self):
+        self.services_table.setHorizontalHeaderLabels([
+            self.tr("services.id"),
+            self.tr("services.name"),
+            self.tr("services.price")
+        ])
 
     def refresh(self):
         # Clear existing data
         self.services_table.clearContents()
-        # Reload data with updated language
+        # Reload data
         self.load_services()
+        self.retranslate()
     
+    def retranslate(self):
+        # Re-translate from the rows already loaded; no database queries
+        self.title_label.setText(self.tr("services.title"))
+        self.set_header_labels()
+        
+        self.add_button.setText(self.tr("services.add"))
+        self.edit_button.setText(self.tr("services.edit"))
+        self.delete_button.setText(self.tr("services.delete"))
+        self.import_button.setText(self.tr("common.import_csv"))
+        
+        # Only the rows in view now; the others as they're scrolled into view
+        self.row_translator.retranslate()
+        
+        self.services_table.resizeColumnsToContents()
+    
+    @traced(category="search")
     def search(self, text):
         if not text:
             self.load_services()
@@ -90,22 +128,8 @@ class ServicesTab(QWidget):
         
         # Filter services by name
         services = self.db_manager.get_all_services()
-        filtered_services = [s for s in services if text.lower() in s["name"].lower()]
-        
-        self.services_table.setRowCount(len(filtered_services))
-        for i, service in enumerate(filtered_services):
-            # ID
-            self.services_table.setItem(i, 0, QTableWidgetItem(str(service["id"])))
-            
-            # Name
-            self.services_table.setItem(i, 1, QTableWidgetItem(service["name"]))
-            
-            # Price
-            price_text = f"{service['price']:,.0f} {self.tr('services.price_currency')}"
-            self.services_table.setItem(i, 2, QTableWidgetItem(price_text))
-        
-        # Resize columns to content
-        self.services_table.resizeColumnsToContents()
+        self.services = [s for s in services if text.lower() in s["name"].lower()]
+        self.populate_table()
     
     def add_service(self):
         if not self.is_admin:
@@ -159,6 +183,14 @@ class ServicesTab(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, self.tr("common.error"), f"{self.tr('common.operation_failed')}: {str(e)}")
     
+    def import_services(self):
+        if not self.is_admin:
+            QMessageBox.warning(self, self.tr("common.warning"), self.tr("admin_only"))
+            return
+        
+        if run_csv_import(self, self.db_manager, "services", self.tr):
+            self.load_services()
+    
     def view_service(self):
         selected_rows = self.services_table.selectedIndexes()
         if not selected_rows:
@@ -172,6 +204,7 @@ class ServicesTab(QWidget):
 
 
 class ServiceDialog(QDialog):
+    @traced(category="dialog")
     def __init__(self, db_manager, language_manager, service_id=None, view_only=False):
         super().__init__()
         self.db_manager = db_manager